@@ -3,51 +3,84 @@
 Smart Study Bot - Main Application
 """
 
+import argparse
 import asyncio
 import logging
 import sys
 import os
+import secrets
+from datetime import datetime
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.config import Config
+# The scheduler (APScheduler) and webhook server (aiohttp) are imported only
+# by the long-running mode, so a one-shot post starts faster
+from src.config import get_config
 from src.bot.telegram_bot import SmartStudyBot
-from src.scheduler.post_scheduler import PostScheduler
 from src.database.database import DatabaseManager
 from src.utils.logger import setup_logger
 
 class SmartStudyBotApp:
-    def __init__(self):
-        self.config = Config()
+    def __init__(self, once: bool = False):
+        self.config = get_config()
         self.logger = setup_logger(__name__)
+        self.once = once
         self.db_manager = None
         self.bot = None
         self.scheduler = None
+        self.webhook = None
         
     async def initialize(self):
         try:
             self.logger.info("🚀 Initializing Smart Study Bot...")
             
-            # Initialize database
-            self.db_manager = DatabaseManager()
-            await self.db_manager.initialize()
+            # Initialize database (a one-shot run reuses an up-to-date file as is
+            # and reads from SQLite instead of loading the catalog cache)
+            if self.once:
+                self.db_manager = DatabaseManager(catalog_cache=False)
+                if not await self.db_manager.initialize(reuse_existing=True):
+                    return False
+            else:
+                self.db_manager = DatabaseManager()
+                await self.db_manager.initialize()
             
             # Initialize Telegram bot
             self.bot = SmartStudyBot(
                 token=self.config.BOT_TOKEN,
                 channel_id=self.config.CHANNEL_ID,
-                db_manager=self.db_manager
+                db_manager=self.db_manager,
+                channel_ids=self.config.CHANNEL_IDS
             )
+            if not await self.bot.initialize():
+                return False
+            
+            if self.once:
+                self.logger.info("✅ Components for a one-shot post initialized")
+                return True
+            
+            from src.scheduler.post_scheduler import PostScheduler
+            from src.bot.webhook import WebhookServer
             
-            # Initialize scheduler
+            # Initialize scheduler (its slots follow POST_SCHEDULE across config reloads)
             self.scheduler = PostScheduler(
                 bot=self.bot,
-                db_manager=self.db_manager,
-                schedule_times=self.config.POST_SCHEDULE
+                db_manager=self.db_manager
             )
             
+            # Interactive commands are served over a webhook, never long polling
+            if self.config.WEBHOOK_ENABLED:
+                self.webhook = WebhookServer(
+                    self.bot.handle_update,
+                    host=self.config.WEBHOOK_HOST,
+                    port=self.config.WEBHOOK_PORT,
+                    path=self.config.WEBHOOK_PATH,
+                    secret=self.config.WEBHOOK_SECRET or secrets.token_urlsafe(32),
+                    workers=self.config.WEBHOOK_WORKERS,
+                    queue_size=self.config.WEBHOOK_QUEUE_SIZE
+                )
+            
             self.logger.info("✅ All components initialized")
             return True
             
@@ -57,9 +90,20 @@ class SmartStudyBotApp:
     
     async def run(self):
         try:
+            # Resume posts left in the outbox by a crash or a failed send
+            await self.bot.drain_outbox()
+            
             # Start scheduler
             await self.scheduler.start()
             
+            if self.webhook:
+                await self.webhook.start()
+                await self.bot.set_webhook(
+                    self.config.WEBHOOK_URL + self.config.WEBHOOK_PATH,
+                    secret=self.webhook.secret,
+                    max_connections=self.config.WEBHOOK_MAX_CONNECTIONS
+                )
+            
             self.logger.info("🤖 Smart Study Bot is running!")
             self.logger.info(f"⏰ Schedule: {self.scheduler.get_next_run()}")
             
@@ -72,26 +116,81 @@ class SmartStudyBotApp:
         finally:
             await self.shutdown()
     
+    async def post_once(self, bd_time: str = None) -> bool:
+        """Post a single schedule slot and return, for cron and CI runners.
+        
+        Without ``bd_time`` the latest slot due is posted. Slots are named
+        as the scheduler names them, so a rerun or a scheduler run of the
+        same slot resumes its outbox post instead of posting twice.
+        """
+        from src.scheduler import slots
+        
+        try:
+            now = datetime.now()
+            if bd_time:
+                scheduled_at = slots.last_due(bd_time, now)
+            else:
+                bd_time, scheduled_at = slots.latest_slot(self.config.POST_SCHEDULE, now)
+            slot = slots.slot_key(bd_time, scheduled_at)
+            self.logger.info(f"📮 One-shot post for slot {slot}")
+            
+            # Resume posts left in the outbox by an earlier run first
+            await self.bot.drain_outbox()
+            
+            # The first run of a period plans it, this slot included
+            if self.config.POST_PLAN_DAYS > 0:
+                upcoming = slots.upcoming_slots(self.config.POST_SCHEDULE, scheduled_at, self.config.POST_PLAN_DAYS)
+                await self.bot.plan_posts([slots.slot_key(*slot) for slot in upcoming])
+            
+            run_id = await self.db_manager.start_slot_run(slots.post_job_id(bd_time), slot, scheduled_at)
+            success = await self.bot.post_daily_content(slot, slot_time=scheduled_at)
+            await self.db_manager.finish_slot_run(run_id, 'ok' if success else 'failed')
+            return success
+            
+        except Exception as e:
+            self.logger.error(f"❌ One-shot post failed: {str(e)}")
+            return False
+        finally:
+            await self.shutdown()
+    
     async def shutdown(self):
         try:
+            if self.webhook:
+                await self.webhook.stop()
             if self.scheduler:
                 await self.scheduler.stop()
+            if self.bot:
+                await self.bot.shutdown()
             if self.db_manager:
                 await self.db_manager.close()
         except Exception as e:
             self.logger.error(f"❌ Shutdown error: {str(e)}")
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Smart Study Bot")
+    parser.add_argument("command", nargs="?", choices=["run", "post-now"], default="run",
+                        help="run the scheduler (default) or post one slot and exit")
+    parser.add_argument("--once", action="store_true", help="same as post-now")
+    parser.add_argument("--slot", default=None,
+                        help="schedule time to post with post-now, e.g. 08:00 (default: latest slot due)")
+    return parser.parse_args(argv)
+
 def main():
-    app = SmartStudyBotApp()
+    args = parse_args()
+    once = args.once or args.command == "post-now"
+    app = SmartStudyBotApp(once=once)
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     
     try:
         init_success = loop.run_until_complete(app.initialize())
-        if init_success:
-            loop.run_until_complete(app.run())
-        else:
+        if not init_success:
             sys.exit(1)
+        if once:
+            if not loop.run_until_complete(app.post_once(args.slot)):
+                sys.exit(1)
+        else:
+            loop.run_until_complete(app.run())
     except Exception as e:
         app.logger.error(f"❌ Fatal error: {str(e)}")
         sys.exit(1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark ingest-time duplicate checks as the question bank grows
+
+Seeds a bank of synthetic Bengali/English questions, then times checking
+fresh questions and edited variants of existing ones. The variants cover
+whitespace, punctuation, NFD, one changed word and one inserted word.
+Check latency should stay flat as the bank grows, because only indexed
+probes are made.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import unicodedata
+
+from src.config.constants import DB_QUESTION_TABLE
+from src.database import dedup
+from src.database.migrations import _add_dedup_index
+
+CONSONANTS = "কখগঘচছজঝটঠডঢতথদধনপফবভমযরলশষসহ"
+VOWEL_SIGNS = ["", "া", "ি", "ী", "ু", "ূ", "ে", "ো", "্র", "্য"]
+ENGLISH = ["newton", "motion", "energy", "force", "limit", "matrix", "vector", "entropy", "bond", "network"]
+
+def bengali_word(rng):
+    return "".join(rng.choice(CONSONANTS) + rng.choice(VOWEL_SIGNS) for _ in range(rng.randint(2, 4)))
+
+def sentence(rng, vocabulary):
+    return " ".join(rng.choice(vocabulary) for _ in range(rng.randint(6, 12))) + " ব্যাখ্যা কর।"
+
+def variants(rng, vocabulary, text):
+    words = text.split()
+    changed = list(words)
+    changed[rng.randrange(len(changed) - 2)] = rng.choice(vocabulary)
+    inserted = list(words)
+    inserted.insert(rng.randrange(len(inserted)), rng.choice(vocabulary))
+    return {
+        "whitespace": "  ".join(words),
+        "punctuation": text.replace("।", "?"),
+        "nfd": unicodedata.normalize("NFD", text),
+        "changed word": " ".join(changed),
+        "inserted word": " ".join(inserted),
+    }
+
+def seed(conn, rng, vocabulary, total):
+    conn.execute(f"""
+        CREATE TABLE {DB_QUESTION_TABLE} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, class TEXT NOT NULL, subject TEXT NOT NULL,
+            question TEXT NOT NULL, importance TEXT, marks INTEGER, chapter TEXT,
+            UNIQUE(class, subject, question)
+        )
+    """)
+    conn.executemany(
+        f"INSERT OR IGNORE INTO {DB_QUESTION_TABLE} (class, subject, question) VALUES (?, ?, ?)",
+        (("class_11", rng.choice(["physics", "chemistry"]), sentence(rng, vocabulary)) for _ in range(total))
+    )
+    started = time.perf_counter()
+    _add_dedup_index(conn)
+    conn.commit()
+    return time.perf_counter() - started
+
+def time_checks(conn, questions, threshold):
+    latencies, hits = [], 0
+    for subject_key, text in questions:
+        started = time.perf_counter()
+        duplicate = dedup.find_duplicate(conn, dedup.fingerprint("class_11", subject_key, text), threshold)
+        latencies.append(time.perf_counter() - started)
+        hits += duplicate is not None
+    return latencies, hits
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,300000", help="comma-separated bank sizes (1000000 takes a few minutes)")
+    parser.add_argument("--checks", type=int, default=500)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"🧬 Duplicate checks (threshold {args.threshold}, {args.checks} per kind)")
+    for size in map(int, args.sizes.split(",")):
+        rng = random.Random(args.seed)
+        vocabulary = [bengali_word(rng) for _ in range(20000)] + ENGLISH
+
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = sqlite3.connect(os.path.join(tmp, "dedup.db"))
+            backfill = seed(conn, rng, vocabulary, size)
+
+            sample = conn.execute(f"""
+                SELECT subject, question FROM {DB_QUESTION_TABLE} ORDER BY RANDOM() LIMIT ?
+            """, (args.checks,)).fetchall()
+            kinds = {"fresh": [(rng.choice(["physics", "chemistry"]), sentence(rng, vocabulary)) for _ in sample]}
+            for subject_key, text in sample:
+                for kind, variant in variants(rng, vocabulary, text).items():
+                    kinds.setdefault(kind, []).append((subject_key, variant))
+
+            print(f"   {size:>9,} questions, fingerprinted in {backfill:.1f}s "
+                  f"({size / backfill:,.0f}/s)")
+            for kind, questions in kinds.items():
+                latencies, hits = time_checks(conn, questions, args.threshold)
+                print(f"      {kind:14} p50 {statistics.median(latencies) * 1000:5.2f} ms  "
+                      f"p99 {percentile(latencies, 99) * 1000:5.2f} ms  flagged {hits / len(questions):6.1%}")
+            conn.close()
+
+if __name__ == "__main__":
+    main()
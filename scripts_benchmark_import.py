@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk import throughput with and without near-duplicate checks
+
+Seeds a bank, then imports a JSONL file of fresh questions mixed with
+exact and near-duplicates two ways: with near-duplicate checks (the
+importer's default) and with exact duplicates only (DEDUP_THRESHOLD
+above 1).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+os.environ.setdefault("BOT_TOKEN", "0:benchmark")
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import tempfile
+
+from src.database import dedup
+from src.database.database import DatabaseManager
+from src.database.importer import BulkImporter
+
+CONSONANTS = "কখগঘচছজঝটঠডঢতথদধনপফবভমযরলশষসহ"
+VOWEL_SIGNS = ["", "া", "ি", "ী", "ু", "ূ", "ে", "ো", "্র", "্য"]
+SUBJECTS = ["physics", "chemistry", "mathematics", "biology"]
+
+def sentence(rng, vocabulary):
+    return " ".join(rng.choice(vocabulary) for _ in range(rng.randint(6, 12))) + " ব্যাখ্যা কর।"
+
+def write_rows(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        for class_key, subject_key, question in rows:
+            f.write(json.dumps({"class": class_key, "subject": subject_key, "question": question,
+                                "importance": "medium", "marks": 5, "chapter": ""}, ensure_ascii=False) + "\n")
+
+def import_rows(rng, vocabulary, bank, count):
+    rows = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.1 and bank:
+            rows.append(rng.choice(bank))
+        elif kind < 0.2 and bank:
+            class_key, subject_key, question = rng.choice(bank)
+            words = question.split()
+            words.insert(rng.randrange(len(words)), rng.choice(vocabulary))
+            rows.append((class_key, subject_key, " ".join(words)))
+        else:
+            rows.append(("class_11", rng.choice(SUBJECTS), sentence(rng, vocabulary)))
+    # Repeats within the file as well
+    rows.extend(rng.sample(rows, count // 20))
+    return rows
+
+async def run(tmp, name, threshold, bank_path, import_path, batch_size):
+    # Every run starts as cold as a fresh import process
+    dedup._shingle_hash.cache_clear()
+    db_manager = DatabaseManager(os.path.join(tmp, f"{name}.db"), catalog_cache=False)
+    await db_manager.initialize()
+    await BulkImporter(db_manager, batch_size=batch_size, threshold=2.0).import_file(bank_path)
+    report = await BulkImporter(db_manager, batch_size=batch_size, threshold=threshold).import_file(import_path)
+    await db_manager.close()
+    return report
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bank", type=int, default=100_000)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = random.Random(args.seed)
+    vocabulary = ["".join(rng.choice(CONSONANTS) + rng.choice(VOWEL_SIGNS) for _ in range(rng.randint(2, 4)))
+                  for _ in range(20000)]
+    bank = [("class_11", rng.choice(SUBJECTS), sentence(rng, vocabulary)) for _ in range(args.bank)]
+    rows = import_rows(rng, vocabulary, bank, args.rows)
+
+    print(f"📥 Importing {len(rows):,} rows into a bank of {args.bank:,} (batches of {args.batch_size})")
+    with tempfile.TemporaryDirectory() as tmp:
+        bank_path = os.path.join(tmp, "bank.jsonl")
+        import_path = os.path.join(tmp, "import.jsonl")
+        write_rows(bank_path, bank)
+        write_rows(import_path, rows)
+
+        for name, threshold in [("near-duplicate checks", args.threshold), ("exact only", 2.0)]:
+            report = await run(tmp, name.replace(" ", "_"), threshold, bank_path, import_path, args.batch_size)
+            print(f"   {name:21} {report.rows_per_second:9,.0f} rows/s  ({report.elapsed:.2f}s)  "
+                  f"inserted {report.inserted:,}  duplicates {report.duplicates:,}  near {report.near_duplicates:,}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
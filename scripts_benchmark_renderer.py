@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark the post renderer against the old string-concatenation loop
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import random
+import timeit
+from datetime import datetime
+
+from src.config import get_config
+from src.config.constants import POST_TEMPLATES
+from src.utils.renderer import PostRenderer
+
+IMPORTANCE = ["very_high", "high", "medium", "low"]
+
+def build_classes(config, total_questions):
+    buckets = [
+        (class_key, subject_key)
+        for class_key in config.CLASSES
+        for subject_key in config.SUBJECTS.get(class_key, [])
+    ]
+    per_bucket = max(1, total_questions // len(buckets))
+
+    classes = []
+    for class_key in config.CLASSES:
+        subjects = []
+        for subject_key in config.SUBJECTS.get(class_key, []):
+            questions = [{
+                'id': i,
+                'question': f"{subject_key} প্রশ্ন নম্বর {i}: সংজ্ঞা ও উদাহরণ লিখ",
+                'importance': random.choice(IMPORTANCE),
+                'marks': random.choice([5, 8, 10, 15]),
+                'chapter': f"অধ্যায় {i % 12}"
+            } for i in range(per_bucket)]
+            subjects.append((subject_key, questions, "নিয়মিত পড়াশোনা ও প্র্যাকটিস করুন"))
+        classes.append((class_key, subjects))
+    return classes
+
+def render_legacy(config, greeting, now, classes):
+    """The pre-renderer implementation, kept here only as a baseline."""
+    content = f"{greeting}"
+    content += f"📅 *তারিখ:* {now.strftime('%d %B, %Y')}\n"
+    content += f"⏰ *সময়:* {now.strftime('%I:%M %p')}\n"
+    content += "="*30 + "\n\n"
+
+    for class_key, subjects in classes:
+        class_name = config.get_class_name(class_key)
+        content += f"🎓 *{class_name.upper()}*\n"
+        content += "⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯\n"
+
+        for subject_key, questions, suggestion in subjects:
+            if questions:
+                subject_name = config.get_subject_name(subject_key, "bn")
+                content += f"📖 *{subject_name}:*\n"
+
+                for idx, question in enumerate(questions, 1):
+                    content += f"   {idx}. {question.get('question', '')}\n"
+                    if question.get('chapter', ''):
+                        content += f"      📚 অধ্যায়: {question['chapter']}\n"
+                    if question.get('marks', 5):
+                        content += f"      📝 নম্বর: {question['marks']}\n"
+                    if question.get('importance') == 'very_high':
+                        content += "      🔥 *১০০% পরীক্ষায় আসবে*\n"
+                    elif question.get('importance') == 'high':
+                        content += "      ⭐ *খুবই গুরুত্বপূর্ণ*\n"
+
+                if suggestion:
+                    content += f"      💡 *পরামর্শ:* {suggestion}\n"
+                content += "\n"
+
+        content += "\n"
+
+    content += "="*30 + "\n"
+    content += "🤖 *বটের বিশেষত্ব:*\n"
+    content += "• স্বয়ংক্রিয় প্রশ্ন পোস্টিং\n"
+    content += "• ১০০% পরীক্ষার জন্য গুরুত্বপূর্ণ\n"
+    content += "• দৈনিক ৭ বার আপডেট\n\n"
+    content += "📌 *চ্যানেলে যুক্ত হন:* @smartstudynotes11\n"
+    content += "🤖 *বট:* @smartstudy11bot\n"
+    return content
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 50, 100, 200, 500])
+    parser.add_argument("--number", type=int, default=200, help="renders per measurement")
+    args = parser.parse_args()
+
+    config = get_config()
+    greeting = POST_TEMPLATES["morning"]
+    now = datetime.now()
+
+    print(f"{'questions':>10} {'legacy µs':>11} {'renderer µs':>12} {'speedup':>9}")
+
+    for size in args.sizes:
+        classes = build_classes(config, size)
+
+        def legacy():
+            return render_legacy(config, greeting, now, classes)
+
+        def compiled():
+            return renderer.render_daily_post(greeting, now, classes)
+
+        renderer = PostRenderer(config)
+        assert legacy() == compiled(), "renderer output differs from legacy output"
+
+        legacy_time = min(timeit.repeat(legacy, number=args.number, repeat=5)) / args.number
+        compiled_time = min(timeit.repeat(compiled, number=args.number, repeat=5)) / args.number
+        print(f"{size:>10} {legacy_time * 1e6:>11.1f} {compiled_time * 1e6:>12.1f} {legacy_time / compiled_time:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark question search: FTS5 unicode61 (with marks), FTS5 trigram and LIKE
+
+Seeds a bank of mixed Bengali/English questions. Each query is a word
+stem without its inflection, e.g. ``নিউটন`` for ``নিউটনের``. The script
+reports index size, query latency and recall, using a LIKE substring scan
+as ground truth. Default unicode61 is included to show how it fragments
+Bengali words.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from src.database import search
+from src.database.search import SEARCH_TOKENIZER
+
+CONSONANTS = "কখগঘচছজঝটঠডঢতথদধনপফবভমযরলশষসহ"
+VOWEL_SIGNS = ["", "া", "ি", "ী", "ু", "ূ", "ে", "ো", "্র", "্য"]
+SUFFIXES = ["", "ের", "কে", "টি", "গুলো", "র", "ে"]
+ENGLISH = ["newton", "motion", "energy", "force", "limit", "continuity", "matrix", "vector",
+           "entropy", "bond", "reaction", "algorithm", "network", "database", "integral"]
+IMPORTANCE = ["very_high", "high", "medium", "low"]
+
+TOKENIZERS = {
+    "unicode61+marks (shipped)": SEARCH_TOKENIZER,
+    "unicode61 default": "unicode61",
+    "trigram": "trigram",
+}
+
+def bengali_word(rng):
+    return "".join(rng.choice(CONSONANTS) + rng.choice(VOWEL_SIGNS) for _ in range(rng.randint(2, 4)))
+
+def seed(conn, rng, total, vocabulary):
+    conn.execute("""
+        CREATE TABLE questions (
+            id INTEGER PRIMARY KEY, class TEXT, subject TEXT, question TEXT,
+            importance TEXT, marks INTEGER, chapter TEXT
+        )
+    """)
+    rows = []
+    for i in range(total):
+        words = [rng.choice(vocabulary) + rng.choice(SUFFIXES) for _ in range(rng.randint(6, 14))]
+        rows.append((i + 1, "class_11", "physics", " ".join(words), rng.choice(IMPORTANCE),
+                     5, rng.choice(vocabulary) + " " + rng.choice(vocabulary)))
+    conn.executemany("INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+
+def build_index(conn, tokenizer):
+    conn.execute("DROP TABLE IF EXISTS questions_fts")
+    started = time.perf_counter()
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE questions_fts USING fts5(
+            question, chapter, content='questions', content_rowid='id', tokenize="{tokenizer}"
+        )
+    """)
+    conn.execute("INSERT INTO questions_fts(questions_fts) VALUES ('rebuild')")
+    conn.commit()
+    elapsed = time.perf_counter() - started
+    pages = conn.execute(
+        "SELECT SUM(pgsize) FROM dbstat WHERE name LIKE 'questions_fts%'"
+    ).fetchone()[0] if has_dbstat(conn) else None
+    return elapsed, pages
+
+def has_dbstat(conn):
+    try:
+        conn.execute("SELECT 1 FROM dbstat LIMIT 1")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def time_queries(conn, queries, limit):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        rows = search.search(conn, query, limit=limit)
+        latencies.append(time.perf_counter() - started)
+        results.append({row['id'] for row in rows})
+    return latencies, results
+
+def matching_ids(conn, query):
+    """Ground truth: every question containing all terms anywhere (LIKE fallback, unlimited)."""
+    conn.execute("ALTER TABLE questions_fts RENAME TO questions_fts_off")
+    try:
+        return {row['id'] for row in search.search(conn, query, limit=-1)}
+    finally:
+        conn.execute("ALTER TABLE questions_fts_off RENAME TO questions_fts")
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=50000)
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = [bengali_word(rng) for _ in range(args.vocabulary)] + ENGLISH
+    queries = [rng.choice(vocabulary) for _ in range(args.queries)]
+    queries += [f"{rng.choice(vocabulary)} {rng.choice(ENGLISH)}" for _ in range(args.queries // 4)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "search.db"))
+        seed(conn, rng, args.questions, vocabulary)
+        print(f"🔎 {args.questions:,} questions, {len(queries)} stem queries (limit {args.limit})")
+
+        # With the index renamed away, search() falls back to the LIKE scan
+        build_index(conn, SEARCH_TOKENIZER)
+        truth = [matching_ids(conn, query) for query in queries]
+
+        conn.execute("ALTER TABLE questions_fts RENAME TO questions_fts_off")
+        like_latencies, _ = time_queries(conn, queries, args.limit)
+        conn.execute("ALTER TABLE questions_fts_off RENAME TO questions_fts")
+        print(f"   {'LIKE scan':28} p50 {statistics.median(like_latencies) * 1000:7.2f} ms  "
+              f"p99 {percentile(like_latencies, 99) * 1000:7.2f} ms")
+
+        for name, tokenizer in TOKENIZERS.items():
+            build_time, size = build_index(conn, tokenizer)
+            latencies, results = time_queries(conn, queries, args.limit)
+
+            # A result set is complete if it holds min(limit, true matches) true hits
+            recall = statistics.mean(
+                len(found & expected) / min(args.limit, len(expected)) if expected else 1.0
+                for found, expected in zip(results, truth)
+            )
+            false_hits = sum(len(found - expected) for found, expected in zip(results, truth))
+            size_text = f"{size / 1e6:5.1f} MB" if size else "   n/a"
+            print(f"   {name:28} p50 {statistics.median(latencies) * 1000:7.2f} ms  "
+                  f"p99 {percentile(latencies, 99) * 1000:7.2f} ms  index {size_text}  "
+                  f"build {build_time:.2f}s  recall {recall:.1%}  false hits {false_hits}")
+
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-post question selection as the subject list grows
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from src.database.database import DatabaseManager
+
+IMPORTANCE = ["very_high", "high", "medium", "low"]
+
+def seed_bank(conn, buckets, total_questions, history_days):
+    per_bucket = max(1, total_questions // len(buckets))
+    rows = []
+    for class_key, subject_key in buckets:
+        for i in range(per_bucket):
+            rows.append((
+                class_key, subject_key, f"{class_key} {subject_key} question {i}",
+                random.choice(IMPORTANCE), random.choice([5, 8, 10, 15]), f"Chapter {i % 12}"
+            ))
+    conn.executemany("""
+        INSERT INTO questions (class, subject, question, importance, marks, chapter)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, rows)
+
+    # A realistic slice of history: 7 posts a day, 3 questions per bucket
+    ids = [row[0] for row in conn.execute("SELECT id FROM questions")]
+    today = datetime.now()
+    history = []
+    for day in range(history_days):
+        post_date = (today - timedelta(days=day)).strftime('%Y-%m-%d')
+        for question_id in random.sample(ids, min(len(ids), 21 * len(buckets) // 5)):
+            history.append((question_id, post_date, "08:00"))
+    conn.executemany(
+        "INSERT INTO posted_history (question_id, post_date, post_time) VALUES (?, ?, ?)",
+        history
+    )
+
+async def time_per_bucket(db_manager, buckets, limit, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for class_key, subject_key in buckets:
+            await db_manager.get_unique_questions(class_key, subject_key, limit)
+    return (time.perf_counter() - start) / rounds
+
+async def time_batched(db_manager, buckets, limit, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await db_manager.get_questions_for_post(buckets, limit)
+    return (time.perf_counter() - start) / rounds
+
+async def run_case(subject_count, args):
+    buckets = [(f"class_{i % 5}", f"subject_{i}") for i in range(subject_count)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        db_manager.executor.start()
+        await db_manager.create_tables()
+        await db_manager.executor.write(seed_bank, buckets, args.questions, args.history_days)
+        # Build the rotation queues once so both paths are timed in steady state
+        await db_manager.get_questions_for_post(buckets, args.limit)
+
+        per_bucket = await time_per_bucket(db_manager, buckets, args.limit, args.rounds)
+        batched = await time_batched(db_manager, buckets, args.limit, args.rounds)
+
+        await db_manager.close()
+
+    return per_bucket, batched
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=20000, help="total questions in the bank")
+    parser.add_argument("--history-days", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=3, help="questions per subject")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--subjects", type=int, nargs="+", default=[5, 10, 20, 40, 80])
+    args = parser.parse_args()
+
+    print(f"📊 Bank: {args.questions} questions, {args.history_days} days of history")
+    print(f"{'subjects':>10} {'per-bucket ms':>15} {'batched ms':>12} {'speedup':>9}")
+
+    for subject_count in args.subjects:
+        per_bucket, batched = await run_case(subject_count, args)
+        print(f"{subject_count:>10} {per_bucket * 1000:>15.2f} {batched * 1000:>12.2f} {per_bucket / batched:>8.1f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start import time of main.py for one-shot runs
+
+Imports main in fresh interpreters under ``-X importtime``, and reports
+the median cumulative import time and the slowest top-level imports. It
+fails when the median is over the budget, or when a module that only the
+long-running mode needs (APScheduler, aiohttp) is imported. Cron and CI
+runners pay this cost on every post.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import re
+import statistics
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Only the scheduler and webhook server need these
+LAZY_MODULES = ("apscheduler", "aiohttp")
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def import_profile(module: str):
+    """Cumulative microseconds for ``module``, its direct imports as ``[(us, name)]``, and every module imported."""
+    env = dict(os.environ, BOT_TOKEN=os.environ.get("BOT_TOKEN") or "benchmark", PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # Children are printed before their parent, so the direct imports of
+    # ``module`` are the depth-1 lines since the previous top-level line
+    children, names = [], set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)), (len(match.group(3)) - 1) // 2, match.group(4)
+        names.add(name)
+        if depth == 1:
+            children.append((cumulative, name))
+        elif depth == 0:
+            if name == module:
+                return cumulative, sorted(children, reverse=True), names
+            children = []
+    raise RuntimeError(f"{module} was not imported")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=500)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    totals = []
+    for _ in range(args.runs):
+        cumulative, children, names = import_profile(args.module)
+        totals.append(cumulative / 1000)
+
+    median = statistics.median(totals)
+    print(f"🚀 import {args.module}: median {median:.0f} ms over {args.runs} runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f}, budget {args.budget_ms:.0f})")
+    for cumulative, name in children[:args.top]:
+        print(f"   {cumulative / 1000:7.1f} ms  {name}")
+
+    eager = sorted({name.split(".")[0] for name in names} & set(LAZY_MODULES))
+    if eager:
+        print(f"❌ Imported eagerly: {', '.join(eager)}")
+    if median > args.budget_ms:
+        print(f"❌ Over the {args.budget_ms:.0f} ms budget")
+    if eager or median > args.budget_ms:
+        return 1
+
+    print("✅ Within budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark weighted question selection on a large in-memory bank
+
+Builds catalog bucket entries for a synthetic bank. It times rebuilding
+the weights (NumPy and the plain-Python fallback) and steady-state picks
+per bucket and per post across all buckets. It also checks that picked
+importance levels follow their share of the weight.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from src.database import weighted
+from src.database.catalog import BucketEntry, IMPORTANCE_NAMES
+
+IMPORTANCE = ["very_high", "high", "medium", "low"]
+WEIGHTS = {"importance": 3.0, "marks": 1.0, "recency": 1.0, "chapter": 1.0}
+
+def build_bank(rng, total, bucket_count, history_days):
+    today = date.today()
+    entries = []
+    per_bucket = total // bucket_count
+    next_id = 1
+    for _ in range(bucket_count):
+        rows = []
+        for _ in range(per_bucket):
+            posted = rng.random() < 0.4
+            last_posted = (today - timedelta(days=rng.randrange(history_days))).isoformat() if posted else None
+            rows.append((next_id, rng.choices(IMPORTANCE, [1, 2, 5, 2])[0], last_posted,
+                         f"Chapter {rng.randrange(12)}", rng.choice([2, 5, 8, 10, 15])))
+            next_id += 1
+        entries.append(BucketEntry(rows, {}, list(IMPORTANCE_NAMES)))
+    return entries
+
+def rebuild_all(entries, today, threshold, recency_days):
+    started = time.perf_counter()
+    for entry in entries:
+        entry.weights = None
+        weighted.bucket_weights(entry, today, threshold, recency_days, WEIGHTS)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=1_000_000)
+    parser.add_argument("--buckets", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=3)
+    parser.add_argument("--picks", type=int, default=2000)
+    parser.add_argument("--history-days", type=int, default=120)
+    parser.add_argument("--repost-days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    entries = build_bank(rng, args.questions, args.buckets, args.history_days)
+    today = date.today().toordinal()
+    threshold = today - args.repost_days
+    recency_days = args.repost_days * 2
+    print(f"🎲 {args.questions:,} questions in {args.buckets} buckets (built in {time.perf_counter() - started:.1f}s)")
+
+    numpy_module = weighted.np
+    if numpy_module is not None:
+        print(f"   weight rebuild, NumPy        {rebuild_all(entries, today, threshold, recency_days) * 1000:8.1f} ms for the whole bank")
+    weighted.np = None
+    try:
+        print(f"   weight rebuild, pure Python  {rebuild_all(entries[:1], today, threshold, recency_days) * len(entries) * 1000:8.1f} ms for the whole bank (extrapolated)")
+        python_picks = []
+        for _ in range(200):
+            pick_started = time.perf_counter()
+            weighted.select(entries[0], args.limit, today, threshold, recency_days, WEIGHTS)
+            python_picks.append(time.perf_counter() - pick_started)
+        print(f"   pick, pure Python            {statistics.median(python_picks) * 1e6:8.1f} µs per bucket (p50)")
+    finally:
+        weighted.np = numpy_module
+
+    rebuild_all(entries, today, threshold, recency_days)
+    picks = []
+    for _ in range(args.picks):
+        entry = rng.choice(entries)
+        pick_started = time.perf_counter()
+        weighted.select(entry, args.limit, today, threshold, recency_days, WEIGHTS)
+        picks.append(time.perf_counter() - pick_started)
+    picks.sort()
+    print(f"   pick{' (NumPy)' if numpy_module is not None else ''}                 "
+          f"{statistics.median(picks) * 1e6:8.1f} µs per bucket (p50), {picks[int(len(picks) * 0.99)] * 1e6:.1f} µs p99")
+
+    post_started = time.perf_counter()
+    for entry in entries:
+        weighted.select(entry, args.limit, today, threshold, recency_days, WEIGHTS)
+    print(f"   one post, all buckets        {(time.perf_counter() - post_started) * 1000:8.2f} ms")
+
+    # Picked importance should follow each level's share of the eligible weight
+    entry = entries[0]
+    table = weighted.bucket_weights(entry, today, threshold, recency_days, WEIGHTS)
+    expected = {}
+    previous = 0.0
+    for index in range(len(entry.ids)):
+        weight = float(table.cumulative[index]) - previous
+        previous = float(table.cumulative[index])
+        name = entry.importance_names[entry.importance[index]]
+        expected[name] = expected.get(name, 0.0) + weight
+    observed = {}
+    draws = 0
+    for _ in range(5000):
+        for question_id in weighted.select(entry, 1, today, threshold, recency_days, WEIGHTS):
+            name = entry.importance_names[entry.importance[entry.position(question_id)]]
+            observed[name] = observed.get(name, 0) + 1
+            draws += 1
+    print("   importance share, expected / picked: " + ", ".join(
+        f"{name} {expected.get(name, 0) / table.total:.1%} / {observed.get(name, 0) / draws:.1%}" for name in IMPORTANCE
+    ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Check that the question catalog cache sees questions written by another process
+
+Warms the cache for one bucket, inserts questions into that bucket through
+a second SQLite connection (as scripts/import_questions.py does while the
+bot runs), then selects, browses and lists chapters again. Every new
+question must be selectable and browsable, and its chapter listed, without
+restarting.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+os.environ.setdefault("BOT_TOKEN", "0:check")
+
+import argparse
+import asyncio
+import sqlite3
+import tempfile
+
+from src.database.database import DatabaseManager
+
+CHAPTER = "দ্বিতীয় প্রক্রিয়ার অধ্যায়"
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=5, help="questions the second connection adds")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "check.db")
+    db_manager = DatabaseManager(path)
+    if not await db_manager.initialize():
+        print("❌ Database initialization failed")
+        return 1
+    if not db_manager.catalog:
+        print("❌ Catalog cache is disabled")
+        return 1
+
+    bucket = ("class_11", "physics")
+    await db_manager.get_questions_for_post([bucket], limit=1)
+    await db_manager.browse_questions(*bucket)
+    await db_manager.list_chapters(*bucket)
+
+    # A separate connection, so nothing in this process invalidates the bucket
+    conn = sqlite3.connect(path)
+    with conn:
+        new_ids = [
+            conn.execute("""
+                INSERT INTO questions (class, subject, question, importance, marks, chapter)
+                VALUES (?, ?, ?, 'very_high', 5, ?)
+            """, (*bucket, f"অন্য প্রক্রিয়া থেকে যোগ করা প্রশ্ন {n}?", CHAPTER)).lastrowid
+            for n in range(args.questions)
+        ]
+    conn.close()
+
+    limit = args.questions + 10
+    failures = []
+    selected = {question['id'] for question in (await db_manager.get_questions_for_post([bucket], limit=limit)).get(bucket, [])}
+    if not set(new_ids) <= selected:
+        failures.append(f"selection returned {sorted(selected)}, missing {sorted(set(new_ids) - selected)}")
+    browsed = {question['id'] for question in await db_manager.browse_questions(*bucket, limit=limit)}
+    if not set(new_ids) <= browsed:
+        failures.append(f"browsing returned {sorted(browsed)}, missing {sorted(set(new_ids) - browsed)}")
+    chapters = await db_manager.list_chapters(*bucket)
+    if chapters.get(CHAPTER) != args.questions:
+        failures.append(f"chapter list {chapters} does not count the new chapter")
+
+    stats = db_manager.catalog.stats()
+    await db_manager.close()
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        return 1
+    print(f"✅ {args.questions} questions from another connection selected, browsed and listed "
+          f"(catalog {stats['misses']} misses, {stats['reloads']} reloads)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
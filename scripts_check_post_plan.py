@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Check that post plans and on-the-spot selection never repeat a question
+
+Plans the upcoming slots on a fresh database, clears the earlier half
+and plans that half again while the later half is still planned, as a
+re-run plan does. No question may be planned twice within the horizon.
+Then posts the current (unplanned) slot and every planned slot in
+order: no question may appear twice, and a question posted after it was
+planned must be dropped from its plan.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+os.environ.setdefault("BOT_TOKEN", "0:check")
+
+import argparse
+import asyncio
+import random
+import tempfile
+from datetime import datetime
+
+from src.config import get_config
+from src.bot.telegram_bot import SmartStudyBot
+from src.database import planner
+from src.database.database import DatabaseManager
+from src.scheduler import slots
+
+WORDS = ["newton", "force", "energy", "cell", "acid", "matrix", "limit", "graph", "queue", "tree",
+         "market", "entropy", "vector", "enzyme", "bond", "series", "packet", "index", "sort", "loan"]
+
+async def post(bot, db_manager, slot: str):
+    _, question_ids = await bot.build_daily_post(slot=slot)
+    await db_manager.update_posted_questions(question_ids)
+    return question_ids
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--questions", type=int, default=2, help="extra questions per subject")
+    parser.add_argument("--days", type=float, default=1, help="plan horizon in days")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = get_config()
+    rng = random.Random(args.seed)
+    db_manager = DatabaseManager(os.path.join(tempfile.mkdtemp(), "check.db"))
+    if not await db_manager.initialize():
+        print("❌ Database initialization failed")
+        return 1
+
+    for class_key in config.CLASSES:
+        for subject_key in config.SUBJECTS.get(class_key, []):
+            for _ in range(args.questions):
+                text = " ".join(rng.sample(WORDS, 8)) + f" {rng.randrange(10 ** 9)}?"
+                await db_manager.add_question(class_key, subject_key, text, rng.choice(["very_high", "high", "medium"]))
+
+    bot = SmartStudyBot(token=config.BOT_TOKEN, channel_id="@check", db_manager=db_manager)
+    now = datetime.now()
+    current = slots.slot_key(*slots.latest_slot(config.POST_SCHEDULE, now))
+    upcoming = [slots.slot_key(*slot) for slot in slots.upcoming_slots(config.POST_SCHEDULE, now, args.days)]
+    await bot.plan_posts(upcoming)
+    half = len(upcoming) // 2
+    for slot in upcoming[:half]:
+        await db_manager.executor.write(planner.drop_planned, slot, await db_manager.executor.read(planner.planned_ids, slot))
+    await bot.plan_posts(upcoming[:half])
+
+    failures = []
+    planned_in = {}
+    for slot in upcoming:
+        for question_id in await db_manager.executor.read(planner.planned_ids, slot):
+            if question_id in planned_in:
+                failures.append(f"question {question_id} planned for {planned_in[question_id]} and again for {slot}")
+            planned_in.setdefault(question_id, slot)
+    if upcoming and not await db_manager.get_planned_questions(upcoming[0]):
+        failures.append(f"next slot {upcoming[0]} has no plan")
+
+    seen = {}
+    for slot in [current] + upcoming:
+        for question_id in await post(bot, db_manager, slot):
+            if question_id in seen:
+                failures.append(f"question {question_id} posted in {seen[question_id]} and again in {slot}")
+            seen.setdefault(question_id, slot)
+    print(f"📮 Posted {len(seen)} distinct questions over {len(upcoming) + 1} slots ({current} unplanned)")
+
+    # A plan made before its question was posted elsewhere must not repost it
+    if seen:
+        question_id = next(iter(seen))
+        late_slot = "9999-12-31 08:00"
+        await db_manager.executor.write(planner.store_plan, late_slot, {("check", "check"): [{'id': question_id}]})
+        if await db_manager.get_planned_questions(late_slot):
+            failures.append(f"posted question {question_id} served from a stale plan")
+        if await db_manager.executor.read(planner.planned_ids, late_slot):
+            failures.append("stale plan entry was not dropped")
+
+    await db_manager.close()
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        return 1
+    print("✅ No question repeated and stale plan entries are dropped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Property check for the Markdown-aware message splitter over generated posts
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import random
+import re
+import time
+from datetime import datetime
+
+from src.utils.renderer import PostRenderer
+from src.utils.splitter import split_message, utf16_len, _scan_entities
+
+CONTINUATION = "*(Continued...)*\n\n"
+WORDS = [
+    "নিউটনের", "গতির", "সূত্রগুলো", "বর্ণনা", "করুন", "তড়িৎ", "ক্ষেত্র", "Limit",
+    "continuity", "*bold*", "_italic_", "`code`", "data_structures", "😀", "🧪", "𝛑", "x²",
+]
+
+def random_text(rng, max_words):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, max_words)))
+
+def random_post(rng):
+    classes = []
+    for c in range(rng.randint(1, 6)):
+        subjects = []
+        for s in range(rng.randint(1, 5)):
+            questions = [{
+                'question': random_text(rng, 400 if rng.random() < 0.05 else 25),
+                'importance': rng.choice(["very_high", "high", "medium"]),
+                'marks': rng.choice([0, 5, 10]),
+                'chapter': random_text(rng, 3) if rng.random() < 0.7 else "",
+            } for _ in range(rng.randint(0, 12))]
+            subjects.append((f"subject_{s}", questions, random_text(rng, 6) if rng.random() < 0.5 else None))
+        classes.append((f"class_{c}", subjects))
+    return PostRenderer().render_daily_post("🌅 *সুপ্রভাত!*\n\n", datetime.now(), classes)
+
+def visible(text):
+    return re.sub(r"[\s*_`]", "", text)
+
+def check(text, limit):
+    chunks = split_message(text, limit=limit, continuation=CONTINUATION)
+    stripped = []
+
+    for i, chunk in enumerate(chunks):
+        assert utf16_len(chunk) <= limit, f"chunk {i} is {utf16_len(chunk)} UTF-16 units"
+        assert _scan_entities(chunk, None) is None, f"chunk {i} leaves a Markdown entity open"
+        if i:
+            assert chunk.startswith(CONTINUATION), f"chunk {i} lacks the continuation prefix"
+            chunk = chunk[len(CONTINUATION):]
+        stripped.append(chunk)
+
+    assert visible("".join(stripped)) == visible(text), "content was lost or reordered"
+    return len(chunks)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cases", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random.randrange(1 << 30)
+    rng = random.Random(seed)
+    print(f"🎲 Seed: {seed}")
+
+    total_chunks = 0
+    for case in range(args.cases):
+        text = random_post(rng)
+        limit = rng.choice([120, 300, 1000, 4096])
+        try:
+            total_chunks += check(text, limit)
+        except AssertionError as e:
+            print(f"❌ Case {case} (limit {limit}) failed: {e}")
+            return 1
+
+    print(f"✅ {args.cases} generated posts, {total_chunks} chunks, all properties hold")
+
+    # Linear time: doubling the input should roughly double the time
+    base = random_post(random.Random(seed))
+    for factor in (16, 32, 64):
+        text = base * factor
+        started = time.perf_counter()
+        chunks = split_message(text, continuation=CONTINUATION)
+        elapsed = time.perf_counter() - started
+        print(f"⏱️ {utf16_len(text):>9} UTF-16 units -> {len(chunks):>4} chunks in {elapsed * 1000:.1f} ms")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
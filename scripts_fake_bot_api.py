@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Telegram Bot API, for offline load and latency tests
+
+Implements getMe, setWebhook, answerInlineQuery and sendMessage with
+Telegram's legacy Markdown and 4096-character checks, and can inject
+latency, flood-control 429s, 5xx errors and per-chat / global rate limits. Point the bot at it with
+TELEGRAM_API_BASE_URL=http://127.0.0.1:8081/bot
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict, deque
+
+from aiohttp import web
+
+from src.config.constants import TELEGRAM_MAX_MESSAGE_LENGTH
+
+def parse_markdown(text: str):
+    """Strip legacy Markdown like Telegram does; return (plain text, error or None)."""
+    plain = []
+    i = 0
+    n = len(text)
+
+    while i < n:
+        char = text[i]
+        if char == "\\" and i + 1 < n and text[i + 1] in "_*`[":
+            plain.append(text[i + 1])
+            i += 2
+            continue
+
+        if char in "*_`[":
+            start = i
+            if text.startswith("```", i):
+                end = text.find("```", i + 3)
+                marker = 3
+            elif char == "[":
+                close = text.find("](", i + 1)
+                end = text.find(")", close + 2) if close != -1 else -1
+                if end != -1:
+                    plain.append(text[i + 1:close])
+                    i = end + 1
+                    continue
+            else:
+                end = text.find(char, i + 1)
+                marker = 1
+
+            if end == -1:
+                offset = len(text[:start].encode("utf-8"))
+                return None, f"Bad Request: can't parse entities: Can't find end of the entity starting at byte offset {offset}"
+
+            plain.append(text[i + marker:end])
+            i = end + marker
+            continue
+
+        plain.append(char)
+        i += 1
+
+    return "".join(plain), None
+
+class FakeBotAPI:
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_429: float = 0.0,
+        retry_after: int = 1,
+        rate_5xx: float = 0.0,
+        chat_limit: int = 0,
+        global_limit: int = 0,
+        limit_tolerance_ms: float = 50.0,
+        seed: int = None
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.rate_5xx = rate_5xx
+        # Messages allowed per chat / overall in any one-second window, 0 for no limit
+        self.chat_limit = chat_limit
+        self.global_limit = global_limit
+        # Telegram does not punish a few milliseconds of network jitter
+        self.window = 1.0 - limit_tolerance_ms / 1000
+        self.rng = random.Random(seed)
+
+        self.counts = defaultdict(int)
+        self.messages = defaultdict(list)
+        self._chat_windows = defaultdict(deque)
+        self._global_window = deque()
+        self._next_message_id = defaultdict(int)
+        self.webhook_url = ""
+
+        self.app = web.Application()
+        self.app.router.add_route("*", "/bot{token}/{method}", self.handle)
+        self.app.router.add_get("/stats", self.handle_stats)
+        self.app.router.add_get("/messages", self.handle_messages)
+        self._runner = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8081):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return f"http://{host}:{port}/bot"
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    def _error(self, status: int, description: str, **parameters):
+        self.counts[f"error_{status}"] += 1
+        body = {"ok": False, "error_code": status, "description": description}
+        if parameters:
+            body["parameters"] = parameters
+        return web.json_response(body, status=status)
+
+    def _over_limit(self, window: deque, limit: int, now: float) -> bool:
+        if not limit:
+            return False
+        while window and now - window[0] >= self.window:
+            window.popleft()
+        if len(window) >= limit:
+            return True
+        window.append(now)
+        return False
+
+    async def handle(self, request: web.Request):
+        method = request.match_info["method"]
+        params = dict(await request.post()) if request.can_read_body else {}
+        self.counts["requests"] += 1
+
+        if method == "getMe":
+            return web.json_response({"ok": True, "result": {
+                "id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_bot"
+            }})
+        if method == "answerInlineQuery":
+            self.counts["inline_answers"] += 1
+            return web.json_response({"ok": True, "result": True})
+        if method in ("setWebhook", "deleteWebhook"):
+            self.webhook_url = params.get("url", "")
+            return web.json_response({"ok": True, "result": True})
+        if method != "sendMessage":
+            return self._error(404, "Not Found: method not found")
+
+        chat_id = params.get("chat_id", "")
+        text = params.get("text", "")
+
+        # Limits are judged on arrival, latency is added after
+        now = time.monotonic()
+        for scope, window, limit in (
+            ("chat", self._chat_windows[chat_id], self.chat_limit),
+            ("global", self._global_window, self.global_limit)
+        ):
+            if self._over_limit(window, limit, now):
+                self.counts[f"flood_limited_{scope}"] += 1
+                return self._error(429, "Too Many Requests: retry after 1", retry_after=1)
+
+        if self.latency_ms or self.jitter_ms:
+            delay = self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+            await asyncio.sleep(max(0.0, delay) / 1000)
+
+        if not chat_id:
+            return self._error(400, "Bad Request: chat_id is empty")
+        if not text:
+            return self._error(400, "Bad Request: message text is empty")
+
+        if self.rng.random() < self.rate_5xx:
+            return self._error(502, "Bad Gateway")
+        if self.rng.random() < self.rate_429:
+            return self._error(429, f"Too Many Requests: retry after {self.retry_after}", retry_after=self.retry_after)
+
+        plain = text
+        if params.get("parse_mode", "").lower() == "markdown":
+            plain, error = parse_markdown(text)
+            if error:
+                return self._error(400, error)
+        if len(plain.encode("utf-16-le")) // 2 > TELEGRAM_MAX_MESSAGE_LENGTH:
+            return self._error(400, "Bad Request: message is too long")
+
+        self._next_message_id[chat_id] += 1
+        message_id = self._next_message_id[chat_id]
+        self.messages[chat_id].append(text)
+        self.counts["sent"] += 1
+
+        chat = {"id": int(chat_id), "type": "private"} if chat_id.lstrip("-").isdigit() else \
+            {"id": -1, "type": "channel", "username": chat_id.lstrip("@")}
+        return web.json_response({"ok": True, "result": {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": chat,
+            "text": plain
+        }})
+
+    async def handle_stats(self, request: web.Request):
+        return web.json_response(dict(self.counts))
+
+    async def handle_messages(self, request: web.Request):
+        return web.json_response(self.messages)
+
+def run_in_process(port: int, ready, **options):
+    """Serve until killed; target for multiprocessing.Process so the server gets its own CPU."""
+    server = FakeBotAPI(**options)
+
+    async def serve():
+        await server.start(port=port)
+        ready.set()
+        while True:
+            await asyncio.sleep(3600)
+
+    asyncio.run(serve())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0, help="probability of a 429 per sendMessage")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="probability of a 502 per sendMessage")
+    parser.add_argument("--chat-limit", type=int, default=0, help="messages per chat per second before 429")
+    parser.add_argument("--global-limit", type=int, default=0, help="messages per second before 429")
+    parser.add_argument("--limit-tolerance-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    server = FakeBotAPI(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        rate_5xx=args.rate_5xx,
+        chat_limit=args.chat_limit,
+        global_limit=args.global_limit,
+        limit_tolerance_ms=args.limit_tolerance_ms
+    )
+
+    async def serve():
+        base_url = await server.start(args.host, args.port)
+        print(f"🧪 Fake Bot API listening, set TELEGRAM_API_BASE_URL={base_url}")
+        try:
+            while True:
+                await asyncio.sleep(3600)
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print(f"📊 {dict(server.counts)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Bulk import question banks (nested JSON, JSON array, JSONL or CSV)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+
+from src.database.database import DatabaseManager
+from src.database.importer import BulkImporter
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", help="files to import")
+    parser.add_argument("--db", default=None, help="database path")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--dedup-threshold", type=float, default=None,
+                        help="near-duplicate similarity (default DEDUP_THRESHOLD, above 1 to disable)")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db)
+    if not await db_manager.initialize():
+        print("❌ Database initialization failed")
+        return 1
+
+    importer = BulkImporter(db_manager, batch_size=args.batch_size, threshold=args.dedup_threshold)
+    exit_code = 0
+
+    for path in args.paths:
+        try:
+            report = await importer.import_file(path)
+        except Exception as e:
+            print(f"❌ Failed to import {path}: {str(e)}")
+            exit_code = 1
+            continue
+
+        print(f"📥 {path}")
+        print(f"   ✅ Inserted:   {report.inserted}")
+        print(f"   🔁 Duplicates: {report.duplicates}")
+        print(f"   🧬 Near-duplicates: {report.near_duplicates}")
+        for question, existing_id, similarity in report.examples:
+            print(f"      {similarity:.0%} like #{existing_id}: {question[:60]}")
+        print(f"   ❌ Rejected:   {report.rejected}")
+        print(f"   ⚡ {report.rows_per_second:,.0f} rows/s ({report.elapsed:.2f}s)")
+
+    await db_manager.close()
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
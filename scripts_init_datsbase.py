@@ -20,6 +20,9 @@ async def main():
         stats = await db_manager.get_statistics()
         print(f"✅ Database initialized")
         print(f"📝 Total questions: {stats.get('total_questions', 0)}")
+        print(f"🆕 Never posted: {stats.get('never_posted', 0)}")
+        print(f"✅ Eligible now: {stats.get('eligible_now', 0)}")
+        print(f"📤 Posts (7/30 days): {stats.get('posts_last_7_days', 0)}/{stats.get('posts_last_30_days', 0)}")
     else:
         print("❌ Database initialization failed")
     
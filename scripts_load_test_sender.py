@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Load-test the send pipeline against the local fake Bot API
+
+Two runs: raw sender throughput with Telegram's limits lifted, then a
+split post fanned out to many chats through SmartStudyBot with the real
+limits enforced by the fake server.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import statistics
+import time
+from datetime import datetime
+
+os.environ.setdefault("BOT_TOKEN", "123456:fake-token")
+
+import aiohttp
+from telegram import Bot
+
+from fake_bot_api import FakeBotAPI, run_in_process
+from src.bot.sender import TelegramSender
+from src.bot.transport import PooledRequest
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+async def throughput(args):
+    # The server runs in its own process so it does not compete for the
+    # event loop being measured
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=run_in_process, args=(args.port, ready), kwargs=dict(
+        latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 2,
+        rate_429=args.rate_429, rate_5xx=args.rate_5xx, seed=args.seed
+    ), daemon=True)
+    server.start()
+    ready.wait(10)
+    base_url = f"http://127.0.0.1:{args.port}/bot"
+
+    request = PooledRequest(pool_size=args.concurrency)
+    bot = Bot(token=os.environ["BOT_TOKEN"], base_url=base_url, request=request)
+    await bot.initialize()
+    # Limits lifted: this measures the pipeline itself, not Telegram's caps
+    sender = TelegramSender(
+        bot, global_rate=1e6, chat_rate=1e6, group_rate_per_minute=1e8,
+        backoff_base=0.01, global_burst=args.concurrency
+    )
+
+    per_chat = max(1, args.messages // args.chats)
+    plan = {chat_id: [f"{chat_id} message {i}" for i in range(per_chat)] for chat_id in range(1, args.chats + 1)}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    gaps = []
+
+    async def deliver(chat_id, texts):
+        last = None
+
+        async def on_sent(index, message):
+            nonlocal last
+            now = time.monotonic()
+            gaps.append(now - last)
+            last = now
+
+        # One chat per task keeps order; interleaving chats keeps the pool busy
+        async with semaphore:
+            last = time.monotonic()
+            return await sender.send(chat_id, texts, on_sent=on_sent)
+
+    started = time.monotonic()
+    reports = await asyncio.gather(*(deliver(chat_id, texts) for chat_id, texts in plan.items()))
+    elapsed = time.monotonic() - started
+
+    sent = sum(report.sent for report in reports)
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"http://127.0.0.1:{args.port}/messages") as response:
+            received = await response.json()
+        async with session.get(f"http://127.0.0.1:{args.port}/stats") as response:
+            server_stats = await response.json()
+    in_order = all(received.get(str(chat_id)) == texts for chat_id, texts in plan.items())
+
+    print(f"🚀 Throughput: {sent}/{per_chat * len(plan)} messages to {len(plan)} chats in {elapsed:.2f}s "
+          f"= {sent / elapsed:,.0f} msg/s")
+    print(f"   per-message latency p50 {percentile(gaps, 50) * 1000:.1f} ms, "
+          f"p99 {percentile(gaps, 99) * 1000:.1f} ms, max {max(gaps) * 1000:.1f} ms")
+    print(f"   sender {sender.stats()}, server {server_stats}")
+    print(f"   transport {request.stats()}")
+    print(f"   {'✅ every chat received its messages in order' if in_order else '❌ ordering violated'}")
+
+    await bot.shutdown()
+    server.terminate()
+    return in_order
+
+def long_post(renderer, questions_per_subject):
+    from src.config import get_config
+
+    config = get_config()
+    classes = []
+    for class_key in config.CLASSES:
+        subjects = []
+        for subject_key in config.SUBJECTS.get(class_key, []):
+            questions = [{
+                'id': i,
+                'question': f"{config.get_subject_name(subject_key)} প্রশ্ন {i}: সংজ্ঞা, ব্যাখ্যা ও উদাহরণসহ বিস্তারিত আলোচনা কর",
+                'importance': random.choice(["very_high", "high", "medium"]),
+                'marks': random.choice([5, 10]),
+                'chapter': f"অধ্যায় {i % 12}"
+            } for i in range(questions_per_subject)]
+            subjects.append((subject_key, questions, "নিয়মিত পড়াশোনা ও প্র্যাকটিস করুন"))
+        classes.append((class_key, subjects))
+    return renderer.render_daily_post("🌅 *সুপ্রভাত!*\n\n", datetime.now(), classes)
+
+async def fanout(args):
+    # Real Telegram limits on both sides: the bot must never trip the server's
+    server = FakeBotAPI(
+        latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 2,
+        chat_limit=1, global_limit=30, seed=args.seed
+    )
+    os.environ["TELEGRAM_API_BASE_URL"] = await server.start(port=args.port + 1)
+
+    from src.bot.telegram_bot import SmartStudyBot
+
+    chat_ids = [-1001000000000 - i for i in range(args.fanout_chats)]
+    bot = SmartStudyBot(os.environ["BOT_TOKEN"], str(chat_ids[0]), db_manager=None, channel_ids=chat_ids)
+    await bot.initialize()
+
+    content = long_post(bot.renderer, args.questions)
+    chunks = bot.split_post(content)
+
+    started = time.monotonic()
+    await bot.send_post(content)
+    elapsed = time.monotonic() - started
+
+    latencies = [report.latency for report in bot.last_reports]
+    complete = sum(1 for report in bot.last_reports if report.ok)
+    print(f"📣 Fan-out: {len(chunks)}-chunk post to {complete}/{len(chat_ids)} chats in {elapsed:.2f}s "
+          f"({len(chunks) * complete / elapsed:.1f} msg/s)")
+    print(f"   per-chat completion p50 {statistics.median(latencies):.2f}s, max {max(latencies):.2f}s")
+    print(f"   sender {bot.sender.stats()}, server {dict(server.counts)}")
+    print(f"   transport {bot.get_transport_stats()}")
+
+    await bot.shutdown()
+    await server.stop()
+    return complete == len(chat_ids)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--rate-429", type=float, default=0.001)
+    parser.add_argument("--rate-5xx", type=float, default=0.005)
+    parser.add_argument("--fanout-chats", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=6, help="questions per subject in the fan-out post")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    ok = asyncio.run(throughput(args))
+    if args.fanout_chats:
+        ok = asyncio.run(fanout(args)) and ok
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
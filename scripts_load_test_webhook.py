@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Load-test interactive commands through the webhook
+
+Fires a burst of /questions and /chapter updates from many users at the
+webhook server, as Telegram would during exam season, and measures how
+long each user waits for a reply. Replies go to the local fake Bot API
+with Telegram's per-chat and global limits enforced.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+os.environ.setdefault("BOT_TOKEN", "123456:fake-token")
+
+import aiohttp
+
+from fake_bot_api import FakeBotAPI
+
+IMPORTANCE = ["very_high", "high", "medium", "low"]
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+def seed_bank(conn, config, buckets, total_questions):
+    per_bucket = max(1, total_questions // len(buckets))
+    conn.executemany("""
+        INSERT INTO questions (class, subject, question, importance, marks, chapter)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [
+        (class_key, subject_key, f"{config.get_subject_name(subject_key)} প্রশ্ন {i}: সংজ্ঞা ও ব্যাখ্যা দাও",
+         random.choice(IMPORTANCE), random.choice([5, 10]), f"Chapter {i % 12}")
+        for class_key, subject_key in buckets
+        for i in range(per_bucket)
+    ])
+
+def make_update(update_id, user_id, text):
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Student"},
+            "text": text
+        }
+    }
+
+async def run(args):
+    server = FakeBotAPI(latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 2, chat_limit=1, global_limit=30)
+    os.environ["TELEGRAM_API_BASE_URL"] = await server.start(port=args.port)
+
+    from src.config import get_config
+    from src.bot.telegram_bot import SmartStudyBot
+    from src.bot.webhook import WebhookServer
+    from src.database.database import DatabaseManager
+
+    config = get_config()
+    buckets = [(class_key, subject_key) for class_key, subjects in config.SUBJECTS.items() for subject_key in subjects]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "webhook.db"))
+        db_manager.executor.start()
+        await db_manager.create_tables()
+        await db_manager.executor.write(seed_bank, config, buckets, args.questions)
+
+        bot = SmartStudyBot(os.environ["BOT_TOKEN"], "@fake_channel", db_manager)
+        await bot.initialize()
+
+        # Time each update from arrival at the webhook to its reply being accepted
+        latencies = []
+        arrived = {}
+
+        async def handler(update):
+            await bot.handle_update(update)
+            latencies.append(time.monotonic() - arrived[update["update_id"]])
+
+        webhook = WebhookServer(
+            handler, host="127.0.0.1", port=args.port + 1, secret="load-test",
+            workers=args.workers, queue_size=args.queue_size
+        )
+        await webhook.start()
+
+        updates = []
+        for update_id in range(1, args.users + 1):
+            class_key, subject_key = random.choice(buckets)
+            if random.random() < 0.7:
+                text = f"/questions {class_key} {subject_key} {random.randint(1, 5)}"
+            else:
+                text = f"/chapter {class_key} {subject_key} Chapter {random.randint(0, 11)}"
+            updates.append(make_update(update_id, 10_000 + update_id, text))
+
+        url = f"http://127.0.0.1:{args.port + 1}/webhook"
+        statuses = {}
+        started = time.monotonic()
+        async with aiohttp.ClientSession(headers={"X-Telegram-Bot-Api-Secret-Token": "load-test"}) as session:
+            async def deliver(update):
+                arrived[update["update_id"]] = time.monotonic()
+                async with session.post(url, json=update) as response:
+                    statuses[response.status] = statuses.get(response.status, 0) + 1
+
+            await asyncio.gather(*(deliver(update) for update in updates))
+            accepted = time.monotonic() - started
+            await webhook.queue.join()
+        elapsed = time.monotonic() - started
+
+        print(f"🌐 Webhook: {len(updates)} updates accepted in {accepted:.2f}s (HTTP {statuses})")
+        print(f"   {len(latencies)} replies in {elapsed:.2f}s = {len(latencies) / elapsed:.1f} replies/s")
+        print(f"   time to reply p50 {percentile(latencies, 50):.2f}s, p99 {percentile(latencies, 99):.2f}s, "
+              f"max {max(latencies, default=0):.2f}s")
+        print(f"   webhook {webhook.stats()}")
+        print(f"   sender {bot.sender.stats()}, server {dict(server.counts)}")
+        print(f"   catalog {db_manager.catalog.stats() if db_manager.catalog else 'disabled'}")
+
+        await webhook.stop()
+        await bot.shutdown()
+        await db_manager.close()
+    await server.stop()
+    return not server.counts.get("error_429") and len(latencies) == statuses.get(200, 0)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--questions", type=int, default=20000, help="questions in the seeded bank")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--port", type=int, default=8095)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    return 0 if asyncio.run(run(args)) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Plan upcoming post slots now and show what each slot will cover
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from src.config import get_config
+from src.database.database import DatabaseManager
+from src.scheduler import slots
+
+async def main():
+    config = get_config()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default=None, help="database path")
+    parser.add_argument("--days", type=float, default=config.POST_PLAN_DAYS or 1,
+                        help="how far ahead to plan (default POST_PLAN_DAYS)")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db)
+    if not await db_manager.initialize():
+        print("❌ Database initialization failed")
+        return 1
+
+    now = datetime.now()
+    slot_keys = [
+        slots.slot_key(bd_time, scheduled_at)
+        for bd_time, scheduled_at in slots.upcoming_slots(config.POST_SCHEDULE, now, args.days)
+    ]
+    buckets = [
+        (class_key, subject_key)
+        for class_key in config.CLASSES
+        for subject_key in config.SUBJECTS.get(class_key, [])
+    ]
+
+    planned = await db_manager.plan_posts(slot_keys, buckets, limit=config.MAX_QUESTIONS_PER_POST)
+    print(f"🗓️ Planned {planned} new slot(s), {len(slot_keys) - planned} already planned")
+
+    for slot, questions, bucket_count, chapters in await db_manager.get_plan_summary(slot_keys[0] if slot_keys else ""):
+        print(f"   {slot}  {questions:3} questions  {bucket_count:2} subjects  {chapters:3} chapters")
+
+    await db_manager.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Show the scheduler run log: when each slot was due, how late it started and how long it ran
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from src.database.database import DatabaseManager
+from src.database.slot_runs import TIME_FORMAT
+
+STATUS_ICONS = {'ok': '✅', 'failed': '❌', 'running': '⏳', 'skipped': '⏭️'}
+
+def seconds_between(start: str, end: str):
+    if not start or not end:
+        return None
+    return (datetime.strptime(end, TIME_FORMAT) - datetime.strptime(start, TIME_FORMAT)).total_seconds()
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default=None, help="database path")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db)
+    if not await db_manager.initialize():
+        print("❌ Database initialization failed")
+        return 1
+
+    runs = await db_manager.get_slot_runs(args.limit)
+    if not runs:
+        print("📭 No scheduled runs logged yet")
+
+    for run in runs:
+        late = seconds_between(run['scheduled_at'], run['started_at'])
+        took = seconds_between(run['started_at'], run['finished_at'])
+        details = []
+        if late is not None:
+            details.append(f"started {late:+.0f}s")
+        if took is not None:
+            details.append(f"took {took:.0f}s")
+        if run['catch_up']:
+            details.append("catch-up")
+        if run['error']:
+            details.append(run['error'])
+        print(f"{STATUS_ICONS.get(run['status'], '•')} {run['slot']:20} {run['status']:8} {', '.join(details)}")
+
+    await db_manager.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
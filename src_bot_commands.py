@@ -0,0 +1,166 @@
+"""
+Interactive bot commands
+
+Turns a command message such as ``/questions class_12 physics`` into a
+reply rendered from the question catalog. Replies use the same legacy
+Markdown and renderer as the scheduled posts, so they go out through the
+same splitter and sender. Browsing never advances the posting rotation or
+the posted history. Inline queries (``@bot newton``) are answered from
+the full-text search index.
+"""
+
+import logging
+
+from telegram import InlineQueryResultArticle, InputTextMessageContent
+from telegram.helpers import escape_markdown
+
+logger = logging.getLogger(__name__)
+
+HELP_TEXT = (
+    "🤖 *Smart Study Bot*\n\n"
+    "📚 প্রশ্ন দেখতে:\n"
+    "`/questions <class> <subject> [সংখ্যা]`\n"
+    "উদাহরণ: `/questions class_12 physics 5`\n\n"
+    "📖 অধ্যায়ের তালিকা ও অধ্যায়ভিত্তিক প্রশ্ন:\n"
+    "`/chapter <class> <subject>`\n"
+    "`/chapter <class> <subject> <chapter>`\n\n"
+    "🔎 যেকোনো চ্যাটে খুঁজুন: `@smartstudy11bot newton`\n\n"
+    "🎓 ক্লাস: {classes}\n"
+)
+
+class CommandHandler:
+    def __init__(self, config, db_manager, renderer, default_limit: int = 5, max_limit: int = 10):
+        self.config = config
+        self.db_manager = db_manager
+        self.renderer = renderer
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+        self.handled = 0
+        self.commands = {
+            "start": self.cmd_help,
+            "help": self.cmd_help,
+            "questions": self.cmd_questions,
+            "chapter": self.cmd_chapter,
+        }
+
+    @staticmethod
+    def parse(text: str):
+        """Split ``/command@bot arg ...`` into (command, args); None if not a command."""
+        if not text or not text.startswith("/"):
+            return None
+        parts = text.split()
+        command = parts[0][1:].split("@", 1)[0].lower()
+        return command, parts[1:]
+
+    async def handle(self, text: str):
+        """Reply text for a message, or None when it is not a known command."""
+        parsed = self.parse(text)
+        if not parsed or parsed[0] not in self.commands:
+            return None
+
+        command, args = parsed
+        self.handled += 1
+        try:
+            return await self.commands[command](args)
+        except Exception as e:
+            logger.error(f"❌ Error handling /{command}: {str(e)}")
+            return "⚠️ দুঃখিত, এখন উত্তর দেওয়া যাচ্ছে না। একটু পরে আবার চেষ্টা করুন।"
+
+    def resolve_bucket(self, args):
+        """(class_key, subject_key, error) from the first two arguments."""
+        if len(args) < 2:
+            return None, None, f"⚠️ ক্লাস ও বিষয় লিখুন, যেমন `/questions class_12 physics`\n\n🎓 ক্লাস: {self.class_list()}"
+
+        class_key = args[0].lower().replace("-", "_")
+        if class_key not in self.config.CLASSES:
+            return None, None, f"⚠️ অজানা ক্লাস: {escape_markdown(args[0])}\n\n🎓 ক্লাস: {self.class_list()}"
+
+        subjects = self.config.SUBJECTS.get(class_key, [])
+        subject_key = args[1].lower().replace("-", "_")
+        if subject_key not in subjects:
+            return None, None, (
+                f"⚠️ {self.config.get_class_name(class_key)}-এ এই বিষয় নেই: {escape_markdown(args[1])}\n\n"
+                f"📚 বিষয়: {', '.join(f'`{subject}`' for subject in subjects)}"
+            )
+
+        return class_key, subject_key, None
+
+    def class_list(self) -> str:
+        return ", ".join(f"`{class_key}`" for class_key in self.config.CLASSES)
+
+    def render_questions(self, class_key: str, subject_key: str, questions) -> str:
+        parts = []
+        self.renderer.render_classes(parts, [(class_key, [(subject_key, questions, None)])])
+        return "".join(parts).rstrip() + "\n"
+
+    async def cmd_help(self, args):
+        return HELP_TEXT.format(classes=self.class_list())
+
+    async def cmd_questions(self, args):
+        class_key, subject_key, error = self.resolve_bucket(args)
+        if error:
+            return error
+
+        limit = self.default_limit
+        if len(args) > 2:
+            if not args[2].isdigit():
+                return f"⚠️ প্রশ্নের সংখ্যা ১ থেকে {self.max_limit} এর মধ্যে লিখুন"
+            limit = min(max(int(args[2]), 1), self.max_limit)
+
+        questions = await self.db_manager.browse_questions(class_key, subject_key, limit)
+        if not questions:
+            return "📭 এই বিষয়ে এখনো কোনো প্রশ্ন নেই"
+        return self.render_questions(class_key, subject_key, questions)
+
+    async def cmd_chapter(self, args):
+        class_key, subject_key, error = self.resolve_bucket(args)
+        if error:
+            return error
+
+        if len(args) > 2:
+            chapter = " ".join(args[2:])
+            questions = await self.db_manager.browse_questions(class_key, subject_key, self.max_limit, chapter)
+            if questions:
+                return self.render_questions(class_key, subject_key, questions)
+
+        chapters = await self.db_manager.list_chapters(class_key, subject_key)
+        named = [(name, count) for name, count in chapters.items() if name]
+        if not named:
+            return "📭 এই বিষয়ে অধ্যায়ভিত্তিক কোনো প্রশ্ন নেই"
+
+        parts = []
+        if len(args) > 2:
+            parts.append(f"⚠️ অধ্যায় পাওয়া যায়নি: {escape_markdown(' '.join(args[2:]))}\n\n")
+        parts.append(self.subject_header_line(class_key, subject_key))
+        for name, count in named:
+            parts.append(f"   • {name} ({count})\n")
+        parts.append(f"\n👉 `/chapter {class_key} {subject_key} <chapter>`\n")
+        return "".join(parts)
+
+    async def inline_results(self, text: str, offset: str = "", limit: int = 20):
+        """Inline-query articles for ``text`` and the offset of the next page ("" when done)."""
+        start = int(offset) if offset and offset.isdigit() else 0
+        questions = await self.db_manager.search_questions(text, limit, start)
+
+        results = []
+        for question in questions:
+            class_key, subject_key = question['class'], question['subject']
+            details = [self.config.get_class_name(class_key), self.config.get_subject_name(subject_key)]
+            if question.get('chapter'):
+                details.append(question['chapter'])
+            results.append(InlineQueryResultArticle(
+                id=str(question['id']),
+                title=question['question'][:100],
+                description=" • ".join(details),
+                input_message_content=InputTextMessageContent(
+                    self.render_questions(class_key, subject_key, [question]),
+                    parse_mode="Markdown",
+                    disable_web_page_preview=True
+                )
+            ))
+
+        next_offset = str(start + len(results)) if len(results) == limit else ""
+        return results, next_offset
+
+    def subject_header_line(self, class_key: str, subject_key: str) -> str:
+        return self.renderer.class_header(class_key) + self.renderer.subject_header(subject_key)
@@ -1,3 +1,20 @@
-from .telegram_bot import SmartStudyBot
+import importlib
 
-__all__ = ['SmartStudyBot']
\ No newline at end of file
+# Exports are imported on first use, so a one-shot post does not load the
+# webhook server (aiohttp) along with the bot
+_EXPORTS = {
+    'SmartStudyBot': '.telegram_bot',
+    'TelegramSender': '.sender',
+    'TokenBucket': '.sender',
+    'DeliveryReport': '.sender',
+    'PooledRequest': '.transport',
+    'CommandHandler': '.commands',
+    'WebhookServer': '.webhook',
+}
+
+__all__ = ['SmartStudyBot', 'TelegramSender', 'TokenBucket', 'DeliveryReport', 'PooledRequest', 'CommandHandler', 'WebhookServer']
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
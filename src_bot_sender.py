@@ -0,0 +1,232 @@
+"""
+Rate-limited Telegram send pipeline
+
+Every message goes through a per-chat token bucket and one global bucket
+tuned to Telegram's documented limits (about one message per second in a
+chat, 20 per minute in groups and channels, 30 per second overall).
+Flood-control ``RetryAfter`` pauses the affected chat for exactly the time
+Telegram asks for, transient network errors are retried with exponential
+backoff, and the chunks of one post are always delivered in order.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from telegram.error import BadRequest, ChatMigrated, NetworkError, RetryAfter, TelegramError
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Async token bucket; waiters are served in arrival order."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = None
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        # Created lazily so the lock binds to the loop that actually sends
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def restamp(self):
+        """Drop refill accrued since the last token was taken.
+
+        Called at the moment a send actually starts, so the spacing between
+        two sends to a chat is measured from when they left, not from when
+        they were granted a token before waiting on another bucket.
+        """
+        self._updated = max(self._updated, time.monotonic())
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for the next ``seconds``."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+@dataclass
+class DeliveryReport:
+    chat_id: object
+    total: int
+    sent: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+    # Time from the start of a fan-out until this chat was done, queueing included
+    latency: float = 0.0
+    error: Optional[str] = None
+    message_ids: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.sent == self.total
+
+class TelegramSender:
+    def __init__(
+        self,
+        bot,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        group_rate_per_minute: float = 20,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        global_burst: float = 1
+    ):
+        self.bot = bot
+        self.chat_rate = chat_rate
+        self.group_rate_per_minute = group_rate_per_minute
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # No burst allowance overall by default: a full bucket would allow
+        # twice the global rate in the first second
+        self._global = TokenBucket(global_rate, capacity=global_burst)
+        self._chats = {}
+        self._chat_locks = {}
+
+        self.sent = 0
+        self.retries = 0
+        self.flood_waits = 0
+        self.failures = 0
+
+    @staticmethod
+    def is_group(chat_id) -> bool:
+        # Channel usernames and negative IDs are groups, supergroups or channels
+        return isinstance(chat_id, str) or (isinstance(chat_id, int) and chat_id < 0)
+
+    def _buckets(self, chat_id):
+        buckets = self._chats.get(chat_id)
+        if buckets is None:
+            buckets = [TokenBucket(self.chat_rate)]
+            if self.is_group(chat_id):
+                buckets.append(TokenBucket(
+                    self.group_rate_per_minute / 60,
+                    capacity=self.group_rate_per_minute
+                ))
+            self._chats[chat_id] = buckets
+        return buckets
+
+    def _chat_lock(self, chat_id) -> asyncio.Lock:
+        lock = self._chat_locks.get(chat_id)
+        if lock is None:
+            lock = self._chat_locks[chat_id] = asyncio.Lock()
+        return lock
+
+    async def _acquire(self, chat_id):
+        # Per-chat first, so a global token is not held while waiting on a chat
+        buckets = self._buckets(chat_id)
+        for bucket in buckets:
+            await bucket.acquire()
+        await self._global.acquire()
+        for bucket in buckets:
+            bucket.restamp()
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _send_one(self, chat_id, text: str, report: DeliveryReport, **kwargs):
+        attempt = 0
+        while True:
+            await self._acquire(chat_id)
+            try:
+                return await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+
+            except RetryAfter as e:
+                wait = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else e.retry_after
+                self.flood_waits += 1
+                logger.warning(f"⏳ Flood control on {chat_id}, retrying in {wait}s")
+                for bucket in self._buckets(chat_id):
+                    bucket.pause(wait)
+
+            except ChatMigrated as e:
+                logger.warning(f"🔀 Chat {chat_id} migrated to {e.new_chat_id}")
+                chat_id = report.chat_id = e.new_chat_id
+
+            except BadRequest:
+                # Malformed message: retrying cannot help
+                raise
+
+            except NetworkError as e:
+                # TimedOut is a NetworkError too. A timed-out request may still
+                # have been delivered, so a retry can rarely duplicate a chunk.
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"🔁 Network error on {chat_id} ({str(e)}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+            attempt += 1
+            report.retries += 1
+            self.retries += 1
+            if attempt > self.max_retries:
+                raise TelegramError(f"Giving up after {self.max_retries} retries")
+
+    async def send(self, chat_id, texts, start: int = 0, on_sent=None, **kwargs) -> DeliveryReport:
+        """Send ``texts[start:]`` to ``chat_id`` in order and report how far it got.
+
+        ``on_sent(index, message)`` is awaited after every accepted chunk,
+        before the next one is sent. Delivery stops at the first chunk that
+        still fails after retries (or whose ``on_sent`` fails), because
+        sending the rest would deliver the post out of order.
+        """
+        report = DeliveryReport(chat_id=chat_id, total=len(texts), sent=start)
+        started = time.monotonic()
+
+        # One post at a time per chat keeps chunks of concurrent posts apart
+        async with self._chat_lock(chat_id):
+            for i in range(start, len(texts)):
+                try:
+                    message = await self._send_one(report.chat_id, texts[i], report, **kwargs)
+                except TelegramError as e:
+                    self.failures += 1
+                    report.error = str(e)
+                    logger.error(f"❌ Error sending chunk {i+1}/{len(texts)} to {report.chat_id}: {str(e)}")
+                    break
+
+                report.sent += 1
+                self.sent += 1
+                if message is not None:
+                    report.message_ids.append(getattr(message, "message_id", None))
+
+                if on_sent:
+                    try:
+                        await on_sent(i, message)
+                    except Exception as e:
+                        report.error = str(e)
+                        logger.error(f"❌ Stopping delivery to {report.chat_id} after chunk {i+1}: {str(e)}")
+                        break
+
+        report.elapsed = time.monotonic() - started
+        return report
+
+    def stats(self) -> dict:
+        return {
+            'sent': self.sent,
+            'retries': self.retries,
+            'flood_waits': self.flood_waits,
+            'failures': self.failures
+        }
@@ -1,39 +1,112 @@
 import asyncio
 import logging
+import time
 from datetime import datetime
-from telegram import Bot
+from functools import partial
+from telegram import Bot, Update
 from telegram.error import TelegramError
 
-from src.config import Config
+from src.config import Config, get_config
 from src.config.constants import TELEGRAM_MAX_MESSAGE_LENGTH, POST_TEMPLATES
+from src.bot.commands import CommandHandler
+from src.bot.sender import TelegramSender
+from src.bot.transport import PooledRequest
+from src.utils.renderer import PostRenderer
+from src.utils.splitter import split_message, utf16_len
 
 logger = logging.getLogger(__name__)
 
+CONTINUATION_PREFIX = "*(Continued...)*\n\n"
+
 class SmartStudyBot:
-    def __init__(self, token: str, channel_id: str, db_manager):
-        self.bot = Bot(token=token)
+    def __init__(self, token: str, channel_id: str, db_manager, channel_ids=None):
+        self.request = PooledRequest(
+            pool_size=self.config.HTTP_POOL_SIZE,
+            keepalive_expiry=self.config.HTTP_KEEPALIVE_SECONDS,
+            connect_timeout=self.config.HTTP_CONNECT_TIMEOUT,
+            read_timeout=self.config.HTTP_READ_TIMEOUT,
+            write_timeout=self.config.HTTP_WRITE_TIMEOUT,
+            pool_timeout=self.config.HTTP_POOL_TIMEOUT,
+            http2=self.config.HTTP2_ENABLED
+        )
+        self.bot = Bot(token=token, base_url=self.config.TELEGRAM_API_BASE_URL, request=self.request)
         self.channel_id = channel_id
+        self.channel_ids = list(channel_ids) if channel_ids else [channel_id]
         self.db_manager = db_manager
-        self.config = Config()
+        self.renderer = None
+        self.commands = None
+        self.apply_config()
+        self.sender = TelegramSender(
+            self.bot,
+            global_rate=self.config.TELEGRAM_GLOBAL_RATE,
+            chat_rate=self.config.TELEGRAM_CHAT_RATE,
+            group_rate_per_minute=self.config.TELEGRAM_GROUP_RATE_PER_MINUTE,
+            max_retries=self.config.SEND_MAX_RETRIES
+        )
         self.post_count = 0
+        self.last_reports = []
+        self._drain_lock = asyncio.Lock()
+        
+        logger.info(f"🤖 Bot initialized for {', '.join(map(str, self.channel_ids))}")
+    
+    @property
+    def config(self):
+        return get_config()
+    
+    def apply_config(self):
+        """Rebuild the renderer and command handler from the current config.
         
-        logger.info(f"🤖 Bot initialized for {channel_id}")
+        Called after a config reload so new classes, subjects and names show
+        up in posts and replies. Connection and rate-limit settings keep the
+        values the bot started with.
+        """
+        config = self.config
+        self.renderer = PostRenderer(config)
+        if self.commands is None:
+            self.commands = CommandHandler(
+                config,
+                self.db_manager,
+                self.renderer,
+                default_limit=config.COMMAND_DEFAULT_QUESTIONS,
+                max_limit=config.COMMAND_MAX_QUESTIONS
+            )
+        else:
+            self.commands.config = config
+            self.commands.renderer = self.renderer
+            self.commands.default_limit = config.COMMAND_DEFAULT_QUESTIONS
+            self.commands.max_limit = config.COMMAND_MAX_QUESTIONS
+    
+    async def initialize(self) -> bool:
+        """Open the shared HTTP connection pool."""
+        try:
+            await self.bot.initialize()
+            stats = self.request.stats()
+            logger.info(f"🔌 HTTP transport ready (HTTP/{stats['http_version']}, pool of {stats['pool_size']})")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Bot initialization failed: {str(e)}")
+            return False
+    
+    async def shutdown(self):
+        try:
+            stats = self.get_transport_stats()
+            logger.info(
+                f"🔌 HTTP transport: {stats['requests']} requests over "
+                f"{stats['connections_opened']} connections ({stats['reuse_ratio']:.0%} reused)"
+            )
+            await self.bot.shutdown()
+        except Exception as e:
+            logger.error(f"❌ Bot shutdown error: {str(e)}")
+    
+    def get_transport_stats(self) -> dict:
+        return self.request.stats()
     
     async def send_post(self, content: str) -> bool:
         try:
-            if len(content) > TELEGRAM_MAX_MESSAGE_LENGTH:
+            if utf16_len(content) > TELEGRAM_MAX_MESSAGE_LENGTH:
                 return await self.send_split_post(content)
             
-            await self.bot.send_message(
-                chat_id=self.channel_id,
-                text=content,
-                parse_mode="Markdown",
-                disable_web_page_preview=True
-            )
-            
-            self.post_count += 1
-            logger.info(f"✅ Post sent to {self.channel_id}")
-            return True
+            return await self.send_chunks([content])
             
         except TelegramError as e:
             logger.error(f"❌ Telegram error: {str(e)}")
@@ -41,50 +114,76 @@ class SmartStudyBot:
     
     async def send_split_post(self, content: str) -> bool:
         try:
-            chunks = []
-            current_chunk = ""
-            
-            lines = content.split('\n')
-            for line in lines:
-                if len(current_chunk) + len(line) + 1 < TELEGRAM_MAX_MESSAGE_LENGTH:
-                    current_chunk += line + '\n'
-                else:
-                    chunks.append(current_chunk)
-                    current_chunk = line + '\n'
-            
-            if current_chunk:
-                chunks.append(current_chunk)
-            
-            success_count = 0
-            for i, chunk in enumerate(chunks):
-                try:
-                    if i == 0:
-                        await self.bot.send_message(
-                            chat_id=self.channel_id,
-                            text=chunk,
-                            parse_mode="Markdown"
-                        )
-                    else:
-                        await self.bot.send_message(
-                            chat_id=self.channel_id,
-                            text=f"*(Continued...)*\n\n{chunk}",
-                            parse_mode="Markdown"
-                        )
-                    
-                    success_count += 1
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"❌ Error sending chunk {i+1}: {str(e)}")
-            
-            return success_count > 0
+            return await self.send_chunks(self.split_post(content))
             
         except Exception as e:
             logger.error(f"❌ Error in split post: {str(e)}")
             return False
     
-    def get_time_based_greeting(self):
-        hour = datetime.now().hour
+    def split_post(self, content: str):
+        if utf16_len(content) <= TELEGRAM_MAX_MESSAGE_LENGTH:
+            return [content]
+        return split_message(
+            content,
+            limit=TELEGRAM_MAX_MESSAGE_LENGTH,
+            continuation=CONTINUATION_PREFIX
+        )
+    
+    async def send_chunks(self, chunks) -> bool:
+        reports = await self.publish(chunks)
+        delivered = any(report.sent for report in reports)
+        
+        if delivered:
+            self.post_count += 1
+        
+        return delivered
+    
+    async def publish(self, chunks, chat_ids=None, progress=None, on_sent=None):
+        """Send the same chunks to every configured chat concurrently.
+        
+        At most ``FANOUT_CONCURRENCY`` chats are in flight at once; the
+        sender's token buckets keep each chat and the bot as a whole within
+        Telegram's limits. ``progress`` maps a chat to the first chunk it
+        still needs and ``on_sent(chat_id, index, message)`` is awaited
+        after each delivered chunk. Returns one ``DeliveryReport`` per chat.
+        """
+        chat_ids = chat_ids or self.channel_ids
+        progress = progress or {}
+        semaphore = asyncio.Semaphore(self.config.FANOUT_CONCURRENCY)
+        started = time.monotonic()
+        
+        async def deliver(chat_id):
+            async with semaphore:
+                report = await self.sender.send(
+                    chat_id,
+                    chunks,
+                    start=progress.get(chat_id, 0),
+                    on_sent=partial(on_sent, chat_id) if on_sent else None,
+                    parse_mode="Markdown",
+                    disable_web_page_preview=True
+                )
+            report.latency = time.monotonic() - started
+            return report
+        
+        reports = await asyncio.gather(*(deliver(chat_id) for chat_id in chat_ids))
+        elapsed = time.monotonic() - started
+        
+        for report in reports:
+            if report.ok:
+                logger.info(f"✅ Post sent to {report.chat_id} ({report.sent} message(s), done after {report.latency:.1f}s)")
+            else:
+                logger.error(f"❌ Only {report.sent}/{report.total} chunks reached {report.chat_id}: {report.error}")
+        
+        if len(reports) > 1:
+            delivered = sum(1 for report in reports if report.ok)
+            slowest = max(report.elapsed for report in reports)
+            logger.info(f"📣 Fan-out: {delivered}/{len(reports)} chats in {elapsed:.1f}s (longest single chat {slowest:.1f}s)")
+        
+        self.last_reports = reports
+        return reports
+    
+    def get_time_based_greeting(self, now: datetime = None):
+        hour = (now or datetime.now()).hour
         
         if 5 <= hour < 12:
             return POST_TEMPLATES["morning"]
@@ -96,102 +195,269 @@ class SmartStudyBot:
             return POST_TEMPLATES["night"]
     
     async def generate_daily_content(self):
+        content, _ = await self.build_daily_post()
+        return content
+    
+    def post_buckets(self, config=None):
+        config = config or self.config
+        return [
+            (class_key, subject_key)
+            for class_key in config.CLASSES
+            for subject_key in config.SUBJECTS.get(class_key, [])
+        ]
+    
+    async def plan_posts(self, slot_keys) -> int:
+        """Assign questions to the given upcoming slots in one pass (slots already planned are kept)."""
+        planned = await self.db_manager.plan_posts(
+            slot_keys, self.post_buckets(), limit=self.config.MAX_QUESTIONS_PER_POST
+        )
+        if planned:
+            logger.info(f"🗓️ Planned questions for {planned} upcoming slot(s)")
+        return planned
+    
+    async def build_daily_post(self, now: datetime = None, question_ids=None, slot: str = None):
+        """Render the post and return it with the IDs of the questions it contains.
+        
+        ``now`` is the time shown in the post. Passing ``question_ids``
+        re-renders those questions instead of selecting new ones. Otherwise
+        the questions planned for ``slot`` are used; buckets without a plan
+        for the slot select on the spot.
+        
+        Returns ``("", [])`` on error, so callers leave the slot unposted
+        and it is retried instead of storing an error text as its post.
+        """
+        now = now or datetime.now()
+        # One config and renderer for the whole post, even if a reload lands mid-way
+        config = self.config
+        renderer = self.renderer
         try:
-            greeting = self.get_time_based_greeting()
-            date_str = datetime.now().strftime("%d %B, %Y")
-            
-            content = f"{greeting}"
-            content += f"📅 *তারিখ:* {date_str}\n"
-            content += f"⏰ *সময়:* {datetime.now().strftime('%I:%M %p')}\n"
-            content += "="*30 + "\n\n"
-            
-            all_classes = self.config.CLASSES.keys()
+            all_classes = config.CLASSES.keys()
+            if question_ids is None:
+                questions_by_bucket = await self.db_manager.get_planned_questions(slot) if slot else {}
+                missing = [bucket for bucket in self.post_buckets(config) if bucket not in questions_by_bucket]
+                if missing:
+                    questions_by_bucket.update(await self.db_manager.get_questions_for_post(
+                        missing,
+                        limit=config.MAX_QUESTIONS_PER_POST,
+                        slot=slot
+                    ))
+            else:
+                questions_by_bucket = await self.db_manager.get_questions_by_ids(question_ids)
+            question_ids = []
             
+            classes = []
             for class_key in all_classes:
-                class_name = self.config.get_class_name(class_key)
-                content += f"🎓 *{class_name.upper()}*\n"
-                content += "⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯⎯\n"
+                subjects = []
                 
-                subjects = self.config.SUBJECTS.get(class_key, [])
-                
-                for subject_key in subjects:
-                    questions = await self.db_manager.get_unique_questions(
-                        class_key=class_key,
-                        subject_key=subject_key,
-                        limit=self.config.MAX_QUESTIONS_PER_POST
-                    )
+                for subject_key in config.SUBJECTS.get(class_key, []):
+                    questions = questions_by_bucket.get((class_key, subject_key), [])
                     
                     if questions:
-                        subject_name = self.config.get_subject_name(subject_key, "bn")
-                        content += f"📖 *{subject_name}:*\n"
-                        
-                        for idx, question in enumerate(questions, 1):
-                            q_text = question.get('question', '')
-                            importance = question.get('importance', 'medium')
-                            marks = question.get('marks', 5)
-                            chapter = question.get('chapter', '')
-                            
-                            content += f"   {idx}. {q_text}\n"
-                            
-                            if chapter:
-                                content += f"      📚 অধ্যায়: {chapter}\n"
-                            if marks:
-                                content += f"      📝 নম্বর: {marks}\n"
-                            
-                            if importance == 'very_high':
-                                content += "      🔥 *১০০% পরীক্ষায় আসবে*\n"
-                            elif importance == 'high':
-                                content += "      ⭐ *খুবই গুরুত্বপূর্ণ*\n"
-                        
+                        question_ids.extend(question['id'] for question in questions)
                         suggestion = await self.db_manager.get_suggestion(
                             class_key=class_key,
                             subject_key=subject_key
                         )
-                        
-                        if suggestion:
-                            content += f"      💡 *পরামর্শ:* {suggestion}\n"
-                        
-                        content += "\n"
+                        subjects.append((subject_key, questions, suggestion))
                 
-                content += "\n"
+                classes.append((class_key, subjects))
             
-            # Footer
-            content += "="*30 + "\n"
-            content += "🤖 *বটের বিশেষত্ব:*\n"
-            content += "• স্বয়ংক্রিয় প্রশ্ন পোস্টিং\n"
-            content += "• ১০০% পরীক্ষার জন্য গুরুত্বপূর্ণ\n"
-            content += "• দৈনিক ৭ বার আপডেট\n\n"
-            content += "📌 *চ্যানেলে যুক্ত হন:* @smartstudynotes11\n"
-            content += "🤖 *বট:* @smartstudy11bot\n"
+            content = renderer.render_daily_post(
+                self.get_time_based_greeting(now),
+                now,
+                classes
+            )
             
-            return content
+            return content, question_ids
                 
         except Exception as e:
             logger.error(f"❌ Error generating content: {str(e)}")
-            return "⚠️ Error generating content"
+            return "", []
     
-    async def post_daily_content(self) -> bool:
+    async def prepare_post(self, slot: str, slot_time: datetime) -> bool:
+        """Render the post for an upcoming slot into the outbox without sending it."""
         try:
-            logger.info("🔄 Generating daily content...")
-            
-            content = await self.generate_daily_content()
+            if await self.db_manager.get_outbox_post(slot):
+                return True
             
+            # Read before selecting, so a change made meanwhile fails validation
+            version = await self.db_manager.get_bank_version()
+            content, question_ids = await self.build_daily_post(now=slot_time, slot=slot)
             if not content:
-                logger.error("❌ No content generated")
                 return False
             
-            success = await self.send_post(content)
+            queued = await self.db_manager.enqueue_outbox_post(
+                slot, content, self.split_post(content), question_ids, self.channel_ids,
+                status='prepared', version=version
+            )
+            return queued is not None
             
-            if success:
-                await self.db_manager.update_posted_questions()
-                logger.info("📝 Database updated")
+        except Exception as e:
+            logger.error(f"❌ Error preparing post for {slot}: {str(e)}")
+            return False
+    
+    async def release_prepared_post(self, post, slot_time: datetime = None) -> bool:
+        """Re-validate a prepared post against the current bank and hand it to the drain."""
+        version = await self.db_manager.get_bank_version()
+        if version is not None and version == post['bank_version']:
+            return await self.db_manager.release_outbox_post(post['id'])
+        
+        # The bank changed since rendering: re-render the same questions so
+        # edits show up and deleted questions drop out, without re-selecting
+        logger.info(f"🔁 Question bank changed since post {post['id']} was prepared, re-rendering")
+        content, question_ids = await self.build_daily_post(
+            now=slot_time,
+            question_ids=post['question_ids']
+        )
+        if not content:
+            # Stays prepared, so the next attempt re-renders it again
+            logger.error(f"❌ Could not re-render post {post['id']}, leaving it prepared")
+            return False
+        return await self.db_manager.release_outbox_post(
+            post['id'], content, self.split_post(content), question_ids, version
+        )
+    
+    async def post_daily_content(self, slot: str = None, slot_time: datetime = None) -> bool:
+        """Render the post for ``slot`` into the outbox once, then deliver it.
+        
+        If the slot was already rendered (ahead of time, by a retry or
+        before a restart), the stored post is used instead of rendering a
+        different one.
+        """
+        try:
+            slot = slot or datetime.now().strftime('%Y-%m-%d %H:%M')
+            post = await self.db_manager.get_outbox_post(slot)
             
-            return success
+            if post:
+                post_id = post['id']
+                if post['status'] == 'prepared':
+                    if not await self.release_prepared_post(post, slot_time):
+                        return False
+                elif post['status'] != 'pending':
+                    logger.info(f"♻️ Slot {slot} was already handled (post {post_id} {post['status']})")
+                    return post['status'] == 'sent'
+                else:
+                    logger.info(f"♻️ Resuming post {post_id} for slot {slot}")
+            else:
+                logger.info("🔄 Generating daily content...")
+                
+                content, question_ids = await self.build_daily_post(now=slot_time, slot=slot)
+                
+                if not content:
+                    logger.error("❌ No content generated")
+                    return False
+                
+                queued = await self.db_manager.enqueue_outbox_post(
+                    slot, content, self.split_post(content), question_ids, self.channel_ids
+                )
+                if queued is None:
+                    return False
+                post_id = queued[0]
+            
+            return await self.drain_outbox(post_id) > 0
             
         except Exception as e:
             logger.error(f"❌ Error in post_daily_content: {str(e)}")
             return False
     
+    async def drain_outbox(self, post_id: int = None) -> int:
+        """Deliver pending outbox posts (or just ``post_id``); returns chats that completed a post."""
+        try:
+            # Never let two drains send the same pending chunk
+            async with self._drain_lock:
+                delivered = 0
+                for post in await self.db_manager.get_pending_outbox(post_id):
+                    delivered += await self.deliver_outbox_post(post)
+                return delivered
+                
+        except Exception as e:
+            logger.error(f"❌ Error draining outbox: {str(e)}")
+            return 0
+    
+    async def deliver_outbox_post(self, post) -> int:
+        post_id = post['id']
+        if not post['deliveries']:
+            await self.db_manager.finish_outbox_post(post_id)
+            return 0
+        
+        chat_ids = [Config.parse_chat_id(chat_id) for chat_id in post['deliveries']]
+        progress = {
+            chat_id: next_seq
+            for chat_id, next_seq in zip(chat_ids, post['deliveries'].values())
+        }
+        resumed = sum(1 for next_seq in progress.values() if next_seq)
+        if resumed:
+            logger.info(f"♻️ Post {post_id}: resuming {resumed} partially delivered chat(s)")
+        
+        async def on_sent(chat_id, index, message):
+            done = await self.db_manager.ack_outbox_chunk(
+                post_id, chat_id, index, getattr(message, "message_id", None)
+            )
+            if done is None:
+                raise RuntimeError("could not record delivered chunk in the outbox")
+        
+        reports = await self.publish(post['chunks'], chat_ids=chat_ids, progress=progress, on_sent=on_sent)
+        
+        for chat_id, report in zip(chat_ids, reports):
+            if not report.ok:
+                await self.db_manager.fail_outbox_delivery(post_id, chat_id, report.error or "incomplete delivery")
+        
+        delivered = sum(1 for report in reports if report.ok)
+        if delivered:
+            self.post_count += 1
+        return delivered
+    
+    async def handle_update(self, data: dict) -> bool:
+        """Answer one update as Telegram posted it to the webhook; True if a reply went out."""
+        update = Update.de_json(data, self.bot)
+        if update and update.inline_query:
+            return await self.answer_inline_query(update.inline_query)
+        
+        message = update.message if update else None
+        if not message or not message.text:
+            return False
+        
+        reply = await self.commands.handle(message.text)
+        if not reply:
+            return False
+        
+        report = await self.sender.send(
+            message.chat_id,
+            self.split_post(reply),
+            parse_mode="Markdown",
+            disable_web_page_preview=True
+        )
+        return report.ok
+    
+    async def answer_inline_query(self, inline_query) -> bool:
+        results, next_offset = await self.commands.inline_results(
+            inline_query.query,
+            inline_query.offset,
+            limit=self.config.INLINE_RESULTS_LIMIT
+        )
+        # Inline answers are not chat messages, so they skip the send buckets
+        await self.bot.answer_inline_query(
+            inline_query.id,
+            results,
+            cache_time=self.config.INLINE_CACHE_SECONDS,
+            next_offset=next_offset
+        )
+        return True
+    
+    async def set_webhook(self, url: str, secret: str = None, max_connections: int = 40) -> bool:
+        try:
+            await self.bot.set_webhook(
+                url=url,
+                secret_token=secret or None,
+                max_connections=max_connections,
+                allowed_updates=["message", "inline_query"]
+            )
+            logger.info(f"🌐 Webhook registered at {url}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error setting webhook: {str(e)}")
+            return False
+    
     async def test_connection(self) -> bool:
         try:
             me = await self.bot.get_me()
@@ -0,0 +1,77 @@
+"""
+Shared pooled HTTP transport for the Telegram Bot API
+
+One ``httpx`` connection pool serves every send, with a configurable size,
+keep-alive expiry, timeouts and optional HTTP/2. Connections are traced
+through httpcore so the bot can report how many requests reused a warm
+connection instead of paying for a new TCP and TLS handshake.
+"""
+
+import logging
+
+import httpx
+from telegram.request import HTTPXRequest
+
+logger = logging.getLogger(__name__)
+
+class PooledRequest(HTTPXRequest):
+    def __init__(
+        self,
+        pool_size: int = 10,
+        keepalive_expiry: float = 60.0,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 10.0,
+        write_timeout: float = 10.0,
+        pool_timeout: float = 5.0,
+        http2: bool = False
+    ):
+        self.pool_size = pool_size
+        self.keepalive_expiry = keepalive_expiry
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+
+        kwargs = dict(
+            connection_pool_size=pool_size,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            write_timeout=write_timeout,
+            pool_timeout=pool_timeout
+        )
+        try:
+            super().__init__(http_version="2" if http2 else "1.1", **kwargs)
+        except RuntimeError as e:
+            # HTTP/2 needs the optional h2 package (python-telegram-bot[http2])
+            logger.warning(f"⚠️ HTTP/2 unavailable, using HTTP/1.1: {str(e)}")
+            super().__init__(http_version="1.1", **kwargs)
+
+    def _build_client(self) -> httpx.AsyncClient:
+        self._client_kwargs["limits"] = httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.pool_size,
+            keepalive_expiry=self.keepalive_expiry
+        )
+        self._client_kwargs["event_hooks"] = {"request": [self._attach_trace]}
+        return super()._build_client()
+
+    async def _attach_trace(self, request: httpx.Request):
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event: str, info: dict):
+        if event == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+    def stats(self) -> dict:
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            'http_version': self.http_version,
+            'pool_size': self.pool_size,
+            'requests': self.requests,
+            'connections_opened': self.connections_opened,
+            'tls_handshakes': self.tls_handshakes,
+            'reused': reused,
+            'reuse_ratio': reused / self.requests if self.requests else 0.0
+        }
@@ -0,0 +1,156 @@
+"""
+Webhook HTTP server for interactive updates
+
+Telegram POSTs each update to ``WEBHOOK_PATH``. The handler only checks the
+secret token header and queues the raw update, so Telegram gets its 200
+straight away. A fixed pool of worker tasks drains the queue concurrently.
+When the queue is full the server answers 503 and Telegram redelivers the
+update later. That bounds memory and load during bursts instead of letting
+pending replies pile up.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+class WebhookServer:
+    def __init__(
+        self,
+        handler,
+        host: str = "0.0.0.0",
+        port: int = 8443,
+        path: str = "/webhook",
+        secret: str = "",
+        workers: int = 8,
+        queue_size: int = 1000
+    ):
+        # handler(update_dict) is awaited once per update by a worker
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secret = secret
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queue = None
+        self.received = 0
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.duplicates = 0
+        self.handling_time = 0.0
+        # Telegram redelivers an update it thinks was lost; remember recent IDs
+        self._recent_ids = deque(maxlen=4096)
+        self._recent_set = set()
+        self._tasks = []
+        self._runner = None
+
+        self.app = web.Application()
+        self.app.router.add_post(path, self.handle)
+        self.app.router.add_get("/health", self.handle_health)
+
+    async def start(self):
+        # Created here so the queue binds to the running loop
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"🌐 Webhook listening on {self.host}:{self.port}{self.path} ({self.workers} workers)")
+
+    async def stop(self, timeout: float = 10.0):
+        try:
+            if self._runner:
+                await self._runner.cleanup()
+                self._runner = None
+            # Let queued updates finish, then stop the workers
+            if not self.queue:
+                return
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ Webhook stopped with {self.queue.qsize()} update(s) unprocessed")
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            logger.info(f"✅ Webhook stopped ({self.processed} updates processed)")
+        except Exception as e:
+            logger.error(f"❌ Error stopping webhook: {str(e)}")
+
+    def _seen(self, update_id) -> bool:
+        if update_id is None:
+            return False
+        if update_id in self._recent_set:
+            return True
+        if len(self._recent_ids) == self._recent_ids.maxlen:
+            self._recent_set.discard(self._recent_ids[0])
+        self._recent_ids.append(update_id)
+        self._recent_set.add(update_id)
+        return False
+
+    async def handle(self, request: web.Request):
+        if self.secret and request.headers.get(SECRET_HEADER) != self.secret:
+            return web.Response(status=403)
+
+        try:
+            update = await request.json()
+        except ValueError:
+            return web.Response(status=400)
+
+        # Valid JSON is not necessarily an update: [] or "x" would fail below
+        update_id = update.get("update_id") if isinstance(update, dict) else None
+        if not isinstance(update_id, int) or isinstance(update_id, bool):
+            return web.Response(status=400)
+
+        if self._seen(update_id):
+            self.duplicates += 1
+            return web.Response()
+
+        try:
+            self.queue.put_nowait(update)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            # Forget it so the redelivery is not dropped as a duplicate
+            self._recent_set.discard(update_id)
+            return web.Response(status=503)
+
+        self.received += 1
+        return web.Response()
+
+    async def handle_health(self, request: web.Request):
+        return web.json_response(self.stats())
+
+    async def _worker(self):
+        while True:
+            update = await self.queue.get()
+            started = time.monotonic()
+            try:
+                await self.handler(update)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"❌ Error handling update {update.get('update_id')}: {str(e)}")
+            finally:
+                self.handling_time += time.monotonic() - started
+                self.queue.task_done()
+
+    def stats(self) -> dict:
+        done = self.processed + self.failed
+        return {
+            'received': self.received,
+            'processed': self.processed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'duplicates': self.duplicates,
+            'queued': self.queue.qsize() if self.queue else 0,
+            'workers': self.workers,
+            'avg_handling_ms': self.handling_time / done * 1000 if done else 0.0
+        }
@@ -8,6 +8,19 @@ TELEGRAM_MAX_MESSAGE_LENGTH = 4096
 # Database
 DB_QUESTION_TABLE = "questions"
 DB_POSTED_TABLE = "posted_history"
+DB_ROTATION_TABLE = "question_rotation"
+DB_ROTATION_STATE_TABLE = "rotation_state"
+DB_POSTED_MONTHLY_TABLE = "posted_history_monthly"
+DB_STATS_TABLE = "question_stats"
+DB_STATS_DAILY_TABLE = "question_stats_daily"
+DB_OUTBOX_TABLE = "outbox_posts"
+DB_OUTBOX_CHUNKS_TABLE = "outbox_chunks"
+DB_OUTBOX_DELIVERIES_TABLE = "outbox_deliveries"
+DB_BANK_VERSION_TABLE = "bank_version"
+DB_SEARCH_TABLE = "questions_fts"
+DB_DEDUP_TABLE = "question_lsh"
+DB_SLOT_RUNS_TABLE = "slot_runs"
+DB_PLAN_TABLE = "post_plan"
 
 # Importance Levels
 IMPORTANCE_LEVELS = {
@@ -23,4 +36,15 @@ POST_TEMPLATES = {
     "afternoon": "☀️ *শুভ অপরাহ্ন!* পড়ালেখায় মনোযোগ...\n\n",
     "evening": "🌆 *শুভ সন্ধ্যা!* আজকের শেষ সেশন...\n\n",
     "night": "🌙 *শুভ রাত্রি!* আগামীকালের প্রস্তুতি...\n\n"
-}
\ No newline at end of file
+}
+
+# Post Footer
+POST_FOOTER = (
+    "=" * 30 + "\n"
+    "🤖 *বটের বিশেষত্ব:*\n"
+    "• স্বয়ংক্রিয় প্রশ্ন পোস্টিং\n"
+    "• ১০০% পরীক্ষার জন্য গুরুত্বপূর্ণ\n"
+    "• দৈনিক ৭ বার আপডেট\n\n"
+    "📌 *চ্যানেলে যুক্ত হন:* @smartstudynotes11\n"
+    "🤖 *বট:* @smartstudy11bot\n"
+)
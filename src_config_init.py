@@ -1,28 +1,154 @@
+import json
+import logging
 import os
+import threading
+from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Settings CONFIG_FILE may set (keys are case-insensitive). Everything else
+# comes from the environment only.
+FILE_SETTINGS = (
+    "POST_SCHEDULE", "CLASSES", "SUBJECTS", "SUBJECT_NAMES",
+    "MAX_QUESTIONS_PER_POST", "MIN_DAYS_BETWEEN_REPOSTS"
+)
+
+def load_config_file(path) -> dict:
+    """Settings from a JSON or YAML (needs PyYAML) file, keyed by upper-case setting name."""
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        if path.suffix.lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(f"PyYAML is required to read {path}")
+            data = yaml.safe_load(f) or {}
+        else:
+            data = json.load(f)
+    
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain a mapping of settings")
+    settings = {str(key).upper(): value for key, value in data.items()}
+    unknown = sorted(set(settings) - set(FILE_SETTINGS))
+    if unknown:
+        raise ValueError(f"{path}: unknown setting(s) {', '.join(unknown)}; allowed: {', '.join(FILE_SETTINGS)}")
+
+    # YAML reads an unquoted 10:00 as the base-60 integer 600
+    if isinstance(settings.get("POST_SCHEDULE"), list):
+        settings["POST_SCHEDULE"] = [
+            f"{value // 60:02d}:{value % 60:02d}" if isinstance(value, int) else value
+            for value in settings["POST_SCHEDULE"]
+        ]
+    return settings
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 class Config:
+    """Settings from the environment plus the optional CONFIG_FILE.
+    
+    A Config is read-only once built: dicts are read-only mappings and
+    lists are tuples. Use ``get_config()`` for the process-wide instance
+    rather than building one per component.
+    """
+    
     def __init__(self):
         self.BASE_DIR = Path(__file__).parent.parent.parent
         
+        # Optional JSON/YAML file with the schedule, classes and subjects
+        # (FILE_SETTINGS). While the bot runs it is polled every
+        # CONFIG_RELOAD_SECONDS (0 disables) and reloaded when it changes.
+        self.CONFIG_FILE = os.getenv("CONFIG_FILE", "")
+        self.CONFIG_RELOAD_SECONDS = int(os.getenv("CONFIG_RELOAD_SECONDS", "30"))
+        file_settings = load_config_file(self.CONFIG_FILE) if self.CONFIG_FILE else {}
+        
         # Telegram
         self.BOT_TOKEN = os.getenv("BOT_TOKEN", "")
         self.CHANNEL_ID = os.getenv("CHANNEL_ID", "@smartstudynotes11")
+        # Point at scripts/fake_bot_api.py for offline load tests
+        self.TELEGRAM_API_BASE_URL = os.getenv("TELEGRAM_API_BASE_URL", "https://api.telegram.org/bot")
+        
+        # Fan-out: every post goes to all of these chats (defaults to CHANNEL_ID)
+        self.CHANNEL_IDS = [
+            self.parse_chat_id(chat_id)
+            for chat_id in (os.getenv("CHANNEL_IDS") or self.CHANNEL_ID).split(",")
+            if chat_id.strip()
+        ]
+        self.FANOUT_CONCURRENCY = int(os.getenv("FANOUT_CONCURRENCY", "30"))
+        
+        # Bot API HTTP transport (pool defaults to one connection per concurrent send)
+        self.HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", str(self.FANOUT_CONCURRENCY)))
+        self.HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60"))
+        self.HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+        self.HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+        self.HTTP_WRITE_TIMEOUT = float(os.getenv("HTTP_WRITE_TIMEOUT", "10"))
+        self.HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+        self.HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+        
+        # Telegram rate limits (messages per second overall / per chat, per minute in groups)
+        self.TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))
+        self.TELEGRAM_CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))
+        self.TELEGRAM_GROUP_RATE_PER_MINUTE = float(os.getenv("TELEGRAM_GROUP_RATE_PER_MINUTE", "20"))
+        self.SEND_MAX_RETRIES = int(os.getenv("SEND_MAX_RETRIES", "5"))
+        
+        # Interactive commands over a webhook (WEBHOOK_URL is the public HTTPS base URL)
+        self.WEBHOOK_ENABLED = os.getenv("WEBHOOK_ENABLED", "false").lower() == "true"
+        self.WEBHOOK_URL = os.getenv("WEBHOOK_URL", "").rstrip("/")
+        self.WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+        self.WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+        self.WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT") or os.getenv("PORT") or "8443")
+        self.WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+        self.WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "16"))
+        self.WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+        self.WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40"))
+        self.COMMAND_DEFAULT_QUESTIONS = int(os.getenv("COMMAND_DEFAULT_QUESTIONS", "5"))
+        self.COMMAND_MAX_QUESTIONS = int(os.getenv("COMMAND_MAX_QUESTIONS", "10"))
+        # Inline search (enable inline mode for the bot with @BotFather /setinline)
+        self.INLINE_RESULTS_LIMIT = min(int(os.getenv("INLINE_RESULTS_LIMIT", "20")), 50)
+        self.INLINE_CACHE_SECONDS = int(os.getenv("INLINE_CACHE_SECONDS", "300"))
+        
+        # Outbox: drains that may fail for one chat before it is given up on
+        self.OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+        self.OUTBOX_DRAIN_INTERVAL = int(os.getenv("OUTBOX_DRAIN_INTERVAL", "60"))
         
         # Database
         self.DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///data/studybots.db")
+        self.DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "2"))
+        self.CATALOG_CACHE_ENABLED = os.getenv("CATALOG_CACHE_ENABLED", "true").lower() == "true"
+        # Shingle similarity at which a new question counts as a near-duplicate (1 = exact only)
+        self.DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+        
+        # Render each slot's post this many minutes early (0 renders at post time)
+        self.PREPARE_MINUTES_AHEAD = int(os.getenv("PREPARE_MINUTES_AHEAD", "5"))
+        # A job that starts late by up to the grace still runs. Slots missed while
+        # the bot was down (up to SCHEDULER_CATCHUP_HOURS back, 0 disables) are
+        # caught up on start; with coalescing only the latest missed slot is posted.
+        self.SCHEDULER_MISFIRE_GRACE_SECONDS = int(os.getenv("SCHEDULER_MISFIRE_GRACE_SECONDS", "300"))
+        self.SCHEDULER_COALESCE = os.getenv("SCHEDULER_COALESCE", "true").lower() == "true"
+        self.SCHEDULER_CATCHUP_HOURS = float(os.getenv("SCHEDULER_CATCHUP_HOURS", "6"))
+        
+        # Assign questions to the next POST_PLAN_DAYS of slots in one pass
+        # (1 plans a day, 7 a week, 0 lets every slot select on its own)
+        self.POST_PLAN_DAYS = float(os.getenv("POST_PLAN_DAYS", "1"))
+        self.POST_PLAN_TIME = os.getenv("POST_PLAN_TIME", "00:30")
         
         # Posting Schedule (Bangladesh Time)
-        self.POST_SCHEDULE = [
+        self.POST_SCHEDULE = file_settings.get("POST_SCHEDULE") or [
             "08:00", "10:00", "12:00", 
             "15:00", "17:00", "19:00", "21:00"
         ]
         
         # Classes
-        self.CLASSES = {
+        self.CLASSES = file_settings.get("CLASSES") or {
             "class_11": "Class 11",
             "class_12": "Class 12",
             "college_year_1": "College Year 1",
@@ -31,7 +157,7 @@ class Config:
         }
         
         # Subjects
-        self.SUBJECTS = {
+        self.SUBJECTS = file_settings.get("SUBJECTS") or {
             "class_11": ["physics", "chemistry", "mathematics", "biology"],
             "class_12": ["physics", "chemistry", "mathematics", "biology"],
             "college_year_1": ["calculus", "physics", "chemistry", "programming"],
@@ -39,7 +165,7 @@ class Config:
             "college_year_3": ["database", "networking", "machine_learning", "finance"]
         }
         
-        # Subject Names
+        # Subject Names (the file adds to or overrides these)
         self.SUBJECT_NAMES = {
             "physics": {"en": "Physics", "bn": "পদার্থবিজ্ঞান"},
             "chemistry": {"en": "Chemistry", "bn": "রসায়ন"},
@@ -53,24 +179,136 @@ class Config:
             "algorithms": {"en": "Algorithms", "bn": "অ্যালগরিদম"},
             "database": {"en": "Database", "bn": "ডেটাবেস"},
             "networking": {"en": "Networking", "bn": "নেটওয়ার্কিং"},
-            "machine_learning": {"en": "Machine Learning", "bn": "মেশিন লার্নিং"}
+            "machine_learning": {"en": "Machine Learning", "bn": "মেশিন লার্নিং"},
+            **file_settings.get("SUBJECT_NAMES", {})
         }
         
         # Settings
-        self.MAX_QUESTIONS_PER_POST = 3
-        self.MIN_DAYS_BETWEEN_REPOSTS = 30
+        self.MAX_QUESTIONS_PER_POST = int(file_settings.get("MAX_QUESTIONS_PER_POST", 3))
+        self.MIN_DAYS_BETWEEN_REPOSTS = int(file_settings.get("MIN_DAYS_BETWEEN_REPOSTS", 30))
+        
+        # Question selection: "rotation" walks each bucket's shuffled queues
+        # most important first; "weighted" samples by a score over importance,
+        # marks, days since last posted and chapter under-exposure (uses NumPy
+        # when installed). Each weight scales one score in [0, 1], so a weight
+        # of 3 makes the top of that scale e^3 (about 20) times as likely.
+        self.SELECTION_STRATEGY = os.getenv("SELECTION_STRATEGY", "rotation").lower()
+        self.SELECTION_WEIGHTS = {
+            "importance": float(os.getenv("SELECTION_WEIGHT_IMPORTANCE", "3")),
+            "marks": float(os.getenv("SELECTION_WEIGHT_MARKS", "1")),
+            "recency": float(os.getenv("SELECTION_WEIGHT_RECENCY", "1")),
+            "chapter": float(os.getenv("SELECTION_WEIGHT_CHAPTER", "1")),
+        }
+        # Days since last posted at which the recency score (and the window
+        # for chapter exposure) saturates
+        self.SELECTION_RECENCY_DAYS = int(os.getenv("SELECTION_RECENCY_DAYS", str(self.MIN_DAYS_BETWEEN_REPOSTS * 2)))
+        
+        # History compaction (raw rows are never pruned inside the repost window)
+        self.HISTORY_RETENTION_DAYS = max(
+            int(os.getenv("HISTORY_RETENTION_DAYS", "30")), self.MIN_DAYS_BETWEEN_REPOSTS
+        )
+        self.HISTORY_COMPACTION_TIME = os.getenv("HISTORY_COMPACTION_TIME", "03:00")
         
         # Validation
         self.validate()
+        
+        for name, value in list(vars(self).items()):
+            setattr(self, name, _freeze(value))
+        self._frozen = True
+    
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"Config is read-only (set {name} in the environment or CONFIG_FILE)")
+        super().__setattr__(name, value)
     
     def validate(self):
         if not self.BOT_TOKEN:
             raise ValueError("BOT_TOKEN is required")
         if not self.CHANNEL_ID:
             raise ValueError("CHANNEL_ID is required")
+        if not self.CHANNEL_IDS:
+            raise ValueError("CHANNEL_IDS must list at least one chat")
+        if self.SELECTION_STRATEGY not in ("rotation", "weighted"):
+            raise ValueError("SELECTION_STRATEGY must be 'rotation' or 'weighted'")
+        if self.WEBHOOK_ENABLED and not self.WEBHOOK_URL:
+            raise ValueError("WEBHOOK_URL is required when WEBHOOK_ENABLED is true")
+        for bd_time in self.POST_SCHEDULE:
+            try:
+                datetime.strptime(bd_time, "%H:%M")
+            except (TypeError, ValueError):
+                raise ValueError(f"POST_SCHEDULE times must be HH:MM, got {bd_time!r}")
+        if len(set(self.POST_SCHEDULE)) != len(self.POST_SCHEDULE):
+            raise ValueError("POST_SCHEDULE lists a time more than once")
+        unknown_classes = sorted(set(self.SUBJECTS) - set(self.CLASSES))
+        if unknown_classes:
+            raise ValueError(f"SUBJECTS lists unknown class(es): {', '.join(unknown_classes)}")
+        if self.MAX_QUESTIONS_PER_POST < 1:
+            raise ValueError("MAX_QUESTIONS_PER_POST must be at least 1")
+    
+    @staticmethod
+    def parse_chat_id(value: str):
+        # Numeric chat IDs are ints for the Bot API, usernames stay strings
+        value = value.strip()
+        try:
+            return int(value)
+        except ValueError:
+            return value
     
     def get_subject_name(self, subject_key, language="bn"):
         return self.SUBJECT_NAMES.get(subject_key, {}).get(language, subject_key)
     
     def get_class_name(self, class_key):
-        return self.CLASSES.get(class_key, class_key)
\ No newline at end of file
+        return self.CLASSES.get(class_key, class_key)
+
+# The process-wide config. It is replaced, never changed, so a reader that
+# takes ``get_config()`` once sees one consistent set of settings.
+_config = None
+_config_stamp = None
+_config_lock = threading.Lock()
+
+def _file_stamp(path):
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+def get_config() -> Config:
+    """The shared Config, built on first use."""
+    global _config, _config_stamp
+    config = _config
+    if config is None:
+        with _config_lock:
+            if _config is None:
+                stamp = _file_stamp(os.getenv("CONFIG_FILE"))
+                _config = Config()
+                _config_stamp = stamp
+            config = _config
+    return config
+
+def reload_config(force: bool = False):
+    """Swap in a fresh Config when CONFIG_FILE changed (or with ``force``).
+    
+    Returns the new config, or None when nothing changed or the new
+    settings are invalid (the current config then stays in place).
+    """
+    global _config, _config_stamp
+    current = get_config()
+    with _config_lock:
+        # Stamp before reading, so an edit made during the read is seen next time
+        stamp = _file_stamp(os.getenv("CONFIG_FILE", current.CONFIG_FILE))
+        if not force and stamp == _config_stamp:
+            return None
+        _config_stamp = stamp
+        
+        try:
+            config = Config()
+        except Exception as e:
+            logger.error(f"❌ Config reload failed, keeping the current settings: {str(e)}")
+            return None
+        
+        _config = config
+        logger.info(f"🔄 Config reloaded{' from ' + config.CONFIG_FILE if config.CONFIG_FILE else ''}")
+        return config
\ No newline at end of file
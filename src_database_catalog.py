@@ -0,0 +1,211 @@
+"""
+Read-through in-memory cache of the question catalog
+
+Each (class, subject) bucket is held as compact parallel arrays of question
+IDs, importance codes, chapter codes, marks and last-posted day ordinals, together
+with the bucket's rotation queues. Selection walks these in memory and only touches
+SQLite to persist queue cursors. Any write that adds questions invalidates
+just the buckets it touched, once it has committed.
+
+Writes from other processes (an import script run while the bot is up)
+cannot invalidate anything here, so every bucket also records the
+``bank_version`` counter it was loaded at. A lookup that finds the counter
+moved reloads the bucket.
+"""
+
+import logging
+import random
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from src.config.constants import DB_QUESTION_TABLE
+from src.database.outbox import bank_version
+from src.database.rotation import importance_rank, load_queues
+
+logger = logging.getLogger(__name__)
+
+IMPORTANCE_NAMES = ["very_high", "high", "medium", "low"]
+
+def date_ordinal(value) -> int:
+    """Day ordinal of a stored DATE, 0 for never."""
+    if not value:
+        return 0
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+class BucketEntry:
+    __slots__ = ("ids", "importance", "chapters", "marks", "last_posted", "queues", "importance_names",
+                 "chapter_names", "weights", "version")
+
+    def __init__(self, rows, queues, importance_names, version: int = None):
+        self.ids = array("q")
+        self.importance = array("B")
+        self.chapters = array("I")
+        self.marks = array("H")
+        self.last_posted = array("l")
+        self.queues = queues
+        self.importance_names = importance_names
+        self.chapter_names = []
+        # Cumulative selection weights, built by src.database.weighted on demand
+        self.weights = None
+        # bank_version when the rows were read (None when not tracked)
+        self.version = version
+
+        codes = {name: code for code, name in enumerate(importance_names)}
+        chapter_codes = {}
+        for question_id, importance, last_posted, chapter, marks in rows:
+            importance = importance or "medium"
+            if importance not in codes:
+                codes[importance] = len(importance_names)
+                importance_names.append(importance)
+            chapter = chapter or ""
+            if chapter not in chapter_codes:
+                chapter_codes[chapter] = len(self.chapter_names)
+                self.chapter_names.append(chapter)
+            self.ids.append(question_id)
+            self.importance.append(codes[importance])
+            self.chapters.append(chapter_codes[chapter])
+            self.marks.append(min(max(marks or 0, 0), 0xFFFF))
+            self.last_posted.append(date_ordinal(last_posted))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def position(self, question_id: int) -> int:
+        index = bisect_left(self.ids, question_id)
+        if index < len(self.ids) and self.ids[index] == question_id:
+            return index
+        return -1
+
+    def is_eligible(self, question_id: int, threshold_ordinal: int) -> bool:
+        index = self.position(question_id)
+        return index >= 0 and self.last_posted[index] <= threshold_ordinal
+
+    def rows_after(self, question_id: int):
+        """(id, importance) pairs for every question newer than ``question_id``."""
+        start = bisect_right(self.ids, question_id)
+        return [
+            (self.ids[index], self.importance_names[self.importance[index]])
+            for index in range(start, len(self.ids))
+        ]
+
+    def chapter_counts(self) -> dict:
+        """Question count per chapter, in first-seen order."""
+        counts = [0] * len(self.chapter_names)
+        for code in self.chapters:
+            counts[code] += 1
+        return dict(zip(self.chapter_names, counts))
+
+    def select(self, limit: int, chapter: str = None, rng=None):
+        """Up to ``limit`` question IDs, most important first, shuffled within each importance.
+
+        ``chapter`` matches case-insensitively on the chapter name.
+        """
+        wanted = None
+        if chapter is not None:
+            needle = chapter.casefold()
+            wanted = {code for code, name in enumerate(self.chapter_names) if name.casefold() == needle}
+            if not wanted:
+                return []
+
+        by_rank = {}
+        for index, question_id in enumerate(self.ids):
+            if wanted is None or self.chapters[index] in wanted:
+                rank = importance_rank(self.importance_names[self.importance[index]])
+                by_rank.setdefault(rank, []).append(question_id)
+
+        picked = []
+        for rank in sorted(by_rank):
+            candidates = by_rank[rank]
+            take = min(limit - len(picked), len(candidates))
+            picked.extend((rng or random).sample(candidates, take))
+            if len(picked) >= limit:
+                break
+        return picked
+
+    def mark_posted(self, question_id: int, ordinal: int) -> bool:
+        index = self.position(question_id)
+        if index < 0:
+            return False
+        self.last_posted[index] = max(self.last_posted[index], ordinal)
+        self.weights = None
+        return True
+
+def load_entry(conn, class_key: str, subject_key: str, importance_names=None) -> BucketEntry:
+    """Load one bucket's arrays and rotation queues (uncached unless a catalog keeps it)."""
+    # Read before the rows, so a change committed in between only causes an extra reload
+    version = bank_version(conn)
+    rows = conn.execute(f"""
+        SELECT id, importance, last_posted, chapter, marks FROM {DB_QUESTION_TABLE}
+        WHERE class = ? AND subject = ?
+        ORDER BY id
+    """, (class_key, subject_key)).fetchall()
+    if importance_names is None:
+        importance_names = list(IMPORTANCE_NAMES)
+    return BucketEntry(rows, load_queues(conn, class_key, subject_key), importance_names, version)
+
+class QuestionCatalog:
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.RLock()
+        self._importance_names = list(IMPORTANCE_NAMES)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.reloads = 0
+
+    def get(self, conn, class_key: str, subject_key: str) -> BucketEntry:
+        """Return the cached bucket, loading it through ``conn`` on a miss or when the bank changed since."""
+        key = (class_key, subject_key)
+        version = bank_version(conn)
+        with self._lock:
+            entry = self._buckets.get(key)
+            if entry is not None and entry.version == version:
+                self.hits += 1
+                return entry
+
+            if entry is None:
+                self.misses += 1
+            else:
+                self.reloads += 1
+            entry = load_entry(conn, class_key, subject_key, self._importance_names)
+            self._buckets[key] = entry
+            return entry
+
+    def peek(self, class_key: str, subject_key: str):
+        with self._lock:
+            return self._buckets.get((class_key, subject_key))
+
+    def invalidate(self, class_key: str, subject_key: str):
+        self.invalidate_many([(class_key, subject_key)])
+
+    def invalidate_many(self, buckets):
+        with self._lock:
+            for key in set(buckets):
+                if self._buckets.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._buckets)
+            self._buckets.clear()
+
+    def mark_posted(self, question_ids, post_date: str):
+        """Update last-posted days in place for whichever cached buckets hold these IDs."""
+        ordinal = date_ordinal(post_date)
+        with self._lock:
+            for entry in self._buckets.values():
+                for question_id in question_ids:
+                    entry.mark_posted(question_id, ordinal)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'reloads': self.reloads,
+                'buckets': len(self._buckets),
+                'questions': sum(len(entry) for entry in self._buckets.values())
+            }
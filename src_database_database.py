@@ -1,33 +1,60 @@
-import sqlite3
 import json
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from src.config import Config
-from src.config.constants import DB_QUESTION_TABLE, DB_POSTED_TABLE
+from src.config import get_config
+from src.config.constants import (
+    DB_QUESTION_TABLE, DB_POSTED_TABLE, DB_POSTED_MONTHLY_TABLE, DB_STATS_TABLE, DB_STATS_DAILY_TABLE
+)
+from src.database.catalog import QuestionCatalog, date_ordinal, load_entry
+from src.database.executor import DatabaseExecutor
+from src.database.migrations import SCHEMA_VERSION, apply_migrations, get_schema_version
+from src.database import dedup, outbox, planner, search, slot_runs
+from src.database.rotation import take_questions, known_max_question_id
 
 logger = logging.getLogger(__name__)
 
+# Longest look-back get_statistics reports (posts in the last 30 days)
+STATS_WINDOW_DAYS = 30
+
 class DatabaseManager:
-    def __init__(self, db_path: str = None):
-        self.config = Config()
+    def __init__(self, db_path: str = None, catalog_cache: bool = None):
         self.db_path = db_path or "data/studybots.db"
-        self.conn = None
-        self.cursor = None
+        self.executor = DatabaseExecutor(self.db_path, read_pool_size=self.config.DB_READ_POOL_SIZE)
+        if catalog_cache is None:
+            catalog_cache = self.config.CATALOG_CACHE_ENABLED
+        self.catalog = QuestionCatalog() if catalog_cache else None
         
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
         
         logger.info(f"📊 Database path: {self.db_path}")
     
-    async def initialize(self):
+    @property
+    def config(self):
+        # Looked up on each use, so selection settings follow a config reload
+        return get_config()
+    
+    async def initialize(self, reuse_existing: bool = False):
+        """Open the database, creating, migrating and seeding it as needed.
+        
+        With ``reuse_existing``, a database file already at the current
+        schema version is used as is, skipping the setup checks (for
+        one-shot runs).
+        """
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.cursor = self.conn.cursor()
+            existed = Path(self.db_path).exists()
+            self.executor.start()
+            
+            if reuse_existing and existed:
+                version = await self.executor.read(get_schema_version)
+                if version == SCHEMA_VERSION:
+                    logger.info(f"⚡ Reusing database at schema version {version}")
+                    return True
             
-            self.cursor.execute("PRAGMA foreign_keys = ON")
             await self.create_tables()
+            await self.executor.maintenance(self._enable_incremental_vacuum)
             await self.populate_initial_data()
             
             logger.info("✅ Database initialized")
@@ -38,8 +65,12 @@ class DatabaseManager:
             return False
     
     async def create_tables(self):
+        await self.executor.write(self._create_tables)
+        logger.info("✅ Database tables created")
+    
+    def _create_tables(self, conn):
         # Questions table
-        self.cursor.execute(f"""
+        conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {DB_QUESTION_TABLE} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 class TEXT NOT NULL,
@@ -56,7 +87,7 @@ class DatabaseManager:
         """)
         
         # Posted history table
-        self.cursor.execute(f"""
+        conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {DB_POSTED_TABLE} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 question_id INTEGER NOT NULL,
@@ -66,13 +97,18 @@ class DatabaseManager:
             )
         """)
         
-        self.conn.commit()
-        logger.info("✅ Database tables created")
+        apply_migrations(conn)
+    
+    def _enable_incremental_vacuum(self, conn):
+        # auto_vacuum can only be switched on by rebuilding the file once
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            logger.info("🧹 Enabling incremental vacuum (one-time VACUUM)...")
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
     
     async def populate_initial_data(self):
         try:
-            self.cursor.execute(f"SELECT COUNT(*) FROM {DB_QUESTION_TABLE}")
-            count = self.cursor.fetchone()[0]
+            count = await self.executor.read(self._count_questions)
             
             if count == 0:
                 logger.info("📥 Populating database with initial questions...")
@@ -85,73 +121,316 @@ class DatabaseManager:
                     ("college_year_1", "calculus", "Limit and continuity এর সংজ্ঞা দাও", "high", 10, "Introduction"),
                 ]
                 
-                for q in sample_questions:
-                    await self.add_question(*q)
+                await self.executor.write(self._insert_questions, sample_questions)
+                self.invalidate_catalog((row[0], row[1]) for row in sample_questions)
                 
                 logger.info("✅ Inserted sample questions")
             
-            self.conn.commit()
-            
         except Exception as e:
             logger.error(f"❌ Error populating data: {str(e)}")
     
     async def add_question(self, class_key: str, subject_key: str, question: str, 
                           importance: str = "medium", marks: int = 5, chapter: str = "") -> bool:
         try:
-            self.cursor.execute(f"""
-                INSERT OR IGNORE INTO {DB_QUESTION_TABLE} 
-                (class, subject, question, importance, marks, chapter)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (class_key, subject_key, question, importance, marks, chapter))
-            
-            self.conn.commit()
-            return True
+            inserted, duplicates = await self.executor.write(
+                self._insert_questions,
+                [(class_key, subject_key, question, importance, marks, chapter)]
+            )
+            self.invalidate_catalog([(class_key, subject_key)])
+            for values, duplicate in duplicates:
+                logger.warning(
+                    f"⚠️ Skipped duplicate of question #{duplicate.question_id} "
+                    f"({duplicate.similarity:.0%} similar): {values[2][:50]}"
+                )
+            return inserted > 0
             
         except Exception as e:
             logger.error(f"❌ Error adding question: {str(e)}")
             return False
     
+    def _count_questions(self, conn) -> int:
+        return conn.execute(f"SELECT COUNT(*) FROM {DB_QUESTION_TABLE}").fetchone()[0]
+    
+    def _insert_questions(self, conn, rows):
+        """Insert rows that are not (near-)duplicates; returns (inserted, [(row, Duplicate)])."""
+        inserted = 0
+        duplicates = []
+        for values in rows:
+            question_id, duplicate = dedup.insert_question(conn, values, self.config.DEDUP_THRESHOLD)
+            if duplicate:
+                duplicates.append((values, duplicate))
+            elif question_id:
+                inserted += 1
+        return inserted, duplicates
+    
+    def invalidate_catalog(self, buckets=None):
+        """Drop cached buckets after their questions change (all buckets if None).
+        
+        Call once the write has committed: readers load buckets through
+        their own connections, so a bucket dropped before the commit can be
+        reloaded from the old snapshot and cached again.
+        """
+        if not self.catalog:
+            return
+        if buckets is None:
+            self.catalog.clear()
+        else:
+            self.catalog.invalidate_many(buckets)
+    
     async def get_unique_questions(self, class_key: str, subject_key: str, limit: int = 3):
         try:
-            threshold_date = (datetime.now() - timedelta(days=self.config.MIN_DAYS_BETWEEN_REPOSTS)).strftime('%Y-%m-%d')
-            
-            query = f"""
-                SELECT q.id, q.question, q.importance, q.marks, q.chapter
-                FROM {DB_QUESTION_TABLE} q
-                LEFT JOIN {DB_POSTED_TABLE} ph ON q.id = ph.question_id 
-                    AND ph.post_date > ?
-                WHERE q.class = ? 
-                    AND q.subject = ?
-                    AND ph.id IS NULL
-                ORDER BY 
-                    CASE q.importance 
-                        WHEN 'very_high' THEN 1
-                        WHEN 'high' THEN 2
-                        ELSE 3
-                    END,
-                    RANDOM()
-                LIMIT ?
-            """
+            questions = await self.executor.write(
+                self._take_questions_for_post, [(class_key, subject_key)], limit
+            )
+            return questions.get((class_key, subject_key), [])
             
-            self.cursor.execute(query, (threshold_date, class_key, subject_key, limit))
-            rows = self.cursor.fetchall()
+        except Exception as e:
+            logger.error(f"❌ Error getting questions: {str(e)}")
+            return []
+    
+    async def get_questions_for_post(self, buckets, limit: int = 3, slot: str = None):
+        """Select up to ``limit`` questions for every (class, subject) bucket in one transaction.
+        
+        Questions planned for ``slot`` or later slots (from today on without
+        a slot) are left for their plan.
+        """
+        try:
+            buckets = list(buckets)
+            if not buckets:
+                return {}
+            return await self.executor.write(self._select_unplanned, buckets, limit, slot)
             
-            questions = []
-            for row in rows:
-                questions.append({
-                    'id': row[0],
-                    'question': row[1],
-                    'importance': row[2],
-                    'marks': row[3],
-                    'chapter': row[4]
-                })
+        except Exception as e:
+            self.invalidate_catalog(buckets)
+            logger.error(f"❌ Error getting questions for post: {str(e)}")
+            return {}
+    
+    async def plan_posts(self, slot_keys, buckets, limit: int = 3) -> int:
+        """Assign questions to every slot in ``slot_keys`` without a plan, in one transaction; returns slots planned."""
+        try:
+            buckets = list(buckets)
+            return await self.executor.write(self._plan_posts, list(slot_keys), buckets, limit)
             
-            return questions
+        except Exception as e:
+            self.invalidate_catalog(buckets)
+            logger.error(f"❌ Error planning posts: {str(e)}")
+            return 0
+    
+    def _select_unplanned(self, conn, buckets, limit: int, slot: str):
+        since = slot or datetime.now().strftime('%Y-%m-%d')
+        return self._take_questions_for_post(conn, buckets, limit, exclude=planner.reserved_ids(conn, since))
+    
+    def _plan_posts(self, conn, slot_keys, buckets, limit: int) -> int:
+        planned = planner.planned_slots(conn, slot_keys)
+        slot_keys = [slot for slot in slot_keys if slot not in planned]
+        if not slot_keys or not buckets:
+            return 0
+        
+        # One pass over the rotation queues for the whole horizon, so the
+        # repost window and no-repeat rules hold across every planned slot.
+        # Questions already promised to any slot from here on are left out,
+        # so re-running or extending a plan never assigns them twice.
+        reserved = planner.reserved_ids(conn, min(slot_keys))
+        pools = self._take_questions_for_post(conn, buckets, limit * len(slot_keys), exclude=reserved)
+        
+        plans = {slot: {} for slot in slot_keys}
+        for bucket, pool in pools.items():
+            for slot, questions in zip(slot_keys, planner.assign(pool, len(slot_keys), limit)):
+                if questions:
+                    plans[slot][bucket] = questions
+        
+        for slot, questions_by_bucket in plans.items():
+            planner.store_plan(conn, slot, questions_by_bucket)
+        return len(slot_keys)
+    
+    async def get_planned_questions(self, slot: str):
+        """Questions planned for ``slot``, grouped like ``get_questions_for_post``; empty when unplanned.
+        
+        Planned questions posted inside the repost window since the plan was
+        made (or deleted) are dropped from the plan and not returned.
+        """
+        try:
+            return await self.executor.write(self._take_planned_questions, slot)
             
         except Exception as e:
-            logger.error(f"❌ Error getting questions: {str(e)}")
+            logger.error(f"❌ Error loading plan for {slot}: {str(e)}")
+            return {}
+    
+    def _take_planned_questions(self, conn, slot: str):
+        question_ids = planner.planned_ids(conn, slot)
+        if not question_ids:
+            return {}
+        
+        threshold_date = (datetime.now() - timedelta(days=self.config.MIN_DAYS_BETWEEN_REPOSTS)).strftime('%Y-%m-%d')
+        placeholders = ", ".join("?" * len(question_ids))
+        eligible = {row[0] for row in conn.execute(f"""
+            SELECT id FROM {DB_QUESTION_TABLE}
+            WHERE id IN ({placeholders}) AND (last_posted IS NULL OR last_posted <= ?)
+        """, (*question_ids, threshold_date))}
+        
+        stale = [question_id for question_id in question_ids if question_id not in eligible]
+        if stale:
+            planner.drop_planned(conn, slot, stale)
+            logger.warning(f"⚠️ Dropped {len(stale)} question(s) from the plan for {slot} that no longer qualify")
+        
+        question_ids = [question_id for question_id in question_ids if question_id in eligible]
+        return self._read_questions_by_ids(conn, question_ids) if question_ids else {}
+    
+    async def get_plan_summary(self, since: str):
+        try:
+            return await self.executor.read(planner.plan_summary, since)
+        except Exception as e:
+            logger.error(f"❌ Error reading post plan: {str(e)}")
             return []
     
+    async def get_questions_by_ids(self, question_ids):
+        """Load specific questions grouped like ``get_questions_for_post``, in the given order."""
+        try:
+            question_ids = list(question_ids)
+            if not question_ids:
+                return {}
+            return await self.executor.read(self._read_questions_by_ids, question_ids)
+            
+        except Exception as e:
+            logger.error(f"❌ Error loading questions: {str(e)}")
+            return {}
+    
+    def _read_questions_by_ids(self, conn, question_ids):
+        placeholders = ", ".join("?" * len(question_ids))
+        rows = conn.execute(f"""
+            SELECT id, class, subject, question, importance, marks, chapter
+            FROM {DB_QUESTION_TABLE}
+            WHERE id IN ({placeholders})
+        """, question_ids).fetchall()
+        
+        by_id = {row[0]: row for row in rows}
+        grouped = {}
+        for question_id in question_ids:
+            row = by_id.get(question_id)
+            if row:
+                grouped.setdefault((row[1], row[2]), []).append({
+                    'id': row[0],
+                    'question': row[3],
+                    'importance': row[4],
+                    'marks': row[5],
+                    'chapter': row[6]
+                })
+        return grouped
+    
+    async def browse_questions(self, class_key: str, subject_key: str, limit: int = 5, chapter: str = None):
+        """On-demand questions for a bucket, most important first; does not touch rotation or history."""
+        try:
+            return await self.executor.read(self._browse_questions, class_key, subject_key, limit, chapter)
+
+        except Exception as e:
+            logger.error(f"❌ Error browsing questions: {str(e)}")
+            return []
+
+    def _browse_questions(self, conn, class_key: str, subject_key: str, limit: int, chapter: str):
+        if self.catalog:
+            question_ids = self.catalog.get(conn, class_key, subject_key).select(limit, chapter)
+        else:
+            chapter_filter = "AND chapter = ? COLLATE NOCASE" if chapter is not None else ""
+            params = [class_key, subject_key] + ([chapter] if chapter is not None else []) + [limit]
+            question_ids = [row[0] for row in conn.execute(f"""
+                SELECT id FROM {DB_QUESTION_TABLE}
+                WHERE class = ? AND subject = ? {chapter_filter}
+                ORDER BY CASE importance WHEN 'very_high' THEN 1 WHEN 'high' THEN 2 ELSE 3 END, RANDOM()
+                LIMIT ?
+            """, params)]
+
+        if not question_ids:
+            return []
+        return self._read_questions_by_ids(conn, question_ids).get((class_key, subject_key), [])
+
+    async def search_questions(self, text: str, limit: int = 20, offset: int = 0):
+        """Full-text search over question text and chapter, ranked by importance then relevance."""
+        try:
+            return await self.executor.read(search.search, text, limit, offset)
+
+        except Exception as e:
+            logger.error(f"❌ Error searching questions: {str(e)}")
+            return []
+
+    async def list_chapters(self, class_key: str, subject_key: str):
+        """Question count per chapter of a bucket."""
+        try:
+            return await self.executor.read(self._list_chapters, class_key, subject_key)
+
+        except Exception as e:
+            logger.error(f"❌ Error listing chapters: {str(e)}")
+            return {}
+
+    def _list_chapters(self, conn, class_key: str, subject_key: str):
+        if self.catalog:
+            return self.catalog.get(conn, class_key, subject_key).chapter_counts()
+        rows = conn.execute(f"""
+            SELECT COALESCE(chapter, ''), COUNT(*) FROM {DB_QUESTION_TABLE}
+            WHERE class = ? AND subject = ?
+            GROUP BY 1 ORDER BY MIN(id)
+        """, (class_key, subject_key)).fetchall()
+        return dict(rows)
+
+    def _take_questions_for_post(self, conn, buckets, limit: int, exclude=None):
+        threshold_date = (datetime.now() - timedelta(days=self.config.MIN_DAYS_BETWEEN_REPOSTS)).strftime('%Y-%m-%d')
+        
+        threshold_ordinal = date_ordinal(threshold_date)
+        today_ordinal = datetime.now().date().toordinal()
+        
+        if self.config.SELECTION_STRATEGY == "weighted":
+            # Imported here so the default strategy never loads NumPy
+            from src.database import weighted
+        
+        picked = {}
+        for class_key, subject_key in buckets:
+            if self.config.SELECTION_STRATEGY == "weighted":
+                # Sampling reads the bucket arrays only; rotation queues are left as they are
+                entry = self.catalog.get(conn, class_key, subject_key) if self.catalog else load_entry(conn, class_key, subject_key)
+                question_ids = weighted.select(
+                    entry, limit, today_ordinal, threshold_ordinal,
+                    self.config.SELECTION_RECENCY_DAYS, self.config.SELECTION_WEIGHTS,
+                    exclude=exclude
+                )
+            elif self.catalog:
+                entry = self.catalog.get(conn, class_key, subject_key)
+                question_ids = take_questions(
+                    conn, class_key, subject_key, limit, threshold_date,
+                    states=entry.queues,
+                    new_rows=entry.rows_after(known_max_question_id(entry.queues)),
+                    is_eligible=lambda question_id, entry=entry: entry.is_eligible(question_id, threshold_ordinal),
+                    exclude=exclude
+                )
+            else:
+                question_ids = take_questions(conn, class_key, subject_key, limit, threshold_date, exclude=exclude)
+            if question_ids:
+                picked[(class_key, subject_key)] = question_ids
+        
+        all_ids = [question_id for ids in picked.values() for question_id in ids]
+        if not all_ids:
+            return {}
+        
+        placeholders = ", ".join("?" * len(all_ids))
+        rows = conn.execute(f"""
+            SELECT id, question, importance, marks, chapter
+            FROM {DB_QUESTION_TABLE}
+            WHERE id IN ({placeholders})
+        """, all_ids).fetchall()
+        
+        by_id = {}
+        for row in rows:
+            by_id[row[0]] = {
+                'id': row[0],
+                'question': row[1],
+                'importance': row[2],
+                'marks': row[3],
+                'chapter': row[4]
+            }
+        
+        return {
+            bucket: [by_id[question_id] for question_id in ids if question_id in by_id]
+            for bucket, ids in picked.items()
+        }
+    
     async def get_suggestion(self, class_key: str, subject_key: str) -> str:
         default_suggestions = {
             "physics": "গাণিতিক সমস্যা বেশি প্র্যাকটিস করুন",
@@ -165,28 +444,290 @@ class DatabaseManager:
         
         return default_suggestions.get(subject_key, "নিয়মিত পড়াশোনা ও প্র্যাকটিস করুন")
     
-    async def update_posted_questions(self):
+    async def update_posted_questions(self, question_ids=None) -> bool:
         try:
-            # Get questions that were in today's post
-            # This is simplified - in real implementation, track question IDs
-            logger.info("📝 Updating posted questions...")
+            question_ids = list(dict.fromkeys(question_ids or []))
+            if not question_ids:
+                logger.info("📝 No posted questions to record")
+                return True
+            
+            post_date = await self.executor.write(self._record_posted, question_ids, datetime.now())
+            self._mark_posted(question_ids, post_date)
+            logger.info(f"📝 Recorded {len(question_ids)} posted questions")
+            return True
             
         except Exception as e:
+            self.invalidate_catalog()
             logger.error(f"❌ Error updating posted questions: {str(e)}")
+            return False
+    
+    def _record_posted(self, conn, question_ids, posted_at: datetime) -> str:
+        """Record the posts in ``conn``'s transaction and return their date.
+        
+        The catalog is left alone here: callers apply ``_mark_posted`` once
+        the transaction has committed, so a rollback cannot leave cached
+        questions marked as posted.
+        """
+        post_date = posted_at.strftime('%Y-%m-%d')
+        post_time = posted_at.strftime('%H:%M:%S')
+        
+        conn.executemany(f"""
+            INSERT INTO {DB_POSTED_TABLE} (question_id, post_date, post_time)
+            VALUES (?, ?, ?)
+        """, [(question_id, post_date, post_time) for question_id in question_ids])
+        
+        placeholders = ", ".join("?" * len(question_ids))
+        conn.execute(f"""
+            UPDATE {DB_QUESTION_TABLE}
+            SET posted_count = posted_count + 1,
+                last_posted = ?
+            WHERE id IN ({placeholders})
+        """, (post_date, *question_ids))
+        return post_date
+    
+    def _mark_posted(self, question_ids, post_date: str):
+        if self.catalog:
+            self.catalog.mark_posted(question_ids, post_date)
+    
+    async def get_outbox_post(self, slot: str):
+        """The post already rendered for ``slot`` as a dict, or None."""
+        try:
+            return await self.executor.read(outbox.find_post, slot)
+        except Exception as e:
+            logger.error(f"❌ Error reading outbox: {str(e)}")
+            return None
+    
+    async def enqueue_outbox_post(self, slot: str, content: str, chunks, question_ids, chat_ids,
+                                  status: str = 'pending', version: int = None):
+        """Store a rendered post before sending it; returns (post id, created) or None."""
+        try:
+            post_id, created = await self.executor.write(
+                outbox.enqueue_post, slot, content, chunks, question_ids, chat_ids, status, version
+            )
+            if created:
+                logger.info(f"📮 Queued post {post_id} ({status}) for slot {slot} ({len(chunks)} chunk(s), {len(chat_ids)} chat(s))")
+            return post_id, created
+            
+        except Exception as e:
+            logger.error(f"❌ Error queueing post: {str(e)}")
+            return None
+    
+    async def release_outbox_post(self, post_id: int, content: str = None, chunks=None,
+                                  question_ids=None, version: int = None) -> bool:
+        """Make a prepared post drainable, optionally with re-rendered content."""
+        try:
+            return await self.executor.write(
+                outbox.release_post, post_id, content, chunks, question_ids, version
+            )
+        except Exception as e:
+            logger.error(f"❌ Error releasing post {post_id}: {str(e)}")
+            return False
+    
+    async def get_bank_version(self):
+        try:
+            return await self.executor.read(outbox.bank_version)
+        except Exception as e:
+            logger.error(f"❌ Error reading bank version: {str(e)}")
+            return None
+    
+    async def get_pending_outbox(self, post_id: int = None):
+        try:
+            return await self.executor.read(outbox.load_pending, post_id)
+        except Exception as e:
+            logger.error(f"❌ Error loading outbox: {str(e)}")
+            return []
+    
+    async def ack_outbox_chunk(self, post_id: int, chat_id, seq: int, message_id=None):
+        """Record a delivered chunk; returns whether the chat now has the whole post, None on error."""
+        try:
+            done, recorded = await self.executor.write(self._ack_outbox_chunk, post_id, chat_id, seq, message_id)
+            if recorded:
+                self._mark_posted(*recorded)
+            return done
+        except Exception as e:
+            logger.error(f"❌ Error acknowledging chunk {seq} of post {post_id}: {str(e)}")
+            return None
+    
+    def _ack_outbox_chunk(self, conn, post_id: int, chat_id, seq: int, message_id):
+        done = outbox.ack_chunk(conn, post_id, chat_id, seq, message_id)
+        recorded = None
+        if done:
+            # The first chat to receive the whole post records its questions
+            question_ids = outbox.claim_question_ids(conn, post_id)
+            if question_ids:
+                recorded = question_ids, self._record_posted(conn, question_ids, datetime.now())
+            outbox.refresh_status(conn, post_id)
+        return done, recorded
+    
+    async def fail_outbox_delivery(self, post_id: int, chat_id, error: str) -> bool:
+        try:
+            await self.executor.write(self._fail_outbox_delivery, post_id, chat_id, error)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error recording failed delivery of post {post_id}: {str(e)}")
+            return False
+    
+    def _fail_outbox_delivery(self, conn, post_id: int, chat_id, error: str):
+        outbox.fail_delivery(conn, post_id, chat_id, error, self.config.OUTBOX_MAX_ATTEMPTS)
+        outbox.refresh_status(conn, post_id)
+    
+    async def finish_outbox_post(self, post_id: int) -> str:
+        try:
+            return await self.executor.write(outbox.refresh_status, post_id)
+        except Exception as e:
+            logger.error(f"❌ Error updating post {post_id}: {str(e)}")
+            return 'pending'
+    
+    async def start_slot_run(self, job_id: str, slot: str, scheduled_at: datetime, catch_up: bool = False):
+        try:
+            return await self.executor.write(
+                slot_runs.start_run, job_id, slot, scheduled_at, datetime.now(), catch_up
+            )
+        except Exception as e:
+            logger.error(f"❌ Error logging run of {job_id} for {slot}: {str(e)}")
+            return None
+    
+    async def finish_slot_run(self, run_id: int, status: str, error: str = None):
+        try:
+            if run_id is not None:
+                await self.executor.write(slot_runs.finish_run, run_id, status, datetime.now(), error)
+        except Exception as e:
+            logger.error(f"❌ Error finishing run {run_id}: {str(e)}")
+    
+    async def skip_slot_run(self, job_id: str, slot: str, scheduled_at: datetime, reason: str):
+        try:
+            await self.executor.write(slot_runs.record_skipped, job_id, slot, scheduled_at, reason)
+        except Exception as e:
+            logger.error(f"❌ Error logging skipped run of {job_id} for {slot}: {str(e)}")
+    
+    async def get_last_scheduled_run(self):
+        try:
+            return await self.executor.read(slot_runs.last_scheduled)
+        except Exception as e:
+            logger.error(f"❌ Error reading run log: {str(e)}")
+            return None
+    
+    async def get_logged_slot_times(self, job_id: str, since: datetime):
+        try:
+            return await self.executor.read(slot_runs.logged_times, job_id, since)
+        except Exception as e:
+            logger.error(f"❌ Error reading run log for {job_id}: {str(e)}")
+            return set()
+    
+    async def get_slot_runs(self, limit: int = 20):
+        try:
+            return await self.executor.read(slot_runs.recent_runs, limit)
+        except Exception as e:
+            logger.error(f"❌ Error reading run log: {str(e)}")
+            return []
+    
+    async def compact_history(self, retention_days: int = None) -> int:
+        """Roll posted_history rows older than the retention window into monthly totals."""
+        try:
+            retention_days = max(
+                retention_days or self.config.HISTORY_RETENTION_DAYS,
+                self.config.MIN_DAYS_BETWEEN_REPOSTS
+            )
+            cutoff = (datetime.now() - timedelta(days=retention_days)).strftime('%Y-%m-%d')
+            
+            compacted = await self.executor.write(self._rollup_history, cutoff)
+            pruned = await self.executor.write(outbox.prune, cutoff)
+            if pruned:
+                logger.info(f"🧹 Pruned {pruned} finished outbox posts older than {cutoff}")
+            await self.executor.write(slot_runs.prune, cutoff)
+            await self.executor.write(planner.prune, cutoff)
+            await self.executor.write(self._prune_daily_stats, min(cutoff, self._days_ago(STATS_WINDOW_DAYS)))
+            if compacted:
+                freed = await self.executor.maintenance(self._incremental_vacuum)
+                logger.info(f"🧹 Compacted {compacted} history rows older than {cutoff}, freed {freed} pages")
+            
+            return compacted
+            
+        except Exception as e:
+            logger.error(f"❌ Error compacting history: {str(e)}")
+            return 0
+    
+    def _rollup_history(self, conn, cutoff: str) -> int:
+        conn.execute(f"""
+            INSERT INTO {DB_POSTED_MONTHLY_TABLE} (question_id, month, post_count)
+            SELECT question_id, substr(post_date, 1, 7), COUNT(*)
+            FROM {DB_POSTED_TABLE}
+            WHERE post_date < ?
+            GROUP BY question_id, substr(post_date, 1, 7)
+            ON CONFLICT(question_id, month) DO UPDATE SET
+                post_count = post_count + excluded.post_count
+        """, (cutoff,))
+        
+        return conn.execute(f"DELETE FROM {DB_POSTED_TABLE} WHERE post_date < ?", (cutoff,)).rowcount
+    
+    def _prune_daily_stats(self, conn, cutoff: str):
+        conn.execute(f"DELETE FROM {DB_STATS_DAILY_TABLE} WHERE day < ?", (cutoff,))
+    
+    def _incremental_vacuum(self, conn) -> int:
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        # executescript steps the pragma to completion; execute() frees a single page
+        conn.executescript("PRAGMA incremental_vacuum")
+        return freelist - conn.execute("PRAGMA freelist_count").fetchone()[0]
     
     async def get_statistics(self):
         try:
-            stats = {}
-            self.cursor.execute(f"SELECT COUNT(*) FROM {DB_QUESTION_TABLE}")
-            stats['total_questions'] = self.cursor.fetchone()[0]
+            stats = await self.executor.read(self._read_statistics)
+            if self.catalog:
+                stats['catalog'] = self.catalog.stats()
             return stats
         except Exception as e:
             logger.error(f"❌ Error getting statistics: {str(e)}")
             return {}
     
+    def _days_ago(self, days: int) -> str:
+        return (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    
+    def _read_statistics(self, conn):
+        threshold_date = self._days_ago(self.config.MIN_DAYS_BETWEEN_REPOSTS)
+        week_ago = self._days_ago(7)
+        month_ago = self._days_ago(STATS_WINDOW_DAYS)
+        
+        buckets = {}
+        for row in conn.execute(f"""
+            SELECT class, subject, chapter, importance, total, never_posted
+            FROM {DB_STATS_TABLE}
+            WHERE total > 0
+        """):
+            buckets[row[:4]] = {
+                'class': row[0],
+                'subject': row[1],
+                'chapter': row[2],
+                'importance': row[3],
+                'total_questions': row[4],
+                'never_posted': row[5],
+                'eligible_now': row[4],
+                'posts_last_7_days': 0,
+                'posts_last_30_days': 0
+            }
+        
+        for row in conn.execute(f"""
+            SELECT class, subject, chapter, importance,
+                SUM(CASE WHEN day > ? THEN last_posted_questions ELSE 0 END),
+                SUM(CASE WHEN day > ? THEN posts ELSE 0 END),
+                SUM(CASE WHEN day > ? THEN posts ELSE 0 END)
+            FROM {DB_STATS_DAILY_TABLE}
+            WHERE day > ?
+            GROUP BY class, subject, chapter, importance
+        """, (threshold_date, week_ago, month_ago, min(threshold_date, month_ago))):
+            bucket = buckets.get(row[:4])
+            if bucket is None:
+                continue
+            bucket['eligible_now'] -= row[4]
+            bucket['posts_last_7_days'] = row[5]
+            bucket['posts_last_30_days'] = row[6]
+        
+        stats = {'buckets': list(buckets.values())}
+        for field in ('total_questions', 'never_posted', 'eligible_now', 'posts_last_7_days', 'posts_last_30_days'):
+            stats[field] = sum(bucket[field] for bucket in buckets.values())
+        return stats
+    
     async def close(self):
         try:
-            if self.conn:
-                self.conn.close()
+            await self.executor.close()
         except Exception as e:
             logger.error(f"❌ Error closing database: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""
+Near-duplicate question detection at ingest
+
+Question text is normalized before comparison:
+- NFC normalization, so NFC and NFD Bengali compare equal;
+- Bengali digits become ASCII digits;
+- zero-width joiners, sentence punctuation and hyphens between words are
+  dropped;
+- whitespace is collapsed and the text is casefolded.
+
+Math symbols and brackets are kept, so ``x+1`` and ``x-1`` stay different.
+
+Each question stores a 64-bit hash of its normalized text, which catches
+exact duplicates. It also stores MinHash/LSH band keys built from character
+shingles of the normalized text, which catch small rewordings. A new
+question is looked up through indexed equality probes only, so a check
+costs the same against a 1M-row bank as against a small one. Every
+candidate is verified with an exact Jaccard similarity on its current
+text. Stale band keys left by edited or deleted questions are therefore
+harmless.
+"""
+
+import hashlib
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+from struct import Struct
+
+from src.config.constants import DB_QUESTION_TABLE, DB_DEDUP_TABLE
+from src.database.search import normalize_text
+
+SHINGLE_SIZE = 4
+NUM_PERM = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_PERM // BANDS
+# A band shared by more questions than this comes from template text such
+# as "ব্যাখ্যা কর", not from a duplicate, and is not worth verifying
+MAX_BAND_SIZE = 20
+
+DROPPED_PUNCTUATION = set(".,;:!?।॥'\"‘’“”…")
+
+_band_values = Struct(f">{ROWS_PER_BAND}Q")
+
+def _hash64(data: bytes, signed: bool = False) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big", signed=signed)
+
+# Shingles repeat heavily across questions (common words, Bengali
+# suffixes), so bulk imports hash most of them only once
+@lru_cache(maxsize=1 << 18)
+def _shingle_hash(shingle: str) -> int:
+    return _hash64(shingle.encode("utf-8"))
+
+# Keeps borrowed bin values apart from real ones (bin values are below 2**59)
+_DENSIFY_OFFSET = 1 << 59
+
+Fingerprint = namedtuple("Fingerprint", "class_key subject_key normalized shingles content_hash band_keys")
+Duplicate = namedtuple("Duplicate", "question_id similarity")
+
+def _is_letter(char: str) -> bool:
+    return unicodedata.category(char)[0] in "LM"
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFC", text or "")
+    chars = []
+    for i, char in enumerate(text):
+        category = unicodedata.category(char)
+        if category == "Nd":
+            chars.append(str(unicodedata.digit(char)))
+        elif category == "Cf":
+            continue
+        elif char in DROPPED_PUNCTUATION:
+            chars.append(" ")
+        elif char == "-" and 0 < i < len(text) - 1 and _is_letter(text[i - 1]) and _is_letter(text[i + 1]):
+            # "continuity-এর" is two words; "x-1" keeps its minus
+            chars.append(" ")
+        else:
+            chars.append(char)
+    return " ".join("".join(chars).casefold().split())
+
+def shingles(normalized: str):
+    padded = f" {normalized} "
+    if len(padded) <= SHINGLE_SIZE:
+        return {padded}
+    return {padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)}
+
+def jaccard(a, b) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+def signature(shingle_set):
+    """One-permutation MinHash: each shingle hash lands in one of ``NUM_PERM`` bins, keeping the minimum."""
+    bins = [None] * NUM_PERM
+    for shingle in shingle_set:
+        value = _shingle_hash(shingle)
+        slot = value % NUM_PERM
+        value //= NUM_PERM
+        if bins[slot] is None or value < bins[slot]:
+            bins[slot] = value
+
+    # Densify: an empty bin borrows the next filled bin to its right, offset
+    # by the distance, so two similar sets still agree on it
+    values = list(bins)
+    for slot in range(NUM_PERM):
+        if bins[slot] is None:
+            distance = 1
+            while bins[(slot + distance) % NUM_PERM] is None:
+                distance += 1
+            values[slot] = bins[(slot + distance) % NUM_PERM] + distance * _DENSIFY_OFFSET
+    return values
+
+def fingerprint(class_key: str, subject_key: str, question: str) -> Fingerprint:
+    normalized = normalize(question)
+    shingle_set = shingles(normalized)
+    values = signature(shingle_set)
+
+    # Band keys are scoped to the (class, subject) bucket like the UNIQUE constraint
+    prefix = f"{class_key}\x1f{subject_key}\x1f".encode("utf-8")
+    band_keys = [
+        _hash64(prefix + bytes([band]) + _band_values.pack(*values[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]), signed=True)
+        for band in range(BANDS)
+    ]
+    return Fingerprint(
+        class_key, subject_key, normalized, shingle_set,
+        _hash64(normalized.encode("utf-8"), signed=True), band_keys
+    )
+
+def find_duplicate(conn, fp: Fingerprint, threshold: float):
+    """Most similar existing question in the same bucket at or above ``threshold``, or None."""
+    candidates = {row[0] for row in conn.execute(f"""
+        SELECT id FROM {DB_QUESTION_TABLE}
+        WHERE class = ? AND subject = ? AND content_hash = ?
+    """, (fp.class_key, fp.subject_key, fp.content_hash))}
+    for band_key in fp.band_keys:
+        members = conn.execute(f"""
+            SELECT question_id FROM {DB_DEDUP_TABLE} WHERE band_key = ? LIMIT {MAX_BAND_SIZE + 1}
+        """, (band_key,)).fetchall()
+        if len(members) <= MAX_BAND_SIZE:
+            candidates.update(row[0] for row in members)
+    if not candidates:
+        return None
+
+    candidate_ids = list(candidates)
+    placeholders = ", ".join("?" * len(candidate_ids))
+    best = None
+    # Band keys are already bucket-scoped; filtering class and subject here
+    # rather than in SQL keeps the planner on the primary key
+    for question_id, class_key, subject_key, question in conn.execute(f"""
+        SELECT id, class, subject, question FROM {DB_QUESTION_TABLE}
+        WHERE id IN ({placeholders})
+    """, candidate_ids):
+        if (class_key, subject_key) != (fp.class_key, fp.subject_key):
+            continue
+        normalized = normalize(question)
+        similarity = 1.0 if normalized == fp.normalized else jaccard(fp.shingles, shingles(normalized))
+        if similarity >= threshold and (best is None or similarity > best.similarity):
+            best = Duplicate(question_id, similarity)
+            if similarity == 1.0:
+                break
+    return best
+
+def index_question(conn, question_id: int, fp: Fingerprint):
+    conn.execute(
+        f"UPDATE {DB_QUESTION_TABLE} SET content_hash = ? WHERE id = ?",
+        (fp.content_hash, question_id)
+    )
+    conn.executemany(
+        f"INSERT OR IGNORE INTO {DB_DEDUP_TABLE} (band_key, question_id) VALUES (?, ?)",
+        [(band_key, question_id) for band_key in fp.band_keys]
+    )
+
+def stored_values(values):
+    """``values`` with question text and chapter in the NFC form the search index expects."""
+    class_key, subject_key, question, importance, marks, chapter = values
+    return (class_key, subject_key, normalize_text(question), importance, marks, normalize_text(chapter))
+
+def insert_question(conn, values, threshold: float):
+    """Insert one ``(class, subject, question, importance, marks, chapter)`` row unless it duplicates another.
+
+    Returns ``(question_id, duplicate)``: the new ID and None, or None and
+    the ``Duplicate`` it matched (similarity 1.0 for the same normalized text).
+    """
+    values = stored_values(values)
+    fp = fingerprint(values[0], values[1], values[2])
+    duplicate = find_duplicate(conn, fp, threshold)
+    if duplicate:
+        return None, duplicate
+
+    cursor = conn.execute(f"""
+        INSERT OR IGNORE INTO {DB_QUESTION_TABLE}
+        (class, subject, question, importance, marks, chapter)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, values)
+    if not cursor.rowcount:
+        # Byte-identical to a question that was never fingerprinted
+        existing = conn.execute(f"""
+            SELECT id FROM {DB_QUESTION_TABLE} WHERE class = ? AND subject = ? AND question = ?
+        """, values[:3]).fetchone()
+        return None, Duplicate(existing[0] if existing else None, 1.0)
+
+    index_question(conn, cursor.lastrowid, fp)
+    return cursor.lastrowid, None
+
+def find_duplicate_pairs(conn, threshold: float):
+    """``(id, duplicate id, similarity)`` for every (near-)duplicate pair already in the bank."""
+    pairs = set()
+    members = []
+    last_key = None
+    for band_key, question_id in conn.execute(f"""
+        SELECT band_key, question_id FROM {DB_DEDUP_TABLE}
+        WHERE band_key IN (
+            SELECT band_key FROM {DB_DEDUP_TABLE}
+            GROUP BY band_key HAVING COUNT(*) BETWEEN 2 AND {MAX_BAND_SIZE}
+        )
+        ORDER BY band_key, question_id
+    """):
+        if band_key != last_key:
+            members = []
+            last_key = band_key
+        pairs.update((other, question_id) for other in members)
+        members.append(question_id)
+
+    texts = {}
+    found = []
+    for first, second in sorted(pairs):
+        for question_id in (first, second):
+            if question_id not in texts:
+                row = conn.execute(
+                    f"SELECT question FROM {DB_QUESTION_TABLE} WHERE id = ?", (question_id,)
+                ).fetchone()
+                texts[question_id] = shingles(normalize(row[0])) if row else None
+        if texts[first] is None or texts[second] is None:
+            continue
+        similarity = jaccard(texts[first], texts[second])
+        if similarity >= threshold:
+            found.append((first, second, similarity))
+    return found
+
+def backfill(conn, batch_size: int = 5000, after_id: int = 0) -> int:
+    """Fingerprint every question above ``after_id`` that has no content hash yet.
+
+    The scan walks the primary key from ``after_id``, so callers that know
+    where their new rows start only pay for those rows.
+    """
+    indexed = 0
+    while True:
+        rows = conn.execute(f"""
+            SELECT id, class, subject, question FROM {DB_QUESTION_TABLE}
+            WHERE id > ? AND content_hash IS NULL
+            ORDER BY id
+            LIMIT ?
+        """, (after_id, batch_size)).fetchall()
+        if not rows:
+            return indexed
+        for question_id, class_key, subject_key, question in rows:
+            index_question(conn, question_id, fingerprint(class_key, subject_key, question))
+        indexed += len(rows)
+        after_id = rows[-1][0]
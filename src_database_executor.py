@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+@contextmanager
+def transaction(conn):
+    """Run the block in one write transaction: committed on success, rolled back on any error."""
+    # BEGIN explicitly so DDL (migrations) is part of the transaction too
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+class DatabaseExecutor:
+    """Runs sqlite3 work off the event loop.
+
+    All writes go through one dedicated writer thread (SQLite allows a
+    single writer anyway), reads are served by a small pool of reader
+    threads. Every thread owns its own connection and the database runs
+    in WAL mode, so readers never wait on the writer.
+    """
+
+    def __init__(self, db_path: str, read_pool_size: int = 2):
+        self.db_path = db_path
+        self.read_pool_size = max(1, read_pool_size)
+        self._writer = None
+        self._readers = None
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._writer:
+            return
+
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=self.read_pool_size, thread_name_prefix="db-reader")
+
+        # Switch to WAL once from the writer before any reader connects
+        self._writer.submit(self._get_connection, False).result()
+        logger.info(f"🧵 DB executor started (1 writer, {self.read_pool_size} readers)")
+
+    def _get_connection(self, readonly: bool) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA busy_timeout = 30000")
+        if readonly:
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+
+        self._local.conn = conn
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _run_read(self, fn, args, kwargs):
+        conn = self._get_connection(readonly=True)
+        return fn(conn, *args, **kwargs)
+
+    def _run_write(self, fn, args, kwargs):
+        conn = self._get_connection(readonly=False)
+        with transaction(conn):
+            return fn(conn, *args, **kwargs)
+
+    def _run_maintenance(self, fn, args, kwargs):
+        conn = self._get_connection(readonly=False)
+        return fn(conn, *args, **kwargs)
+
+    async def read(self, fn, *args, **kwargs):
+        """Run ``fn(conn, *args, **kwargs)`` on a reader thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, partial(self._run_read, fn, args, kwargs))
+
+    async def write(self, fn, *args, **kwargs):
+        """Run ``fn(conn, *args, **kwargs)`` in a transaction on the writer thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, partial(self._run_write, fn, args, kwargs))
+
+    async def maintenance(self, fn, *args, **kwargs):
+        """Run ``fn(conn, *args, **kwargs)`` on the writer thread outside a transaction.
+
+        For statements SQLite refuses inside a transaction, such as VACUUM,
+        and for long jobs that commit in several ``transaction`` blocks so
+        other processes can write in between.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, partial(self._run_maintenance, fn, args, kwargs))
+
+    async def close(self):
+        if not self._writer:
+            return
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._shutdown)
+
+    def _shutdown(self):
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        self._writer = None
+        self._readers = None
+
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
@@ -0,0 +1,266 @@
+"""
+Streaming bulk importer for question banks
+
+Reads nested ``data_initial_questions.json``-shaped files, JSON arrays of
+flat rows, JSONL and CSV exports one row at a time, validates each row and
+writes them in batches, each in its own transaction. A bot running
+against the same database can write between batches, and a failed import
+keeps the batches committed before the failure. Rows that repeat a
+question already in the bank (or earlier in the same file) after
+normalization, or that are near-duplicates of one, are skipped and
+reported.
+"""
+
+import csv
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.config.constants import DB_QUESTION_TABLE
+from src.database import dedup
+from src.database.executor import transaction
+from src.utils.validator import validate_question
+
+logger = logging.getLogger(__name__)
+
+# Pause after each committed batch. A writer in another process waiting on
+# the lock retries every 100 ms at most (SQLite's busy handler), and would
+# almost never hit the few milliseconds between two batches without it.
+BATCH_PAUSE = 0.1
+
+@dataclass
+class ImportReport:
+    inserted: int = 0
+    duplicates: int = 0
+    near_duplicates: int = 0
+    rejected: int = 0
+    elapsed: float = 0.0
+    # (question, existing question ID, similarity) for the first few near-duplicates
+    examples: list = field(default_factory=list)
+
+    @property
+    def processed(self) -> int:
+        return self.inserted + self.duplicates + self.near_duplicates + self.rejected
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+class _JsonStream:
+    """Minimal incremental reader that decodes one JSON value at a time."""
+
+    def __init__(self, fh, chunk_size: int = 1 << 16):
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fh.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or 'EOF'}'")
+        self.pos += 1
+
+    def skip_comma(self):
+        if self.peek() == ",":
+            self.pos += 1
+
+    def value(self):
+        # Only used for strings and objects, which are self-delimiting, so a
+        # decode error just means the value continues in the next chunk.
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                self.pos = end
+                return value
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+def iter_json_questions(path):
+    with open(path, encoding="utf-8") as fh:
+        stream = _JsonStream(fh)
+
+        if stream.peek() == "[":
+            stream.expect("[")
+            while stream.peek() not in ("]", ""):
+                yield stream.value()
+                stream.skip_comma()
+            stream.expect("]")
+            return
+
+        stream.expect("{")
+        while stream.peek() not in ("}", ""):
+            class_key = stream.value()
+            stream.expect(":")
+            stream.expect("{")
+            while stream.peek() not in ("}", ""):
+                subject_key = stream.value()
+                stream.expect(":")
+                stream.expect("[")
+                while stream.peek() not in ("]", ""):
+                    row = stream.value()
+                    if isinstance(row, dict):
+                        row.setdefault("class", class_key)
+                        row.setdefault("subject", subject_key)
+                    yield row
+                    stream.skip_comma()
+                stream.expect("]")
+                stream.skip_comma()
+            stream.expect("}")
+            stream.skip_comma()
+        stream.expect("}")
+
+def iter_jsonl_questions(path):
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield None
+
+def iter_csv_questions(path):
+    with open(path, encoding="utf-8", newline="") as fh:
+        yield from csv.DictReader(fh)
+
+def iter_questions(path):
+    suffix = Path(path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return iter_jsonl_questions(path)
+    if suffix == ".csv":
+        return iter_csv_questions(path)
+    return iter_json_questions(path)
+
+def normalize_row(row):
+    """Return an insertable tuple for ``row`` or ``None`` if it is invalid."""
+    if not isinstance(row, dict):
+        return None
+
+    try:
+        if validate_question(row):
+            return None
+        marks = int(row.get("marks") or 5)
+    except (TypeError, ValueError):
+        return None
+
+    return dedup.stored_values((
+        str(row["class"]).strip(),
+        str(row["subject"]).strip(),
+        str(row["question"]).strip(),
+        row.get("importance") or "medium",
+        marks,
+        row.get("chapter") or "",
+    ))
+
+class BulkImporter:
+    def __init__(self, db_manager, batch_size: int = 5000, threshold: float = None, max_examples: int = 20):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        # None: config default; above 1 disables near-duplicate checks (byte-identical rows are still skipped)
+        self.threshold = db_manager.config.DEDUP_THRESHOLD if threshold is None else threshold
+        self.max_examples = max_examples
+
+    async def import_file(self, path) -> ImportReport:
+        logger.info(f"📥 Importing questions from {path}...")
+        buckets = set()
+        try:
+            report = await self.db_manager.executor.maintenance(self._import_rows, iter_questions(path), buckets)
+        finally:
+            # Only after the commits (including a failed import's earlier
+            # batches), so readers cannot re-cache the old bucket contents
+            self.db_manager.invalidate_catalog(buckets)
+        logger.info(
+            f"✅ Import finished: {report.inserted} inserted, {report.duplicates} duplicates, "
+            f"{report.near_duplicates} near-duplicates, {report.rejected} rejected ({report.rows_per_second:.0f} rows/s)"
+        )
+        return report
+
+    def _import_rows(self, conn, rows, buckets) -> ImportReport:
+        report = ImportReport()
+        started = time.perf_counter()
+        batch = []
+
+        for row in rows:
+            values = normalize_row(row)
+            if values is None:
+                report.rejected += 1
+                continue
+
+            batch.append(values)
+            if len(batch) >= self.batch_size:
+                self._commit_batch(conn, batch, report, buckets)
+                batch = []
+
+        if batch:
+            self._commit_batch(conn, batch, report, buckets)
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def _commit_batch(self, conn, batch, report: ImportReport, buckets):
+        # One transaction per batch, so the write lock is held for one batch at a time
+        with transaction(conn):
+            self._flush(conn, batch, report)
+        buckets.update((values[0], values[1]) for values in batch)
+        time.sleep(BATCH_PAUSE)
+
+    def _flush(self, conn, batch, report: ImportReport):
+        if self.threshold > 1:
+            self._insert_batch(conn, batch, report)
+        else:
+            # Row by row, so every row is checked against the ones before it
+            for values in batch:
+                question_id, duplicate = dedup.insert_question(conn, values, self.threshold)
+                if question_id:
+                    report.inserted += 1
+                elif duplicate and duplicate.similarity < 1.0:
+                    report.near_duplicates += 1
+                    if len(report.examples) < self.max_examples:
+                        report.examples.append((values[2], duplicate.question_id, duplicate.similarity))
+                else:
+                    report.duplicates += 1
+
+    def _insert_batch(self, conn, batch, report: ImportReport):
+        last_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {DB_QUESTION_TABLE}").fetchone()[0]
+        cursor = conn.executemany(f"""
+            INSERT OR IGNORE INTO {DB_QUESTION_TABLE}
+            (class, subject, question, importance, marks, chapter)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, batch)
+
+        # rowcount excludes trigger side effects, so it is exactly the number of new questions
+        report.inserted += cursor.rowcount
+        report.duplicates += len(batch) - cursor.rowcount
+
+        # This batch's rows are fingerprinted here so later imports still see
+        # them; AUTOINCREMENT IDs only grow and this batch's transaction is the only writer
+        if cursor.rowcount:
+            dedup.backfill(conn, after_id=last_id)
@@ -1,4 +1,7 @@
 from .database import DatabaseManager
+from .catalog import QuestionCatalog
+from .executor import DatabaseExecutor
+from .importer import BulkImporter, ImportReport
 from .models import Question, PostedHistory
 
-__all__ = ['DatabaseManager', 'Question', 'PostedHistory']
\ No newline at end of file
+__all__ = ['DatabaseManager', 'DatabaseExecutor', 'QuestionCatalog', 'BulkImporter', 'ImportReport', 'Question', 'PostedHistory']
\ No newline at end of file
@@ -0,0 +1,404 @@
+"""
+Schema migrations, tracked with PRAGMA user_version
+"""
+
+import logging
+import sqlite3
+
+from src.config.constants import (
+    DB_QUESTION_TABLE, DB_POSTED_TABLE, DB_ROTATION_TABLE, DB_ROTATION_STATE_TABLE,
+    DB_POSTED_MONTHLY_TABLE, DB_STATS_TABLE, DB_STATS_DAILY_TABLE,
+    DB_OUTBOX_TABLE, DB_OUTBOX_CHUNKS_TABLE, DB_OUTBOX_DELIVERIES_TABLE, DB_BANK_VERSION_TABLE, DB_SEARCH_TABLE,
+    DB_DEDUP_TABLE, DB_SLOT_RUNS_TABLE, DB_PLAN_TABLE
+)
+from src.database import dedup
+from src.database.search import SEARCH_TOKENIZER
+
+logger = logging.getLogger(__name__)
+
+def _add_selection_indexes(conn):
+    # Eligibility becomes a range predicate on questions.last_posted, so the
+    # denormalized columns are backfilled from history here and kept current
+    # by the same transaction that records each post.
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_questions_bucket
+        ON {DB_QUESTION_TABLE}(class, subject, importance, last_posted)
+    """)
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_posted_history_question_date
+        ON {DB_POSTED_TABLE}(question_id, post_date)
+    """)
+    conn.execute(f"""
+        UPDATE {DB_QUESTION_TABLE}
+        SET last_posted = (
+                SELECT MAX(post_date) FROM {DB_POSTED_TABLE}
+                WHERE question_id = {DB_QUESTION_TABLE}.id
+            ),
+            posted_count = (
+                SELECT COUNT(*) FROM {DB_POSTED_TABLE}
+                WHERE question_id = {DB_QUESTION_TABLE}.id
+            )
+    """)
+
+def _add_rotation_queues(conn):
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_questions_bucket_id
+        ON {DB_QUESTION_TABLE}(class, subject, id)
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_ROTATION_TABLE} (
+            class TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            importance TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            PRIMARY KEY (class, subject, importance, position)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_ROTATION_STATE_TABLE} (
+            class TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            importance TEXT NOT NULL,
+            cycle INTEGER NOT NULL DEFAULT 0,
+            cursor INTEGER NOT NULL DEFAULT 0,
+            size INTEGER NOT NULL DEFAULT 0,
+            max_question_id INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (class, subject, importance)
+        )
+    """)
+
+def _add_history_rollup(conn):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_POSTED_MONTHLY_TABLE} (
+            question_id INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            post_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (question_id, month)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_posted_history_date
+        ON {DB_POSTED_TABLE}(post_date)
+    """)
+
+def _stats_key(row: str) -> str:
+    return f"{row}.class, {row}.subject, COALESCE({row}.chapter, ''), COALESCE({row}.importance, 'medium')"
+
+def _add_statistics_tables(conn):
+    # Counters per (class, subject, chapter, importance), maintained by
+    # triggers so get_statistics reads O(buckets) rows. The daily table
+    # counts questions whose last_posted is that day (for eligible-now) and
+    # posted_history rows of that day (for 7/30-day post counts).
+    key_columns = "class, subject, chapter, importance"
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_STATS_TABLE} (
+            class TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            chapter TEXT NOT NULL,
+            importance TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            never_posted INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY ({key_columns})
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_STATS_DAILY_TABLE} (
+            class TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            chapter TEXT NOT NULL,
+            importance TEXT NOT NULL,
+            day DATE NOT NULL,
+            last_posted_questions INTEGER NOT NULL DEFAULT 0,
+            posts INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY ({key_columns}, day)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_question_stats_daily_day
+        ON {DB_STATS_DAILY_TABLE}(day)
+    """)
+
+    add_new = f"""
+        INSERT INTO {DB_STATS_TABLE} ({key_columns}, total, never_posted)
+        VALUES ({_stats_key("NEW")}, 1, NEW.last_posted IS NULL)
+        ON CONFLICT({key_columns}) DO UPDATE SET
+            total = total + 1,
+            never_posted = never_posted + excluded.never_posted;
+        INSERT INTO {DB_STATS_DAILY_TABLE} ({key_columns}, day, last_posted_questions)
+        SELECT {_stats_key("NEW")}, NEW.last_posted, 1
+        WHERE NEW.last_posted IS NOT NULL
+        ON CONFLICT({key_columns}, day) DO UPDATE SET
+            last_posted_questions = last_posted_questions + 1;
+    """
+    remove_old = f"""
+        UPDATE {DB_STATS_TABLE}
+        SET total = total - 1,
+            never_posted = never_posted - (OLD.last_posted IS NULL)
+        WHERE ({key_columns}) = ({_stats_key("OLD")});
+        UPDATE {DB_STATS_DAILY_TABLE}
+        SET last_posted_questions = last_posted_questions - 1
+        WHERE ({key_columns}) = ({_stats_key("OLD")}) AND day = OLD.last_posted;
+    """
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_stats_insert
+        AFTER INSERT ON {DB_QUESTION_TABLE}
+        BEGIN {add_new} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_stats_delete
+        AFTER DELETE ON {DB_QUESTION_TABLE}
+        BEGIN {remove_old} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_stats_update
+        AFTER UPDATE OF class, subject, chapter, importance, last_posted ON {DB_QUESTION_TABLE}
+        WHEN OLD.class IS NOT NEW.class OR OLD.subject IS NOT NEW.subject
+            OR OLD.chapter IS NOT NEW.chapter OR OLD.importance IS NOT NEW.importance
+            OR OLD.last_posted IS NOT NEW.last_posted
+        BEGIN {remove_old} {add_new} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_posted_history_stats
+        AFTER INSERT ON {DB_POSTED_TABLE}
+        BEGIN
+            INSERT INTO {DB_STATS_DAILY_TABLE} ({key_columns}, day, posts)
+            SELECT {_stats_key("q")}, NEW.post_date, 1
+            FROM {DB_QUESTION_TABLE} q
+            WHERE q.id = NEW.question_id
+            ON CONFLICT({key_columns}, day) DO UPDATE SET
+                posts = posts + 1;
+        END
+    """)
+
+    # Backfill from the existing bank and history
+    conn.execute(f"""
+        INSERT INTO {DB_STATS_TABLE} ({key_columns}, total, never_posted)
+        SELECT {_stats_key("q")}, COUNT(*), SUM(q.last_posted IS NULL)
+        FROM {DB_QUESTION_TABLE} q
+        GROUP BY 1, 2, 3, 4
+    """)
+    conn.execute(f"""
+        INSERT INTO {DB_STATS_DAILY_TABLE} ({key_columns}, day, last_posted_questions)
+        SELECT {_stats_key("q")}, q.last_posted, COUNT(*)
+        FROM {DB_QUESTION_TABLE} q
+        WHERE q.last_posted IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+    conn.execute(f"""
+        INSERT INTO {DB_STATS_DAILY_TABLE} ({key_columns}, day, posts)
+        SELECT {_stats_key("q")}, ph.post_date, COUNT(*)
+        FROM {DB_POSTED_TABLE} ph
+        JOIN {DB_QUESTION_TABLE} q ON q.id = ph.question_id
+        WHERE true
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT({key_columns}, day) DO UPDATE SET
+            posts = posts + excluded.posts
+    """)
+
+def _add_outbox(conn):
+    # One row per rendered post (at most one per schedule slot), its chunks,
+    # and one delivery row per target chat recording how many chunks that
+    # chat has acknowledged.
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_OUTBOX_TABLE} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            slot TEXT NOT NULL UNIQUE,
+            content_hash TEXT NOT NULL,
+            question_ids TEXT NOT NULL DEFAULT '[]',
+            chunk_count INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            recorded INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    """)
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_outbox_posts_status
+        ON {DB_OUTBOX_TABLE}(status, id)
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_OUTBOX_CHUNKS_TABLE} (
+            post_id INTEGER NOT NULL REFERENCES {DB_OUTBOX_TABLE}(id) ON DELETE CASCADE,
+            seq INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            PRIMARY KEY (post_id, seq)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_OUTBOX_DELIVERIES_TABLE} (
+            post_id INTEGER NOT NULL REFERENCES {DB_OUTBOX_TABLE}(id) ON DELETE CASCADE,
+            chat_id TEXT NOT NULL,
+            next_seq INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            message_ids TEXT NOT NULL DEFAULT '[]',
+            last_error TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (post_id, chat_id)
+        ) WITHOUT ROWID
+    """)
+
+def _add_bank_version(conn):
+    # A single counter bumped by any change to question content, so a post
+    # rendered ahead of its slot can tell whether the bank moved since.
+    # Posting (posted_count/last_posted) does not count as a change.
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_BANK_VERSION_TABLE} (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute(f"INSERT OR IGNORE INTO {DB_BANK_VERSION_TABLE} (id, version) VALUES (1, 0)")
+
+    bump = f"UPDATE {DB_BANK_VERSION_TABLE} SET version = version + 1 WHERE id = 1;"
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_version_insert
+        AFTER INSERT ON {DB_QUESTION_TABLE}
+        BEGIN {bump} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_version_delete
+        AFTER DELETE ON {DB_QUESTION_TABLE}
+        BEGIN {bump} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_version_update
+        AFTER UPDATE OF class, subject, question, importance, marks, chapter ON {DB_QUESTION_TABLE}
+        BEGIN {bump} END
+    """)
+
+    conn.execute(f"ALTER TABLE {DB_OUTBOX_TABLE} ADD COLUMN bank_version INTEGER")
+
+def _add_search_index(conn):
+    # External-content FTS5 index over question text and chapter, kept in
+    # step with questions by triggers; rowid is the question id.
+    try:
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {DB_SEARCH_TABLE} USING fts5(
+                question, chapter,
+                content='{DB_QUESTION_TABLE}', content_rowid='id',
+                tokenize="{SEARCH_TOKENIZER}"
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5: search falls back to LIKE
+        logger.warning(f"⚠️ Full-text search unavailable: {str(e)}")
+        return
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_fts_insert
+        AFTER INSERT ON {DB_QUESTION_TABLE}
+        BEGIN
+            INSERT INTO {DB_SEARCH_TABLE}(rowid, question, chapter)
+            VALUES (NEW.id, NEW.question, NEW.chapter);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_fts_delete
+        AFTER DELETE ON {DB_QUESTION_TABLE}
+        BEGIN
+            INSERT INTO {DB_SEARCH_TABLE}({DB_SEARCH_TABLE}, rowid, question, chapter)
+            VALUES ('delete', OLD.id, OLD.question, OLD.chapter);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_questions_fts_update
+        AFTER UPDATE OF question, chapter ON {DB_QUESTION_TABLE}
+        BEGIN
+            INSERT INTO {DB_SEARCH_TABLE}({DB_SEARCH_TABLE}, rowid, question, chapter)
+            VALUES ('delete', OLD.id, OLD.question, OLD.chapter);
+            INSERT INTO {DB_SEARCH_TABLE}(rowid, question, chapter)
+            VALUES (NEW.id, NEW.question, NEW.chapter);
+        END
+    """)
+    conn.execute(f"INSERT INTO {DB_SEARCH_TABLE}({DB_SEARCH_TABLE}) VALUES ('rebuild')")
+
+def _add_dedup_index(conn):
+    # Normalized content hash for exact duplicates and MinHash/LSH band keys
+    # for near-duplicates, filled in at ingest by src.database.dedup.
+    conn.execute(f"ALTER TABLE {DB_QUESTION_TABLE} ADD COLUMN content_hash INTEGER")
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_questions_content_hash
+        ON {DB_QUESTION_TABLE}(class, subject, content_hash)
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_DEDUP_TABLE} (
+            band_key INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            PRIMARY KEY (band_key, question_id)
+        ) WITHOUT ROWID
+    """)
+    indexed = dedup.backfill(conn)
+    if indexed:
+        logger.info(f"🧬 Fingerprinted {indexed} existing questions for duplicate detection")
+
+def _add_slot_runs(conn):
+    # One row per run of a scheduled job: when it was due, when it actually
+    # started and finished, and whether it was a catch-up after downtime.
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_SLOT_RUNS_TABLE} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT NOT NULL,
+            slot TEXT NOT NULL,
+            scheduled_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT,
+            status TEXT NOT NULL DEFAULT 'running',
+            catch_up INTEGER NOT NULL DEFAULT 0,
+            error TEXT
+        )
+    """)
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_slot_runs_job
+        ON {DB_SLOT_RUNS_TABLE}(job_id, scheduled_at)
+    """)
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_slot_runs_scheduled
+        ON {DB_SLOT_RUNS_TABLE}(scheduled_at)
+    """)
+
+def _add_post_plan(conn):
+    # Questions assigned ahead of time to upcoming schedule slots, keyed by
+    # the same slot name as outbox posts.
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DB_PLAN_TABLE} (
+            slot TEXT NOT NULL,
+            class TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            PRIMARY KEY (slot, class, subject, position)
+        ) WITHOUT ROWID
+    """)
+
+MIGRATIONS = [
+    _add_selection_indexes,
+    _add_rotation_queues,
+    _add_history_rollup,
+    _add_statistics_tables,
+    _add_outbox,
+    _add_bank_version,
+    _add_search_index,
+    _add_dedup_index,
+    _add_slot_runs,
+    _add_post_plan,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def get_schema_version(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def apply_migrations(conn) -> int:
+    """Apply pending migrations inside the caller's transaction."""
+    version = get_schema_version(conn)
+
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        migration(conn)
+        conn.execute(f"PRAGMA user_version = {number}")
+        logger.info(f"🛠️ Applied schema migration {number}: {migration.__name__.lstrip('_')}")
+
+    return SCHEMA_VERSION
@@ -0,0 +1,187 @@
+"""
+Durable outbox for rendered posts
+
+A post is rendered once per schedule slot and stored with its chunks
+before anything is sent. Every target chat gets a delivery row holding the
+number of chunks Telegram has acknowledged, advanced in its own
+transaction after each chunk. A drain after a crash or a failed send
+resumes each chat at its next unacknowledged chunk, so a slot is never
+re-rendered and a chunk is only repeated if the process died between
+Telegram accepting it and the acknowledgement being committed.
+
+Posts can also be rendered ahead of their slot as ``'prepared'``. They
+carry the question bank version they were rendered against, and are only
+handed to the drain (as ``'pending'``) at slot time.
+"""
+
+import hashlib
+import json
+
+from src.config.constants import (
+    DB_OUTBOX_TABLE, DB_OUTBOX_CHUNKS_TABLE, DB_OUTBOX_DELIVERIES_TABLE, DB_BANK_VERSION_TABLE
+)
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def find_post(conn, slot: str):
+    row = conn.execute(f"""
+        SELECT id, content_hash, status, bank_version, question_ids
+        FROM {DB_OUTBOX_TABLE} WHERE slot = ?
+    """, (slot,)).fetchone()
+    if row is None:
+        return None
+    return {
+        'id': row[0],
+        'content_hash': row[1],
+        'status': row[2],
+        'bank_version': row[3],
+        'question_ids': json.loads(row[4])
+    }
+
+def bank_version(conn) -> int:
+    row = conn.execute(f"SELECT version FROM {DB_BANK_VERSION_TABLE} WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+def _store_chunks(conn, post_id: int, chunks):
+    conn.executemany(f"""
+        INSERT INTO {DB_OUTBOX_CHUNKS_TABLE} (post_id, seq, text, content_hash)
+        VALUES (?, ?, ?, ?)
+    """, [(post_id, seq, text, content_hash(text)) for seq, text in enumerate(chunks)])
+
+def enqueue_post(conn, slot: str, content: str, chunks, question_ids, chat_ids,
+                 status: str = 'pending', version: int = None):
+    """Store a rendered post for ``slot`` unless one exists; return (post id, created).
+
+    A ``'prepared'`` post is rendered ahead of its slot and is not drained
+    until ``release_post`` marks it pending.
+    """
+    existing = find_post(conn, slot)
+    if existing:
+        return existing['id'], False
+
+    post_id = conn.execute(f"""
+        INSERT INTO {DB_OUTBOX_TABLE} (slot, content_hash, question_ids, chunk_count, status, bank_version)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (
+        slot, content_hash(content), json.dumps(list(question_ids)), len(chunks), status,
+        bank_version(conn) if version is None else version
+    )).lastrowid
+
+    _store_chunks(conn, post_id, chunks)
+
+    conn.executemany(f"""
+        INSERT OR IGNORE INTO {DB_OUTBOX_DELIVERIES_TABLE} (post_id, chat_id)
+        VALUES (?, ?)
+    """, [(post_id, str(chat_id)) for chat_id in chat_ids])
+
+    return post_id, True
+
+def release_post(conn, post_id: int, content: str = None, chunks=None, question_ids=None, version: int = None) -> bool:
+    """Hand a prepared post to the drain, replacing its content if it was re-rendered."""
+    if content is not None:
+        conn.execute(f"DELETE FROM {DB_OUTBOX_CHUNKS_TABLE} WHERE post_id = ?", (post_id,))
+        _store_chunks(conn, post_id, chunks)
+        conn.execute(f"""
+            UPDATE {DB_OUTBOX_TABLE}
+            SET content_hash = ?, question_ids = ?, chunk_count = ?, bank_version = ?
+            WHERE id = ? AND status = 'prepared'
+        """, (content_hash(content), json.dumps(list(question_ids)), len(chunks), version, post_id))
+
+    return conn.execute(f"""
+        UPDATE {DB_OUTBOX_TABLE} SET status = 'pending'
+        WHERE id = ? AND status = 'prepared'
+    """, (post_id,)).rowcount > 0
+
+def load_pending(conn, post_id: int = None):
+    """Pending posts, oldest first, with their chunks and unfinished deliveries."""
+    query = f"SELECT id, slot, chunk_count FROM {DB_OUTBOX_TABLE} WHERE status = 'pending'"
+    params = ()
+    if post_id is not None:
+        query += " AND id = ?"
+        params = (post_id,)
+
+    posts = []
+    for post_id, slot, chunk_count in conn.execute(query + " ORDER BY id", params).fetchall():
+        chunks = [row[0] for row in conn.execute(f"""
+            SELECT text FROM {DB_OUTBOX_CHUNKS_TABLE}
+            WHERE post_id = ? ORDER BY seq
+        """, (post_id,))]
+        if len(chunks) != chunk_count:
+            continue
+
+        deliveries = dict(conn.execute(f"""
+            SELECT chat_id, next_seq FROM {DB_OUTBOX_DELIVERIES_TABLE}
+            WHERE post_id = ? AND status = 'pending'
+        """, (post_id,)).fetchall())
+
+        posts.append({'id': post_id, 'slot': slot, 'chunks': chunks, 'deliveries': deliveries})
+    return posts
+
+def ack_chunk(conn, post_id: int, chat_id, seq: int, message_id=None) -> bool:
+    """Record that ``chat_id`` received chunk ``seq``; return True once it has them all."""
+    row = conn.execute(f"""
+        SELECT d.next_seq, d.message_ids, p.chunk_count
+        FROM {DB_OUTBOX_DELIVERIES_TABLE} d
+        JOIN {DB_OUTBOX_TABLE} p ON p.id = d.post_id
+        WHERE d.post_id = ? AND d.chat_id = ?
+    """, (post_id, str(chat_id))).fetchone()
+    if row is None or row[0] != seq:
+        return False
+
+    next_seq, message_ids, chunk_count = row
+    message_ids = json.loads(message_ids)
+    message_ids.append(message_id)
+    done = seq + 1 >= chunk_count
+
+    conn.execute(f"""
+        UPDATE {DB_OUTBOX_DELIVERIES_TABLE}
+        SET next_seq = ?, message_ids = ?, status = ?, last_error = NULL,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE post_id = ? AND chat_id = ?
+    """, (seq + 1, json.dumps(message_ids), 'sent' if done else 'pending', post_id, str(chat_id)))
+    return done
+
+def fail_delivery(conn, post_id: int, chat_id, error: str, max_attempts: int):
+    conn.execute(f"""
+        UPDATE {DB_OUTBOX_DELIVERIES_TABLE}
+        SET attempts = attempts + 1,
+            last_error = ?,
+            status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE status END,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE post_id = ? AND chat_id = ? AND status = 'pending'
+    """, (error, max_attempts, post_id, str(chat_id)))
+
+def claim_question_ids(conn, post_id: int):
+    """Question IDs of the post the first time this is called for it, [] afterwards."""
+    row = conn.execute(
+        f"SELECT question_ids FROM {DB_OUTBOX_TABLE} WHERE id = ? AND recorded = 0", (post_id,)
+    ).fetchone()
+    if row is None:
+        return []
+    conn.execute(f"UPDATE {DB_OUTBOX_TABLE} SET recorded = 1 WHERE id = ?", (post_id,))
+    return json.loads(row[0])
+
+def refresh_status(conn, post_id: int) -> str:
+    """Close the post once no delivery is pending: 'sent' if any chat got it all, else 'failed'."""
+    pending, sent = conn.execute(f"""
+        SELECT COALESCE(SUM(status = 'pending'), 0), COALESCE(SUM(status = 'sent'), 0)
+        FROM {DB_OUTBOX_DELIVERIES_TABLE}
+        WHERE post_id = ?
+    """, (post_id,)).fetchone()
+
+    status = 'pending' if pending else ('sent' if sent else 'failed')
+    if status != 'pending':
+        conn.execute(f"""
+            UPDATE {DB_OUTBOX_TABLE}
+            SET status = ?, finished_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'pending'
+        """, (status, post_id))
+    return status
+
+def prune(conn, cutoff: str) -> int:
+    """Delete finished or never-released posts created before ``cutoff`` (chunks and deliveries cascade)."""
+    return conn.execute(f"""
+        DELETE FROM {DB_OUTBOX_TABLE}
+        WHERE status != 'pending' AND created_at < ?
+    """, (cutoff,)).rowcount
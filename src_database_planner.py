@@ -0,0 +1,121 @@
+"""
+Post plans: questions assigned to upcoming schedule slots ahead of time
+
+Instead of each slot selecting on its own, the planner takes every
+question the next day or week of slots will need from the rotation
+queues in one transaction. Queues drain most important first and skip
+anything inside the repost window, so nothing repeats across the plan.
+The pool is then dealt out so each slot gets an even share. Within that,
+each question goes to a slot with the fewest questions from its chapter,
+then from its importance level. An importance level with at least one
+question per slot is spread evenly over the horizon; a smaller level
+fills the earliest slots, which are the next to post.
+
+Plans are stored per slot (named like outbox posts) and bucket, so a
+slot only reads its list. Planned questions are rechecked against the
+repost window when their slot reads them, and ones that no longer
+qualify are dropped. A bucket with no plan for the slot falls back to
+selecting on the spot, leaving alone questions planned for later slots.
+"""
+
+from src.config.constants import DB_QUESTION_TABLE, DB_PLAN_TABLE
+from src.database.rotation import importance_rank
+
+def assign(pool, slot_count: int, per_slot: int):
+    """Deal ``pool`` (question dicts, most important first) into ``slot_count`` lists of up to ``per_slot``."""
+    slots = [[] for _ in range(slot_count)]
+    chapters = [{} for _ in range(slot_count)]
+    ranks = [{} for _ in range(slot_count)]
+
+    # A level that covers the horizon aims at evenly spaced slots, so a run
+    # of very_high questions covers the whole week, not its start. A smaller
+    # level goes to the earliest slots, so the next slots to post have a plan.
+    level_sizes = {}
+    for question in pool:
+        rank = importance_rank(question.get('importance'))
+        level_sizes[rank] = level_sizes.get(rank, 0) + 1
+    level_seen = {}
+
+    for question in pool:
+        open_slots = [index for index in range(slot_count) if len(slots[index]) < per_slot]
+        if not open_slots:
+            break
+
+        chapter = (question.get('chapter') or '').casefold()
+        rank = importance_rank(question.get('importance'))
+        seen = level_seen.get(rank, 0)
+        level_seen[rank] = seen + 1
+        if level_sizes[rank] >= slot_count:
+            target = (seen + 0.5) * slot_count / level_sizes[rank]
+        else:
+            target = seen + 0.5
+
+        index = min(open_slots, key=lambda index: (
+            len(slots[index]),
+            chapters[index].get(chapter, 0) if chapter else 0,
+            ranks[index].get(rank, 0),
+            abs(index + 0.5 - target)
+        ))
+
+        slots[index].append(question)
+        if chapter:
+            chapters[index][chapter] = chapters[index].get(chapter, 0) + 1
+        ranks[index][rank] = ranks[index].get(rank, 0) + 1
+
+    return slots
+
+def planned_slots(conn, slot_keys):
+    """Which of ``slot_keys`` already have a plan."""
+    slot_keys = list(slot_keys)
+    if not slot_keys:
+        return set()
+    placeholders = ", ".join("?" * len(slot_keys))
+    return {row[0] for row in conn.execute(f"""
+        SELECT DISTINCT slot FROM {DB_PLAN_TABLE} WHERE slot IN ({placeholders})
+    """, slot_keys)}
+
+def store_plan(conn, slot: str, questions_by_bucket):
+    conn.executemany(f"""
+        INSERT OR REPLACE INTO {DB_PLAN_TABLE} (slot, class, subject, position, question_id)
+        VALUES (?, ?, ?, ?, ?)
+    """, [
+        (slot, class_key, subject_key, position, question['id'])
+        for (class_key, subject_key), questions in questions_by_bucket.items()
+        for position, question in enumerate(questions)
+    ])
+
+def planned_ids(conn, slot: str):
+    """Question IDs planned for ``slot``, grouped by bucket and in planned order."""
+    return [row[0] for row in conn.execute(f"""
+        SELECT question_id FROM {DB_PLAN_TABLE}
+        WHERE slot = ?
+        ORDER BY class, subject, position
+    """, (slot,))]
+
+def reserved_ids(conn, since: str):
+    """IDs planned for slots from ``since`` on, which selection on the spot must leave alone."""
+    return {row[0] for row in conn.execute(f"""
+        SELECT question_id FROM {DB_PLAN_TABLE} WHERE slot >= ?
+    """, (since,))}
+
+def drop_planned(conn, slot: str, question_ids):
+    """Remove questions from ``slot``'s plan (posted elsewhere since it was planned, or deleted)."""
+    conn.executemany(f"""
+        DELETE FROM {DB_PLAN_TABLE} WHERE slot = ? AND question_id = ?
+    """, [(slot, question_id) for question_id in question_ids])
+
+def plan_summary(conn, since: str):
+    """``(slot, questions, buckets, chapters)`` per planned slot from ``since`` on."""
+    return conn.execute(f"""
+        SELECT p.slot, COUNT(*), COUNT(DISTINCT p.class || '/' || p.subject),
+               COUNT(DISTINCT p.class || '/' || p.subject || '/' || COALESCE(q.chapter, ''))
+        FROM {DB_PLAN_TABLE} p
+        LEFT JOIN {DB_QUESTION_TABLE} q ON q.id = p.question_id
+        WHERE p.slot >= ?
+        GROUP BY p.slot
+        ORDER BY p.slot
+    """, (since,)).fetchall()
+
+def prune(conn, cutoff: str) -> int:
+    """Delete plans for slots before ``cutoff``."""
+    return conn.execute(f"DELETE FROM {DB_PLAN_TABLE} WHERE slot < ?", (cutoff,)).rowcount
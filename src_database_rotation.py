@@ -0,0 +1,225 @@
+"""
+Persistent per-bucket rotation queues for question selection
+
+Every (class, subject, importance) bucket keeps a stored shuffled order of
+its question IDs plus a cursor. Taking the next N questions walks forward
+from the cursor, so selection is O(N) instead of sorting the whole bucket
+with ORDER BY RANDOM(). When the cursor reaches the end, the bucket is
+reshuffled for the next cycle. Shuffles are seeded from the bucket key and
+cycle number, so any sequence of picks can be replayed exactly.
+
+Queue states are plain dicts. A state loaded by ``load_queues`` also
+carries the full ``order`` array, which lets the question catalog walk the
+queue in memory; without it, entries are read from SQLite as needed.
+"""
+
+import random
+from array import array
+
+from src.config.constants import DB_QUESTION_TABLE, DB_ROTATION_TABLE, DB_ROTATION_STATE_TABLE
+
+IMPORTANCE_RANK = {"very_high": 1, "high": 2}
+
+def importance_rank(importance: str) -> int:
+    return IMPORTANCE_RANK.get(importance, 3)
+
+def _rng(class_key, subject_key, importance, cycle, salt=""):
+    return random.Random(f"{class_key}/{subject_key}/{importance}/{cycle}/{salt}")
+
+def _new_state(with_order: bool):
+    state = {"cycle": 0, "cursor": 0, "size": 0, "max_question_id": 0}
+    if with_order:
+        state["order"] = array("q")
+    return state
+
+def _load_states(conn, class_key, subject_key):
+    rows = conn.execute(f"""
+        SELECT importance, cycle, cursor, size, max_question_id
+        FROM {DB_ROTATION_STATE_TABLE}
+        WHERE class = ? AND subject = ?
+    """, (class_key, subject_key)).fetchall()
+
+    return {
+        row[0]: {"cycle": row[1], "cursor": row[2], "size": row[3], "max_question_id": row[4]}
+        for row in rows
+    }
+
+def load_queues(conn, class_key: str, subject_key: str):
+    """Load every queue of a bucket including its full order, for caching."""
+    states = _load_states(conn, class_key, subject_key)
+    for importance, state in states.items():
+        state["order"] = array("q", [row[0] for row in conn.execute(f"""
+            SELECT question_id FROM {DB_ROTATION_TABLE}
+            WHERE class = ? AND subject = ? AND importance = ?
+            ORDER BY position
+        """, (class_key, subject_key, importance))])
+    return states
+
+def _save_state(conn, class_key, subject_key, importance, state):
+    conn.execute(f"""
+        INSERT INTO {DB_ROTATION_STATE_TABLE}
+            (class, subject, importance, cycle, cursor, size, max_question_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(class, subject, importance) DO UPDATE SET
+            cycle = excluded.cycle,
+            cursor = excluded.cursor,
+            size = excluded.size,
+            max_question_id = excluded.max_question_id
+    """, (class_key, subject_key, importance, state["cycle"], state["cursor"],
+          state["size"], state["max_question_id"]))
+
+def known_max_question_id(states) -> int:
+    return max((s["max_question_id"] for s in states.values()), default=0)
+
+def _append_new_questions(conn, class_key, subject_key, states, new_rows=None):
+    """Append questions added since the last pick to the end of their queues.
+
+    ``new_rows`` are (id, importance) pairs newer than the queues know about,
+    supplied by cached callers whose queues carry an in-memory ``order``;
+    when omitted they are looked up through the (class, subject, id) index.
+    """
+    known_max = known_max_question_id(states)
+    with_order = new_rows is not None
+    if new_rows is None:
+        new_rows = conn.execute(f"""
+            SELECT id, importance FROM {DB_QUESTION_TABLE}
+            WHERE class = ? AND subject = ? AND id > ?
+            ORDER BY id
+        """, (class_key, subject_key, known_max)).fetchall()
+
+    if not new_rows:
+        return
+
+    new_max = max(row[0] for row in new_rows)
+    by_importance = {}
+    for question_id, importance in new_rows:
+        by_importance.setdefault(importance or "medium", []).append(question_id)
+
+    for importance, question_ids in by_importance.items():
+        state = states.setdefault(importance, _new_state(with_order))
+        question_ids.sort()
+        _rng(class_key, subject_key, importance, state["cycle"], known_max).shuffle(question_ids)
+        conn.executemany(f"""
+            INSERT INTO {DB_ROTATION_TABLE} (class, subject, importance, position, question_id)
+            VALUES (?, ?, ?, ?, ?)
+        """, [
+            (class_key, subject_key, importance, state["size"] + offset, question_id)
+            for offset, question_id in enumerate(question_ids)
+        ])
+        state["size"] += len(question_ids)
+        if "order" in state:
+            state["order"].extend(question_ids)
+
+    for state in states.values():
+        state["max_question_id"] = new_max
+
+def _reshuffle(conn, class_key, subject_key, importance, state):
+    state["cycle"] += 1
+    state["cursor"] = 0
+
+    question_ids = [row[0] for row in conn.execute(f"""
+        SELECT id FROM {DB_QUESTION_TABLE}
+        WHERE class = ? AND subject = ? AND importance = ? AND id <= ?
+        ORDER BY id
+    """, (class_key, subject_key, importance, state["max_question_id"]))]
+    _rng(class_key, subject_key, importance, state["cycle"]).shuffle(question_ids)
+
+    conn.execute(f"""
+        DELETE FROM {DB_ROTATION_TABLE}
+        WHERE class = ? AND subject = ? AND importance = ?
+    """, (class_key, subject_key, importance))
+    conn.executemany(f"""
+        INSERT INTO {DB_ROTATION_TABLE} (class, subject, importance, position, question_id)
+        VALUES (?, ?, ?, ?, ?)
+    """, [
+        (class_key, subject_key, importance, position, question_id)
+        for position, question_id in enumerate(question_ids)
+    ])
+    state["size"] = len(question_ids)
+    if "order" in state:
+        state["order"] = array("q", question_ids)
+
+def _fetch_entries(conn, class_key, subject_key, importance, state, count, threshold_date, is_eligible):
+    """Return (question_id, eligible) pairs starting at the cursor."""
+    start = state["cursor"]
+
+    if "order" in state:
+        return [(question_id, is_eligible(question_id)) for question_id in state["order"][start:start + count]]
+
+    rows = conn.execute(f"""
+        SELECT r.question_id, q.last_posted, q.id
+        FROM {DB_ROTATION_TABLE} r
+        LEFT JOIN {DB_QUESTION_TABLE} q ON q.id = r.question_id
+        WHERE r.class = ? AND r.subject = ? AND r.importance = ? AND r.position >= ?
+        ORDER BY r.position
+        LIMIT ?
+    """, (class_key, subject_key, importance, start, count)).fetchall()
+
+    return [
+        (question_id, exists is not None and (last_posted is None or last_posted <= threshold_date))
+        for question_id, last_posted, exists in rows
+    ]
+
+def _take_from_queue(conn, class_key, subject_key, importance, state, limit, threshold_date, taken, is_eligible):
+    picked = []
+    scanned = 0
+
+    # Never look at more entries than one full cycle, so a bucket whose
+    # questions are all inside the repost window cannot loop forever.
+    while len(picked) < limit and scanned < state["size"]:
+        if state["cursor"] >= state["size"]:
+            _reshuffle(conn, class_key, subject_key, importance, state)
+            if not state["size"]:
+                break
+
+        entries = _fetch_entries(
+            conn, class_key, subject_key, importance, state,
+            (limit - len(picked)) * 2, threshold_date, is_eligible
+        )
+
+        if not entries:
+            state["cursor"] = state["size"]
+            continue
+
+        for question_id, eligible in entries:
+            state["cursor"] += 1
+            scanned += 1
+
+            if eligible and question_id not in taken:
+                picked.append(question_id)
+                taken.add(question_id)
+                if len(picked) >= limit:
+                    break
+
+    return picked
+
+def take_questions(conn, class_key: str, subject_key: str, limit: int, threshold_date: str,
+                   states=None, new_rows=None, is_eligible=None, exclude=None):
+    """Advance the bucket's queues and return up to ``limit`` question IDs.
+
+    Queues are drained in importance order (very_high, high, then the rest),
+    skipping anything posted after ``threshold_date``. Must run inside a
+    write transaction. Cached callers pass the bucket's ``states`` from
+    ``load_queues``, any ``new_rows`` they know about and an ``is_eligible``
+    callback, so the walk touches SQLite only to persist the cursors.
+    IDs in ``exclude`` (reserved by a post plan) are skipped like
+    questions inside the repost window.
+    """
+    if states is None:
+        states = _load_states(conn, class_key, subject_key)
+    _append_new_questions(conn, class_key, subject_key, states, new_rows)
+
+    picked = []
+    taken = set(exclude or ())
+    for importance in sorted(states, key=lambda imp: (importance_rank(imp), imp)):
+        if len(picked) >= limit:
+            break
+        picked.extend(_take_from_queue(
+            conn, class_key, subject_key, importance, states[importance],
+            limit - len(picked), threshold_date, taken, is_eligible
+        ))
+
+    for importance, state in states.items():
+        _save_state(conn, class_key, subject_key, importance, state)
+
+    return picked
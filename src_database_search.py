@@ -0,0 +1,102 @@
+"""
+Full-text question search over an SQLite FTS5 index
+
+The index uses the unicode61 tokenizer with combining marks (``M*``)
+counted as token characters. By default unicode61 treats Bengali vowel
+signs and hasanta as separators, which splits every word into fragments.
+Each search term becomes a prefix query, so ``নিউটন`` finds ``নিউটনের`` and
+``bond`` finds ``bonding``. Matches are ranked by importance first and by
+BM25 relevance within an importance, with chapter hits weighted above
+question text.
+
+The tokenizer compares code points, so Bengali typed in NFD would never
+match an NFC query. Question text and chapters are stored in NFC
+(``normalize_text``) and queries are normalized the same way.
+"""
+
+import unicodedata
+
+from src.config.constants import DB_QUESTION_TABLE, DB_SEARCH_TABLE
+
+SEARCH_TOKENIZER = "unicode61 remove_diacritics 2 categories 'L* N* Co M*'"
+
+# bm25() column weights: question text, chapter
+QUESTION_WEIGHT = 1.0
+CHAPTER_WEIGHT = 2.0
+
+MAX_TERMS = 8
+
+IMPORTANCE_ORDER = "CASE q.importance WHEN 'very_high' THEN 1 WHEN 'high' THEN 2 ELSE 3 END"
+
+def normalize_text(text: str) -> str:
+    """The form question text and chapters are stored, indexed and queried in."""
+    return unicodedata.normalize("NFC", text or "")
+
+def query_terms(text: str):
+    """Split ``text`` into terms exactly where the index tokenizer would."""
+    terms = []
+    current = []
+    for char in normalize_text(text):
+        category = unicodedata.category(char)
+        if category[0] in "LNM" or category == "Co":
+            current.append(char)
+        elif current:
+            terms.append("".join(current))
+            current = []
+    if current:
+        terms.append("".join(current))
+    return terms[:MAX_TERMS]
+
+def match_query(text: str):
+    """FTS5 MATCH expression requiring every term as a prefix, or None."""
+    terms = query_terms(text)
+    if not terms:
+        return None
+    # Terms hold only token characters, so quoting them cannot inject syntax
+    return " ".join(f'"{term}"*' for term in terms)
+
+def has_index(conn) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (DB_SEARCH_TABLE,)
+    ).fetchone() is not None
+
+def search(conn, text: str, limit: int = 20, offset: int = 0):
+    """Questions matching every term of ``text``, most important and most relevant first."""
+    terms = query_terms(text)
+    if not terms:
+        return []
+
+    if has_index(conn):
+        rows = conn.execute(f"""
+            SELECT q.id, q.class, q.subject, q.question, q.importance, q.marks, q.chapter
+            FROM {DB_SEARCH_TABLE} f
+            JOIN {DB_QUESTION_TABLE} q ON q.id = f.rowid
+            WHERE {DB_SEARCH_TABLE} MATCH ?
+            ORDER BY {IMPORTANCE_ORDER}, bm25({DB_SEARCH_TABLE}, {QUESTION_WEIGHT}, {CHAPTER_WEIGHT})
+            LIMIT ? OFFSET ?
+        """, (match_query(text), limit, offset)).fetchall()
+    else:
+        conditions = " AND ".join(
+            "(q.question LIKE ? ESCAPE '\\' OR q.chapter LIKE ? ESCAPE '\\')" for _ in terms
+        )
+        params = []
+        for term in terms:
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            params.extend([pattern, pattern])
+        rows = conn.execute(f"""
+            SELECT q.id, q.class, q.subject, q.question, q.importance, q.marks, q.chapter
+            FROM {DB_QUESTION_TABLE} q
+            WHERE {conditions}
+            ORDER BY {IMPORTANCE_ORDER}, q.id
+            LIMIT ? OFFSET ?
+        """, params + [limit, offset]).fetchall()
+
+    return [{
+        'id': row[0],
+        'class': row[1],
+        'subject': row[2],
+        'question': row[3],
+        'importance': row[4],
+        'marks': row[5],
+        'chapter': row[6]
+    } for row in rows]
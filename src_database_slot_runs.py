@@ -0,0 +1,83 @@
+"""
+Run log for scheduled jobs
+
+Each run of a scheduled job stores the time it was scheduled for and the
+times it actually started and finished, so late or slow slots show up.
+The log outlives restarts. On startup the scheduler compares it with the
+schedule to find slots that fell into downtime, and records any it
+decides not to run as ``'skipped'``.
+
+Times are local and naive, in ``'%Y-%m-%d %H:%M:%S'`` format, so they
+sort as text.
+"""
+
+from datetime import datetime
+
+from src.config.constants import DB_SLOT_RUNS_TABLE
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def format_time(value: datetime) -> str:
+    return value.strftime(TIME_FORMAT)
+
+def start_run(conn, job_id: str, slot: str, scheduled_at: datetime, started_at: datetime,
+              catch_up: bool = False) -> int:
+    return conn.execute(f"""
+        INSERT INTO {DB_SLOT_RUNS_TABLE} (job_id, slot, scheduled_at, started_at, status, catch_up)
+        VALUES (?, ?, ?, ?, 'running', ?)
+    """, (job_id, slot, format_time(scheduled_at), format_time(started_at), int(catch_up))).lastrowid
+
+def finish_run(conn, run_id: int, status: str, finished_at: datetime, error: str = None):
+    conn.execute(f"""
+        UPDATE {DB_SLOT_RUNS_TABLE}
+        SET status = ?, finished_at = ?, error = ?
+        WHERE id = ?
+    """, (status, format_time(finished_at), error, run_id))
+
+def record_skipped(conn, job_id: str, slot: str, scheduled_at: datetime, reason: str):
+    conn.execute(f"""
+        INSERT INTO {DB_SLOT_RUNS_TABLE} (job_id, slot, scheduled_at, status, error)
+        VALUES (?, ?, ?, 'skipped', ?)
+    """, (job_id, slot, format_time(scheduled_at), reason))
+
+def last_scheduled(conn):
+    """The latest scheduled time of any logged run, or None for an empty log."""
+    row = conn.execute(f"SELECT MAX(scheduled_at) FROM {DB_SLOT_RUNS_TABLE}").fetchone()
+    return datetime.strptime(row[0], TIME_FORMAT) if row and row[0] else None
+
+def logged_times(conn, job_id: str, since: datetime):
+    """Scheduled times of ``job_id`` at or after ``since`` that already have a log row."""
+    return {
+        datetime.strptime(row[0], TIME_FORMAT)
+        for row in conn.execute(f"""
+            SELECT scheduled_at FROM {DB_SLOT_RUNS_TABLE}
+            WHERE job_id = ? AND scheduled_at >= ?
+        """, (job_id, format_time(since)))
+    }
+
+def recent_runs(conn, limit: int = 20):
+    return [
+        {
+            'job_id': row[0],
+            'slot': row[1],
+            'scheduled_at': row[2],
+            'started_at': row[3],
+            'finished_at': row[4],
+            'status': row[5],
+            'catch_up': bool(row[6]),
+            'error': row[7],
+        }
+        for row in conn.execute(f"""
+            SELECT job_id, slot, scheduled_at, started_at, finished_at, status, catch_up, error
+            FROM {DB_SLOT_RUNS_TABLE}
+            ORDER BY scheduled_at DESC, id DESC
+            LIMIT ?
+        """, (limit,))
+    ]
+
+def prune(conn, cutoff: str) -> int:
+    """Delete log rows for runs scheduled before ``cutoff``, keeping unfinished ones."""
+    return conn.execute(f"""
+        DELETE FROM {DB_SLOT_RUNS_TABLE}
+        WHERE status != 'running' AND scheduled_at < ?
+    """, (cutoff,)).rowcount
@@ -0,0 +1,179 @@
+"""
+Weighted question selection over the catalog's per-bucket arrays
+
+Every question gets a sampling weight ``exp(sum(weight_i * score_i))``.
+Each score is in [0, 1]:
+- importance: very_high 1 down to low 0;
+- marks: relative to the bucket's highest marks;
+- recency: days since last posted, saturating at ``recency_days``
+  (never posted counts as 1);
+- chapter under-exposure: 1 minus the share of the chapter's questions
+  posted within ``recency_days``.
+
+Questions inside the repost window get weight 0.
+
+Weights are computed for a whole bucket at once, vectorized with NumPy
+when it is installed and in plain Python otherwise. The cumulative sum is
+cached on the bucket entry until a post or a new day changes it. A pick
+is then a handful of binary searches over that sum: draws with
+replacement are repeated until ``limit`` distinct questions come up, which
+is exactly weighted sampling without replacement. When eligible questions
+are scarce, exact Gumbel top-k over the eligible ones is used instead.
+"""
+
+import itertools
+import math
+import random
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+IMPORTANCE_SCORES = {"very_high": 1.0, "high": 2 / 3, "medium": 1 / 3, "low": 0.0}
+DEFAULT_IMPORTANCE_SCORE = 1 / 3
+
+# Rejection draws per pick before switching to exact Gumbel top-k
+MAX_DRAW_ROUNDS = 4
+
+_np_rng = np.random.default_rng() if np is not None else None
+
+class BucketWeights:
+    __slots__ = ("key", "cumulative", "total", "eligible")
+
+    def __init__(self, key, cumulative, total, eligible):
+        self.key = key
+        self.cumulative = cumulative
+        self.total = total
+        self.eligible = eligible
+
+def _view(values):
+    """Zero-copy NumPy view of an ``array.array``."""
+    if not len(values):
+        return np.zeros(0, dtype=values.typecode)
+    return np.frombuffer(values, dtype=values.typecode)
+
+def _compute_numpy(entry, today: int, threshold: int, recency_days: int, weights: dict):
+    importance_lookup = np.array([
+        IMPORTANCE_SCORES.get(name, DEFAULT_IMPORTANCE_SCORE) for name in entry.importance_names
+    ])
+    last_posted = _view(entry.last_posted)
+    chapters = _view(entry.chapters)
+    marks = _view(entry.marks).astype(np.float64)
+
+    score = weights["importance"] * importance_lookup[_view(entry.importance)]
+    top_marks = marks.max() if len(marks) else 0
+    if top_marks > 0:
+        score += weights["marks"] * (marks / top_marks)
+
+    days = np.where(last_posted > 0, today - last_posted, recency_days)
+    score += weights["recency"] * np.minimum(days, recency_days) / recency_days
+
+    chapter_sizes = np.bincount(chapters, minlength=len(entry.chapter_names))
+    recent = np.bincount(chapters, weights=(last_posted > today - recency_days), minlength=len(entry.chapter_names))
+    exposure = recent / np.maximum(chapter_sizes, 1)
+    score += weights["chapter"] * (1.0 - exposure[chapters])
+
+    eligible = last_posted <= threshold
+    cumulative = np.cumsum(np.where(eligible, np.exp(score), 0.0))
+    return cumulative, int(eligible.sum())
+
+def _compute_python(entry, today: int, threshold: int, recency_days: int, weights: dict):
+    importance_lookup = [IMPORTANCE_SCORES.get(name, DEFAULT_IMPORTANCE_SCORE) for name in entry.importance_names]
+    top_marks = max(entry.marks, default=0)
+
+    chapter_sizes = [0] * len(entry.chapter_names)
+    recent = [0] * len(entry.chapter_names)
+    for chapter, last_posted in zip(entry.chapters, entry.last_posted):
+        chapter_sizes[chapter] += 1
+        recent[chapter] += last_posted > today - recency_days
+    under_exposure = [1.0 - count / max(size, 1) for count, size in zip(recent, chapter_sizes)]
+
+    raw = []
+    eligible = 0
+    for importance, marks, last_posted, chapter in zip(entry.importance, entry.marks, entry.last_posted, entry.chapters):
+        if last_posted > threshold:
+            raw.append(0.0)
+            continue
+        days = today - last_posted if last_posted > 0 else recency_days
+        score = (
+            weights["importance"] * importance_lookup[importance]
+            + (weights["marks"] * marks / top_marks if top_marks > 0 else 0.0)
+            + weights["recency"] * min(days, recency_days) / recency_days
+            + weights["chapter"] * under_exposure[chapter]
+        )
+        raw.append(math.exp(score))
+        eligible += 1
+    return list(itertools.accumulate(raw)), eligible
+
+def bucket_weights(entry, today: int, threshold: int, recency_days: int, weights: dict) -> BucketWeights:
+    """The entry's cached cumulative weights, rebuilt when the day, window or weights changed."""
+    key = (today, threshold, recency_days, tuple(sorted(weights.items())))
+    cached = entry.weights
+    if cached is not None and cached.key == key:
+        return cached
+
+    recency_days = max(1, recency_days)
+    compute = _compute_numpy if np is not None else _compute_python
+    cumulative, eligible = compute(entry, today, threshold, recency_days, weights)
+    total = float(cumulative[-1]) if len(cumulative) else 0.0
+    entry.weights = BucketWeights(key, cumulative, total, eligible)
+    return entry.weights
+
+def _draw(cumulative, total: float, count: int):
+    if np is not None:
+        return np.searchsorted(cumulative, _np_rng.random(count) * total, side="right").tolist()
+    return [bisect_right(cumulative, random.random() * total) for _ in range(count)]
+
+def _gumbel_top_k(cumulative, limit: int):
+    """Exact weighted sampling without replacement: the ``limit`` largest ``log(w) + Gumbel`` keys."""
+    if np is not None:
+        weights = np.diff(cumulative, prepend=0.0)
+        candidates = np.flatnonzero(weights > 0)
+        keys = np.log(weights[candidates]) + _np_rng.gumbel(size=len(candidates))
+        if len(keys) > limit:
+            top = np.argpartition(-keys, limit - 1)[:limit]
+        else:
+            top = np.arange(len(keys))
+        return candidates[top[np.argsort(-keys[top])]].tolist()
+
+    keys = []
+    previous = 0.0
+    for index, running in enumerate(cumulative):
+        weight = running - previous
+        previous = running
+        if weight > 0:
+            keys.append((math.log(weight) - math.log(-math.log(random.random() or 1e-300)), index))
+    keys.sort(reverse=True)
+    return [index for _, index in keys[:limit]]
+
+def select(entry, limit: int, today: int, threshold: int, recency_days: int, weights: dict, exclude=None):
+    """Up to ``limit`` question IDs from the bucket, drawn by weight without replacement.
+
+    IDs in ``exclude`` (reserved by a post plan) are never returned.
+    """
+    table = bucket_weights(entry, today, threshold, recency_days, weights)
+    if not table.eligible or table.total <= 0 or limit <= 0:
+        return []
+
+    exclude = set(exclude or ())
+    excluded = sum(1 for question_id in exclude if entry.position(question_id) >= 0)
+
+    limit = min(limit, table.eligible)
+    picked = []
+    seen = set()
+    if (limit + excluded) * 4 <= table.eligible:
+        for _ in range(MAX_DRAW_ROUNDS):
+            for index in _draw(table.cumulative, table.total, (limit - len(picked)) * 2):
+                if index < len(entry.ids) and index not in seen:
+                    seen.add(index)
+                    if entry.ids[index] in exclude:
+                        continue
+                    picked.append(index)
+                    if len(picked) == limit:
+                        return [entry.ids[i] for i in picked]
+
+    # Few eligible questions, or the weight is concentrated on a few
+    indexes = _gumbel_top_k(table.cumulative, limit + excluded)
+    return [entry.ids[i] for i in indexes if entry.ids[i] not in exclude][:limit]
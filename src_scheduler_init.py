@@ -1,3 +1,14 @@
-from .post_scheduler import PostScheduler
+import importlib
 
-__all__ = ['PostScheduler']
\ No newline at end of file
+# PostScheduler (and APScheduler with it) is imported on first use, so
+# one-shot runs can use src.scheduler.slots without it
+_EXPORTS = {
+    'PostScheduler': '.post_scheduler',
+}
+
+__all__ = ['PostScheduler']
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,11 +1,13 @@
 import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
-from src.config import Config
+from src.config import get_config, reload_config
+from src.scheduler import slots
 
 logger = logging.getLogger(__name__)
 
@@ -13,36 +15,293 @@ class PostScheduler:
     def __init__(self, bot, db_manager, schedule_times: List[str] = None):
         self.bot = bot
         self.db_manager = db_manager
-        self.config = Config()
-        self.schedule_times = schedule_times or self.config.POST_SCHEDULE
-        self.scheduler = AsyncIOScheduler()
+        # An explicit schedule pins the slots; otherwise they follow POST_SCHEDULE across reloads
+        self._schedule_times = list(schedule_times) if schedule_times else None
+        # Jobs are rebuilt from the config on every start; what must survive a
+        # restart is the run log in the database, used to catch up missed slots
+        self.scheduler = AsyncIOScheduler(job_defaults={
+            'misfire_grace_time': self.config.SCHEDULER_MISFIRE_GRACE_SECONDS,
+            'coalesce': self.config.SCHEDULER_COALESCE,
+            'max_instances': 1
+        })
+        # Scheduled and catch-up posts share the sender, so they never overlap
+        self.post_lock = asyncio.Lock()
+        # Post and prepare job IDs added by the last register_jobs, so a
+        # reload removes exactly the slots that left the schedule
+        self._slot_job_ids = set()
         self.is_running = False
         
         logger.info(f"⏰ Scheduler initialized with {len(self.schedule_times)} time slots")
     
+    @property
+    def config(self):
+        return get_config()
+    
+    @property
+    def schedule_times(self) -> List[str]:
+        return self._schedule_times or list(self.config.POST_SCHEDULE)
+    
     def convert_to_utc(self, bd_time: str) -> str:
+        return slots.convert_to_utc(bd_time)
+    
+    def slot_key(self, bd_time: str, fire_time: datetime) -> str:
+        return slots.slot_key(bd_time, fire_time)
+    
+    async def prepare_job(self, bd_time: str):
         try:
-            bd_hour, bd_minute = map(int, bd_time.split(':'))
-            utc_hour = (bd_hour - 6) % 24
-            return f"{utc_hour:02d}:{bd_minute:02d}"
+            post_job = self.scheduler.get_job(self.post_job_id(bd_time))
+            if post_job and post_job.next_run_time:
+                slot_time = post_job.next_run_time.astimezone().replace(tzinfo=None)
+            else:
+                slot_time = datetime.now()
+            
+            slot = self.slot_key(bd_time, slot_time)
+            if await self.bot.prepare_post(slot, slot_time):
+                logger.info(f"🧾 Prepared post for slot {slot}")
+                
         except Exception as e:
-            logger.error(f"❌ Time conversion error: {str(e)}")
-            return bd_time
+            logger.error(f"❌ Error in prepare job: {str(e)}")
+    
+    def post_job_id(self, bd_time: str) -> str:
+        return slots.post_job_id(bd_time)
     
-    async def scheduled_post_job(self):
-        current_time = datetime.now().strftime("%H:%M")
+    @staticmethod
+    def fire_times(trigger, start: datetime, end: datetime):
+        """Fire times of ``trigger`` after ``start`` and up to ``end`` (both aware)."""
+        times = []
+        fire_time = trigger.get_next_fire_time(None, start)
+        while fire_time and fire_time <= end:
+            if fire_time > start:
+                times.append(fire_time)
+            fire_time = trigger.get_next_fire_time(fire_time, fire_time + timedelta(microseconds=1))
+        return times
+    
+    def last_fire_time(self, job_id: str, now: datetime):
+        """When ``job_id`` was last due at or before ``now`` (naive local), or None."""
+        job = self.scheduler.get_job(job_id)
+        if not job:
+            return None
+        
+        aware_now = now.astimezone()
+        lookback = timedelta(days=1, seconds=self.config.SCHEDULER_MISFIRE_GRACE_SECONDS)
+        times = self.fire_times(job.trigger, aware_now - lookback, aware_now)
+        return times[-1].astimezone().replace(tzinfo=None) if times else None
+    
+    async def scheduled_post_job(self, bd_time: str = None, scheduled_at: datetime = None, catch_up: bool = False):
+        now = datetime.now()
+        current_time = now.strftime("%H:%M")
         logger.info(f"⏰ Running scheduled job at {current_time}")
         
+        bd_time = bd_time or current_time
+        job_id = self.post_job_id(bd_time)
+        # A late start (misfire grace, catch-up) still posts the slot it was due for
+        scheduled_at = scheduled_at or self.last_fire_time(job_id, now) or now
+        slot = self.slot_key(bd_time, scheduled_at)
+        
+        async with self.post_lock:
+            run_id = await self.db_manager.start_slot_run(job_id, slot, scheduled_at, catch_up)
+            status, error = 'failed', None
+            
+            try:
+                late = (datetime.now() - scheduled_at).total_seconds()
+                if late > 60:
+                    logger.warning(f"⏱️ Slot {slot} started {late / 60:.0f} min late")
+                
+                success = await self.bot.post_daily_content(slot, slot_time=scheduled_at)
+                
+                if success:
+                    status = 'ok'
+                    logger.info(f"✅ Job completed at {current_time}")
+                else:
+                    logger.error(f"❌ Job failed at {current_time}")
+                    
+            except Exception as e:
+                error = str(e)
+                logger.error(f"❌ Error in scheduled job: {str(e)}")
+            finally:
+                await self.db_manager.finish_slot_run(run_id, status, error)
+    
+    async def catch_up_job(self):
+        """Post slots that fell into downtime, per SCHEDULER_CATCHUP_HOURS and SCHEDULER_COALESCE."""
         try:
-            success = await self.bot.post_daily_content()
+            hours = self.config.SCHEDULER_CATCHUP_HOURS
+            if hours <= 0:
+                return 0
             
-            if success:
-                logger.info(f"✅ Job completed at {current_time}")
-            else:
-                logger.error(f"❌ Job failed at {current_time}")
+            # An empty log means a fresh install: there is no downtime to make up
+            if await self.db_manager.get_last_scheduled_run() is None:
+                return 0
+            
+            now = datetime.now().astimezone()
+            since = now - timedelta(hours=hours)
+            missed = []
+            for bd_time in self.schedule_times:
+                job = self.scheduler.get_job(self.post_job_id(bd_time))
+                if not job:
+                    continue
+                logged = await self.db_manager.get_logged_slot_times(
+                    job.id, since.replace(tzinfo=None)
+                )
+                for fire_time in self.fire_times(job.trigger, since, now):
+                    scheduled_at = fire_time.astimezone().replace(tzinfo=None)
+                    if scheduled_at not in logged:
+                        missed.append((scheduled_at, bd_time))
+            
+            if not missed:
+                return 0
+            
+            missed.sort()
+            logger.info(f"🕰️ {len(missed)} slot(s) missed while the bot was down")
+            
+            if self.config.SCHEDULER_COALESCE:
+                for scheduled_at, bd_time in missed[:-1]:
+                    await self.db_manager.skip_slot_run(
+                        self.post_job_id(bd_time), self.slot_key(bd_time, scheduled_at), scheduled_at,
+                        "coalesced into a later catch-up"
+                    )
+                missed = missed[-1:]
+            
+            for scheduled_at, bd_time in missed:
+                logger.info(f"🕰️ Catching up slot {self.slot_key(bd_time, scheduled_at)}")
+                await self.scheduled_post_job(bd_time, scheduled_at, catch_up=True)
+            
+            return len(missed)
+            
+        except Exception as e:
+            logger.error(f"❌ Error in catch-up job: {str(e)}")
+            return 0
+    
+    async def plan_job(self):
+        try:
+            days = self.config.POST_PLAN_DAYS
+            if days <= 0:
+                return
+            
+            upcoming = slots.upcoming_slots(self.schedule_times, datetime.now(), days)
+            await self.bot.plan_posts([self.slot_key(bd_time, scheduled_at) for bd_time, scheduled_at in upcoming])
+            
+        except Exception as e:
+            logger.error(f"❌ Error in plan job: {str(e)}")
+    
+    async def compaction_job(self):
+        logger.info("🧹 Running posted history compaction...")
+        
+        try:
+            compacted = await self.db_manager.compact_history()
+            logger.info(f"✅ History compaction finished ({compacted} rows rolled up)")
+            
+        except Exception as e:
+            logger.error(f"❌ Error in compaction job: {str(e)}")
+    
+    async def outbox_job(self):
+        try:
+            delivered = await self.bot.drain_outbox()
+            if delivered:
+                logger.info(f"📮 Outbox drain delivered {delivered} pending post(s)")
                 
         except Exception as e:
-            logger.error(f"❌ Error in scheduled job: {str(e)}")
+            logger.error(f"❌ Error in outbox job: {str(e)}")
+    
+    async def config_job(self):
+        """Reload CONFIG_FILE when it changed and re-register jobs for the new settings."""
+        try:
+            # Swap between posts, so a post never mixes old and new settings
+            async with self.post_lock:
+                config = reload_config()
+                if config is None:
+                    return
+                
+                self.bot.apply_config()
+                self.register_jobs()
+            
+            logger.info(f"🔄 Schedule now {', '.join(self.schedule_times)}")
+            
+        except Exception as e:
+            logger.error(f"❌ Error in config reload job: {str(e)}")
+    
+    def register_jobs(self):
+        """Add or replace every job the current config asks for and drop the rest.
+        
+        Runs on start and after each config reload. Slots removed from the
+        schedule lose their post and prepare jobs; the planner runs right
+        away so new slots get a plan.
+        """
+        config = self.config
+        schedule_times = self.schedule_times
+        wanted = set()
+        
+        for bd_time in schedule_times:
+            utc_time = self.convert_to_utc(bd_time)
+            hour, minute = map(int, utc_time.split(':'))
+            
+            job_id = self.post_job_id(bd_time)
+            self.scheduler.add_job(
+                self.scheduled_post_job,
+                trigger=CronTrigger(hour=hour, minute=minute),
+                args=[bd_time],
+                id=job_id,
+                name=f"Daily post at {bd_time}",
+                replace_existing=True
+            )
+            wanted.add(job_id)
+            
+            logger.info(f"✅ Scheduled post at {bd_time}")
+            
+            ahead = config.PREPARE_MINUTES_AHEAD
+            if ahead > 0:
+                prepare_at = (hour * 60 + minute - ahead) % (24 * 60)
+                job_id = f"prepare_{bd_time.replace(':', '')}"
+                self.scheduler.add_job(
+                    self.prepare_job,
+                    trigger=CronTrigger(hour=prepare_at // 60, minute=prepare_at % 60),
+                    args=[bd_time],
+                    id=job_id,
+                    name=f"Prepare post for {bd_time}",
+                    replace_existing=True
+                )
+                wanted.add(job_id)
+        
+        utc_time = self.convert_to_utc(config.HISTORY_COMPACTION_TIME)
+        hour, minute = map(int, utc_time.split(':'))
+        self.scheduler.add_job(
+            self.compaction_job,
+            trigger=CronTrigger(hour=hour, minute=minute),
+            id="history_compaction",
+            name=f"History compaction at {config.HISTORY_COMPACTION_TIME}",
+            replace_existing=True
+        )
+        
+        if config.POST_PLAN_DAYS > 0:
+            utc_time = self.convert_to_utc(config.POST_PLAN_TIME)
+            hour, minute = map(int, utc_time.split(':'))
+            self.scheduler.add_job(
+                self.plan_job,
+                trigger=CronTrigger(hour=hour, minute=minute),
+                id="post_plan",
+                name=f"Post planning at {config.POST_PLAN_TIME}",
+                next_run_time=datetime.now(),
+                replace_existing=True
+            )
+        elif self.scheduler.get_job("post_plan"):
+            self.scheduler.remove_job("post_plan")
+            logger.info("🗑️ Removed job Post planning")
+        
+        self.scheduler.add_job(
+            self.outbox_job,
+            trigger=IntervalTrigger(seconds=config.OUTBOX_DRAIN_INTERVAL),
+            id="outbox_drain",
+            name="Outbox drain",
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True
+        )
+        
+        for job_id in self._slot_job_ids - wanted:
+            job = self.scheduler.get_job(job_id)
+            if job:
+                job.remove()
+                logger.info(f"🗑️ Removed job {job.name}")
+        self._slot_job_ids = wanted
     
     async def start(self):
         try:
@@ -51,23 +310,30 @@ class PostScheduler:
             
             logger.info("🚀 Starting post scheduler...")
             
-            for bd_time in self.schedule_times:
-                utc_time = self.convert_to_utc(bd_time)
-                hour, minute = map(int, utc_time.split(':'))
-                
+            self.register_jobs()
+            
+            if self.config.CONFIG_FILE and self.config.CONFIG_RELOAD_SECONDS > 0:
                 self.scheduler.add_job(
-                    self.scheduled_post_job,
-                    trigger=CronTrigger(hour=hour, minute=minute),
-                    id=f"post_{bd_time.replace(':', '')}",
-                    name=f"Daily post at {bd_time}",
+                    self.config_job,
+                    trigger=IntervalTrigger(seconds=self.config.CONFIG_RELOAD_SECONDS),
+                    id="config_reload",
+                    name="Config reload",
+                    max_instances=1,
+                    coalesce=True,
                     replace_existing=True
                 )
-                
-                logger.info(f"✅ Scheduled post at {bd_time}")
             
             self.scheduler.start()
             self.is_running = True
             
+            # Runs once, right away, without holding up startup
+            self.scheduler.add_job(
+                self.catch_up_job,
+                id="catch_up",
+                name="Missed-slot catch-up",
+                replace_existing=True
+            )
+            
             logger.info(f"✅ Scheduler started")
             
         except Exception as e:
@@ -85,7 +351,9 @@ class PostScheduler:
     def get_next_run(self) -> str:
         try:
             if self.scheduler.running:
-                next_run = self.scheduler.get_jobs()[0].next_run_time
+                post_ids = {self.post_job_id(bd_time) for bd_time in self.schedule_times}
+                post_jobs = [job for job in self.scheduler.get_jobs() if job.id in post_ids]
+                next_run = min(job.next_run_time for job in post_jobs)
                 if next_run:
                     bd_time = (next_run.hour + 6) % 24
                     return f"{bd_time:02d}:{next_run.minute:02d}"
@@ -0,0 +1,61 @@
+"""
+Schedule slot arithmetic shared by the scheduler and one-shot runs
+
+Schedule times are Bangladesh time (UTC+6). Jobs fire at the equivalent
+UTC time of day, and a slot is named by the date it fired plus its
+Bangladesh time, e.g. ``"2024-05-01 08:00"``. This module does not
+import APScheduler, so ``main.py --once`` can name the slot it posts
+without loading the scheduler.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+BD_UTC_OFFSET_HOURS = 6
+
+def convert_to_utc(bd_time: str) -> str:
+    try:
+        bd_hour, bd_minute = map(int, bd_time.split(':'))
+        utc_hour = (bd_hour - BD_UTC_OFFSET_HOURS) % 24
+        return f"{utc_hour:02d}:{bd_minute:02d}"
+    except Exception as e:
+        logger.error(f"❌ Time conversion error: {str(e)}")
+        return bd_time
+
+def slot_key(bd_time: str, fire_time: datetime) -> str:
+    # The slot names the outbox post, so a rerun resumes rather than re-renders
+    return f"{fire_time.strftime('%Y-%m-%d')} {bd_time}"
+
+def post_job_id(bd_time: str) -> str:
+    return f"post_{bd_time.replace(':', '')}"
+
+def last_due(bd_time: str, now: datetime) -> datetime:
+    """When the daily slot ``bd_time`` last fired at or before ``now`` (naive local, like the cron jobs)."""
+    hour, minute = map(int, convert_to_utc(bd_time).split(':'))
+    scheduled_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if scheduled_at > now:
+        scheduled_at -= timedelta(days=1)
+    return scheduled_at
+
+def latest_slot(schedule_times, now: datetime):
+    """``(bd_time, scheduled_at)`` of the most recent slot due at or before ``now``."""
+    return max(
+        ((bd_time, last_due(bd_time, now)) for bd_time in schedule_times),
+        key=lambda slot: slot[1],
+        default=None
+    )
+
+def upcoming_slots(schedule_times, start: datetime, days: float):
+    """``(bd_time, scheduled_at)`` of every slot due from ``start`` until ``days`` later, in time order."""
+    end = start + timedelta(days=days)
+    upcoming = []
+    for bd_time in schedule_times:
+        scheduled_at = last_due(bd_time, start)
+        if scheduled_at < start:
+            scheduled_at += timedelta(days=1)
+        while scheduled_at < end:
+            upcoming.append((bd_time, scheduled_at))
+            scheduled_at += timedelta(days=1)
+    return sorted(upcoming, key=lambda slot: slot[1])
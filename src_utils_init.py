@@ -1,9 +1,11 @@
 from .logger import setup_logger
 from .formatter import format_post_content
+from .renderer import PostRenderer
 from .validator import validate_post_content
 
 __all__ = [
     'setup_logger',
     'format_post_content',
+    'PostRenderer',
     'validate_post_content'
 ]
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Shared post renderer
+
+Class and subject headers, the separator, importance badges and the footer
+are built once and reused; posts are assembled by appending fragments to a
+list and joining it once at the end.
+"""
+
+from src.config.constants import POST_FOOTER
+
+SEPARATOR = "=" * 30 + "\n"
+CLASS_RULE = "⎯" * 14 + "\n"
+NOTES_HEADER = "📚 *Smart Study Notes* 📚\n" + "=" * 24 + "\n\n"
+
+IMPORTANCE_BADGES = {
+    "very_high": "      🔥 *১০০% পরীক্ষায় আসবে*\n",
+    "high": "      ⭐ *খুবই গুরুত্বপূর্ণ*\n",
+}
+# Study notes have only ever flagged questions that are sure to come
+NOTES_BADGES = {"very_high": IMPORTANCE_BADGES["very_high"]}
+
+class PostRenderer:
+    def __init__(self, config=None):
+        # Without a config, class and subject keys are used as display names
+        self.config = config
+        self._class_headers = {}
+        self._subject_headers = {}
+
+        if config:
+            for class_key, subjects in config.SUBJECTS.items():
+                self.class_header(class_key)
+                for subject_key in subjects:
+                    self.subject_header(subject_key)
+
+    def class_header(self, class_key: str) -> str:
+        fragment = self._class_headers.get(class_key)
+        if fragment is None:
+            class_name = self.config.get_class_name(class_key) if self.config else class_key
+            fragment = f"🎓 *{class_name.upper()}*\n{CLASS_RULE}"
+            self._class_headers[class_key] = fragment
+        return fragment
+
+    def subject_header(self, subject_key: str) -> str:
+        fragment = self._subject_headers.get(subject_key)
+        if fragment is None:
+            subject_name = self.config.get_subject_name(subject_key, "bn") if self.config else subject_key
+            fragment = f"📖 *{subject_name}:*\n"
+            self._subject_headers[subject_key] = fragment
+        return fragment
+
+    def render_classes(self, parts: list, classes, badges=IMPORTANCE_BADGES, class_gap: str = "\n"):
+        """Append the body for ``classes`` to ``parts``.
+
+        ``classes`` is an iterable of ``(class_key, subjects)`` where each
+        subject is ``(subject_key, questions, suggestion)``. Subjects without
+        questions are skipped. ``badges`` maps importance to its badge line
+        and ``class_gap`` follows each class.
+        """
+        append = parts.append
+
+        for class_key, subjects in classes:
+            append(self.class_header(class_key))
+
+            for subject_key, questions, suggestion in subjects:
+                if not questions:
+                    continue
+
+                append(self.subject_header(subject_key))
+
+                for idx, question in enumerate(questions, 1):
+                    append(f"   {idx}. {question.get('question', '')}\n")
+
+                    chapter = question.get('chapter')
+                    if chapter:
+                        append(f"      📚 অধ্যায়: {chapter}\n")
+                    if question.get('marks'):
+                        append(f"      📝 নম্বর: {question['marks']}\n")
+
+                    badge = badges.get(question.get('importance'))
+                    if badge:
+                        append(badge)
+
+                if suggestion:
+                    append(f"      💡 *পরামর্শ:* {suggestion}\n")
+
+                append("\n")
+
+            if class_gap:
+                append(class_gap)
+
+    def render_daily_post(self, greeting: str, now, classes) -> str:
+        parts = [
+            greeting,
+            f"📅 *তারিখ:* {now.strftime('%d %B, %Y')}\n",
+            f"⏰ *সময়:* {now.strftime('%I:%M %p')}\n",
+            SEPARATOR,
+            "\n",
+        ]
+        self.render_classes(parts, classes)
+        parts.append(POST_FOOTER)
+        return "".join(parts)
+
+    def render_notes(self, classes, now) -> str:
+        parts = [NOTES_HEADER]
+        self.render_classes(parts, classes, badges=NOTES_BADGES, class_gap="")
+        parts.append(f"\n⏰ *পোস্টের সময়:* {now.strftime('%d %B, %Y %I:%M %p')}\n")
+        return "".join(parts)
@@ -0,0 +1,160 @@
+"""
+Markdown-aware message splitter
+
+Telegram measures message length in UTF-16 code units and rejects a
+Markdown message whose entities are left open. ``split_message`` cuts a
+post into chunks in a single pass: it prefers class boundaries, then
+subject boundaries, then line breaks, and closes any open ``*``, ``_``,
+`` ` `` or ``` span at the end of a chunk and reopens it at the start of
+the next one.
+"""
+
+from src.config.constants import TELEGRAM_MAX_MESSAGE_LENGTH
+
+CLASS_MARKER = "🎓"
+SUBJECT_MARKER = "📖"
+
+# Room kept free in every chunk for a closing plus a reopening marker
+MARKER_RESERVE = 6
+
+BREAK_INSIDE_LINE = 0
+BREAK_LINE = 1
+BREAK_SUBJECT = 2
+BREAK_CLASS = 3
+
+def utf16_len(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+def _scan_entities(text: str, state):
+    """Return the open Markdown entity (or None) after ``text``, given ``state`` before it."""
+    i = 0
+    n = len(text)
+    while i < n:
+        char = text[i]
+        if state is None:
+            if char == "\\":
+                i += 2
+                continue
+            if char == "`" and text.startswith("```", i):
+                state = "```"
+                i += 3
+                continue
+            if char in "*_`":
+                state = char
+        elif state == "```":
+            if text.startswith("```", i):
+                state = None
+                i += 3
+                continue
+        elif char == state:
+            state = None
+        i += 1
+    return state
+
+def _hard_split(line: str, budget: int):
+    """Split an over-long line into pieces of at most ``budget`` UTF-16 units, at spaces when possible."""
+    pieces = []
+    start = 0
+    size = 0
+    last_space = -1
+
+    for i, char in enumerate(line):
+        width = 2 if ord(char) > 0xFFFF else 1
+        if size + width > budget:
+            cut = last_space + 1 if last_space >= start else i
+            pieces.append(line[start:cut])
+            size = utf16_len(line[cut:i])
+            start = cut
+            last_space = -1
+        if char == " ":
+            last_space = i
+        size += width
+
+    pieces.append(line[start:])
+    return pieces
+
+def _segments(text: str, budget: int):
+    """Yield (text, utf16 length, break kind before it, entity state before, state after)."""
+    state = None
+    for line in text.splitlines(keepends=True):
+        if line.startswith(CLASS_MARKER):
+            kind = BREAK_CLASS
+        elif line.startswith(SUBJECT_MARKER):
+            kind = BREAK_SUBJECT
+        else:
+            kind = BREAK_LINE
+
+        length = utf16_len(line)
+        pieces = [line] if length <= budget else _hard_split(line, budget)
+
+        for piece in pieces:
+            after = _scan_entities(piece, state)
+            yield piece, utf16_len(piece) if len(pieces) > 1 else length, kind, state, after
+            state = after
+            kind = BREAK_INSIDE_LINE
+
+def split_message(text: str, limit: int = TELEGRAM_MAX_MESSAGE_LENGTH, continuation: str = ""):
+    """Split ``text`` into Markdown-safe chunks of at most ``limit`` UTF-16 units.
+
+    ``continuation`` is prepended to every chunk after the first and is
+    counted against the limit.
+    """
+    budget = limit - utf16_len(continuation) - MARKER_RESERVE
+    if budget <= 0:
+        raise ValueError("limit too small for continuation prefix")
+
+    segments = list(_segments(text, budget))
+    chunks = []
+    start = 0
+    size = 0
+    # Latest usable cut of each kind in the current chunk: kind -> (index, size before)
+    cuts = {}
+
+    def emit(end):
+        body = "".join(segment[0] for segment in segments[start:end]).rstrip("\n")
+        if not body.strip():
+            return
+        opened = segments[start][3]
+        closing = segments[end - 1][4]
+        chunk = (opened or "") + body + (closing or "")
+        if chunks and continuation:
+            chunk = continuation + chunk
+        chunks.append(chunk)
+
+    for index, segment in enumerate(segments):
+        length, kind = segment[1], segment[2]
+
+        if index > start:
+            cuts[kind] = (index, size)
+
+        if size + length > budget and index > start:
+            # Prefer the strongest boundary that still leaves the chunk at
+            # least half full, otherwise cut right before this segment.
+            cut = index
+            for preferred in (BREAK_CLASS, BREAK_SUBJECT):
+                if preferred in cuts and cuts[preferred][1] >= budget // 2:
+                    cut = cuts[preferred][0]
+                    break
+
+            emit(cut)
+            start = cut
+            carried = sum(segments[i][1] for i in range(cut, index))
+            # Boundaries inside the carried-over lines still apply, measured
+            # from the new chunk's start
+            offset = size - carried
+            cuts = {key: (i, before - offset) for key, (i, before) in cuts.items() if i > cut}
+            size = carried
+
+            # The carried-over lines plus this segment may still not fit
+            if size + length > budget and index > start:
+                emit(index)
+                start = index
+                size = 0
+                cuts = {}
+
+        size += length
+
+    if start < len(segments):
+        emit(len(segments))
+
+    return chunks